@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Arquivo frio de contas a pagar liquidadas
+
+contas_pagar guarda para sempre toda conta PAGA ou CANCELADA, e todas as
+views e relatórios passam por elas. Este arquivador move as liquidadas
+com mais de N meses (pela data de pagamento ou, sem ela, de vencimento)
+para arquivos colunares comprimidos, um por mês:
+
+    <diretorio>/contas_pagar_2024-03.zcol
+    <diretorio>/indice.json       {mês: arquivo, linhas, datas, valor_total}
+
+Formato .zcol (só biblioteca padrão):
+
+    b'ZCOL1\\n' + tamanho do cabeçalho (4 bytes, big-endian) + cabeçalho JSON
+    {"mes", "linhas", "colunas": [{"nome", "offset", "tamanho"}]}
+    + um bloco zlib por coluna (lista JSON com os valores da coluna)
+
+O leitor descomprime só as colunas pedidas e o índice descarta os meses
+fora do período antes de abrir qualquer arquivo.
+
+Cada mês é gravado (arquivo temporário, fsync, rename) e registrado no
+índice antes de as linhas saírem da tabela, em lotes de DELETE ... WHERE
+id IN (...). Se o processo cair no meio, a próxima execução arquiva de
+novo as mesmas linhas: o mês é regravado sem duplicar ids.
+
+Uso:
+    python arquivo_frio.py banco.sqlite arquivo/ [--meses 12] [--lote 500]
+    python arquivo_frio.py banco.sqlite arquivo/ --relatorio [--de 2023 --ate 2024]
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import struct
+import sys
+import zlib
+from datetime import date
+
+MAGICO = b'ZCOL1\n'
+MESES_RETENCAO = 12
+TAMANHO_LOTE = 500
+STATUS_LIQUIDADOS = ('PAGA', 'CANCELADA')
+DATA_REFERENCIA = 'COALESCE(data_pagamento, data_vencimento)'
+
+
+def _gravar_atomico(caminho, dados):
+    tmp = caminho + '.tmp'
+    with open(tmp, 'wb') as f:
+        f.write(dados)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, caminho)
+
+
+def data_corte(meses, hoje=None):
+    """Primeiro dia do mês que está `meses` meses antes do mês de hoje (ISO)."""
+    hoje = hoje or date.today()
+    total = hoje.year * 12 + hoje.month - 1 - meses
+    return f"{total // 12:04d}-{total % 12 + 1:02d}-01"
+
+
+def gravar_particao(caminho, mes, colunas, linhas):
+    """Grava as linhas (tuplas na ordem de colunas) como um arquivo .zcol."""
+    blocos = [zlib.compress(json.dumps([linha[i] for linha in linhas], ensure_ascii=False,
+                                       separators=(',', ':')).encode('utf-8'), 9)
+              for i in range(len(colunas))]
+    offset = 0
+    descricao = []
+    for nome, bloco in zip(colunas, blocos):
+        descricao.append({'nome': nome, 'offset': offset, 'tamanho': len(bloco)})
+        offset += len(bloco)
+    cabecalho = json.dumps({'mes': mes, 'linhas': len(linhas), 'colunas': descricao}).encode('utf-8')
+    _gravar_atomico(caminho, MAGICO + struct.pack('>I', len(cabecalho)) + cabecalho + b''.join(blocos))
+
+
+def ler_particao(caminho, colunas=None):
+    """Retorna {coluna: [valores]} só com as colunas pedidas (todas se None)."""
+    with open(caminho, 'rb') as f:
+        if f.read(len(MAGICO)) != MAGICO:
+            raise ValueError(f"Arquivo não é .zcol: {caminho}")
+        (tamanho,) = struct.unpack('>I', f.read(4))
+        cabecalho = json.loads(f.read(tamanho))
+        inicio = f.tell()
+        resultado = {}
+        for coluna in cabecalho['colunas']:
+            if colunas is not None and coluna['nome'] not in colunas:
+                continue
+            f.seek(inicio + coluna['offset'])
+            resultado[coluna['nome']] = json.loads(zlib.decompress(f.read(coluna['tamanho'])))
+    faltando = set(colunas or ()) - set(resultado)
+    if faltando:
+        raise KeyError(f"Colunas ausentes em {caminho}: {', '.join(sorted(faltando))}")
+    return resultado
+
+
+class ArquivoFrio:
+    """Diretório de partições mensais .zcol com o índice indice.json."""
+
+    def __init__(self, diretorio):
+        self.diretorio = diretorio
+        self.caminho_indice = os.path.join(diretorio, 'indice.json')
+        try:
+            with open(self.caminho_indice, 'r', encoding='utf-8') as f:
+                self.indice = json.load(f)
+        except FileNotFoundError:
+            self.indice = {'versao': 1, 'particoes': {}}
+
+    def _salvar_indice(self):
+        dados = json.dumps(self.indice, ensure_ascii=False, indent=2, sort_keys=True)
+        _gravar_atomico(self.caminho_indice, dados.encode('utf-8'))
+
+    def particoes(self, de=None, ate=None):
+        """Meses (YYYY-MM) arquivados dentro do período, pelo índice."""
+        return [mes for mes in sorted(self.indice['particoes'])
+                if (de is None or mes >= de) and (ate is None or mes <= ate)]
+
+    def adicionar(self, mes, colunas, linhas):
+        """Junta as linhas à partição do mês (sem repetir ids) e atualiza o índice."""
+        os.makedirs(self.diretorio, exist_ok=True)
+        arquivo = f'contas_pagar_{mes}.zcol'
+        caminho = os.path.join(self.diretorio, arquivo)
+        i_id = colunas.index('id')
+        if mes in self.indice['particoes']:
+            existentes = ler_particao(caminho)
+            novos_ids = {linha[i_id] for linha in linhas}
+            antigas = [tuple(existentes[c][n] if c in existentes else None for c in colunas)
+                       for n in range(len(existentes['id']))]
+            linhas = [l for l in antigas if l[i_id] not in novos_ids] + list(linhas)
+        linhas.sort(key=lambda l: l[i_id])
+        gravar_particao(caminho, mes, colunas, linhas)
+
+        datas = [l[colunas.index('data_pagamento')] or l[colunas.index('data_vencimento')] for l in linhas]
+        i_valor = colunas.index('valor_total')
+        self.indice['particoes'][mes] = {
+            'arquivo': arquivo,
+            'linhas': len(linhas),
+            'data_min': min(datas),
+            'data_max': max(datas),
+            'valor_total': round(sum(l[i_valor] or 0 for l in linhas), 2),
+        }
+        self._salvar_indice()
+
+    def ler(self, colunas, de=None, ate=None):
+        """Gera dicionários só com as colunas pedidas dos meses do período."""
+        for mes in self.particoes(de, ate):
+            dados = ler_particao(os.path.join(self.diretorio, self.indice['particoes'][mes]['arquivo']), colunas)
+            for valores in zip(*(dados[c] for c in colunas)):
+                yield dict(zip(colunas, valores))
+
+    def totais_por_fornecedor_ano(self, de=None, ate=None, status=('PAGA',)):
+        """{(fornecedor_nome, ano): [contas, valor_total]} direto do arquivo.
+
+        de/ate são anos (YYYY) inclusivos; só entram contas com o status pedido.
+        """
+        totais = {}
+        meses_de = f"{de}-01" if de else None
+        meses_ate = f"{ate}-12" if ate else None
+        colunas = ['fornecedor_nome', 'data_pagamento', 'data_vencimento', 'valor_total', 'status']
+        for conta in self.ler(colunas, meses_de, meses_ate):
+            if conta['status'] not in status:
+                continue
+            ano = (conta['data_pagamento'] or conta['data_vencimento'])[:4]
+            total = totais.setdefault((conta['fornecedor_nome'], ano), [0, 0.0])
+            total[0] += 1
+            total[1] = round(total[1] + (conta['valor_total'] or 0), 2)
+        return totais
+
+
+def arquivar(conn, diretorio, meses=MESES_RETENCAO, tamanho_lote=TAMANHO_LOTE, hoje=None):
+    """Move as contas liquidadas anteriores ao corte para o arquivo frio.
+
+    Returns:
+        {'corte': data, 'meses': {mes: linhas}, 'removidas': n}
+    """
+    corte = data_corte(meses, hoje)
+    arquivo = ArquivoFrio(diretorio)
+    marcadores = ', '.join('?' * len(STATUS_LIQUIDADOS))
+    filtro = f"status IN ({marcadores}) AND {DATA_REFERENCIA} < ?"
+    parametros = STATUS_LIQUIDADOS + (corte,)
+
+    meses_encontrados = [linha[0] for linha in conn.execute(
+        f"SELECT DISTINCT substr({DATA_REFERENCIA}, 1, 7) FROM contas_pagar WHERE {filtro} ORDER BY 1",
+        parametros)]
+
+    resultado = {'corte': corte, 'meses': {}, 'removidas': 0}
+    for mes in meses_encontrados:
+        cursor = conn.execute(
+            f"SELECT * FROM contas_pagar WHERE {filtro} AND substr({DATA_REFERENCIA}, 1, 7) = ?",
+            parametros + (mes,))
+        colunas = [d[0] for d in cursor.description]
+        linhas = cursor.fetchall()
+        arquivo.adicionar(mes, colunas, linhas)
+        resultado['meses'][mes] = len(linhas)
+
+        ids = [linha[colunas.index('id')] for linha in linhas]
+        for i in range(0, len(ids), tamanho_lote):
+            lote = ids[i:i + tamanho_lote]
+            with conn:
+                conn.execute(f"DELETE FROM contas_pagar WHERE id IN ({', '.join('?' * len(lote))})", lote)
+            resultado['removidas'] += len(lote)
+    return resultado
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Arquivo frio de contas a pagar liquidadas')
+    parser.add_argument('banco', help='arquivo SQLite com a tabela contas_pagar')
+    parser.add_argument('diretorio', help='diretório das partições .zcol')
+    parser.add_argument('--meses', type=int, default=MESES_RETENCAO,
+                        help='mantém na tabela as liquidadas dos últimos N meses')
+    parser.add_argument('--lote', type=int, default=TAMANHO_LOTE, help='linhas por DELETE')
+    parser.add_argument('--relatorio', action='store_true',
+                        help='não arquiva; mostra os totais pagos por fornecedor e ano do arquivo')
+    parser.add_argument('--de', help='no --relatorio, ano inicial (YYYY)')
+    parser.add_argument('--ate', help='no --relatorio, ano final (YYYY)')
+    args = parser.parse_args(argv)
+
+    if args.relatorio:
+        totais = ArquivoFrio(args.diretorio).totais_por_fornecedor_ano(args.de, args.ate)
+        print("📊 Pagamentos arquivados por fornecedor e ano:")
+        for (fornecedor, ano), (quantidade, valor) in sorted(totais.items()):
+            print(f"  {ano} | {fornecedor[:40]:40s} | {quantidade:5d} contas | R$ {valor:,.2f}")
+        return 0
+
+    if not os.path.exists(args.banco):
+        print(f"❌ Banco não encontrado: {args.banco}")
+        return 1
+
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'scripts_auxiliares'))
+    from job_metrics import JobMetrics
+
+    conn = sqlite3.connect(args.banco)
+    try:
+        with JobMetrics('arquivo_frio') as metrics:
+            resultado = arquivar(conn, args.diretorio, args.meses, args.lote)
+            metrics.add(read=resultado['removidas'], written=resultado['removidas'])
+    finally:
+        conn.close()
+
+    print(f"✅ Contas liquidadas antes de {resultado['corte']} arquivadas em {args.diretorio}")
+    for mes, linhas in resultado['meses'].items():
+        print(f"  • {mes}: {linhas} contas")
+    print(f"🗑️ Removidas da tabela: {resultado['removidas']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
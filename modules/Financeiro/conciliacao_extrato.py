@@ -0,0 +1,366 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Conciliação em lote de extrato bancário com contas a pagar
+
+A conciliação automática da tela (conciliacao_bancaria.js) compara cada
+movimento do sistema com todos os do extrato (find dentro de forEach), o
+que não escala para um mês inteiro de lançamentos. Aqui o extrato (CSV ou
+OFX) é conciliado de uma vez contra as contas em aberto de contas_pagar
+com um hash join:
+
+    índice      centavos exatos -> contas com esse valor, ordenadas por
+                vencimento (uma leitura da tabela)
+    por linha   lookup pelo valor do débito + bisect na janela de
+                +/- N dias em torno da data do lançamento
+    desempate   numero_documento igual ao documento do lançamento (ou a
+                um número do histórico) e, depois, semelhança entre o
+                fornecedor e o histórico (palavras em comum, com os nomes
+                normalizados como em dimensoes.py)
+
+Cada linha do extrato termina como:
+
+    conciliada           um candidato só, ou um claramente melhor
+    ambigua              empate entre os melhores candidatos
+    sem_correspondencia  nenhuma conta com o valor dentro da janela
+    ignorada             crédito (só débitos pagam contas) ou linha sem data/valor
+
+Uma conta concilia no máximo uma linha. As ambíguas são reavaliadas uma
+vez ao final, já sem as contas consumidas pelas outras linhas.
+
+CSV: colunas data, histórico, valor [, documento], com datas limpas por
+clean_date (débitos negativos). O separador decimal dos valores é
+detectado no arquivo: "1.500,00" (clean_currency) ou "1500.00" /
+"1,500.00"; só "1.500" é ambíguo e, sem outro valor que decida, vale
+como milhar. Com cabeçalho, as colunas são localizadas pelo nome.
+
+Uso:
+    python conciliacao_extrato.py banco.sqlite extrato.ofx [--janela 3] [--saida resultado.csv]
+"""
+
+import argparse
+import csv
+import io
+import os
+import re
+import sqlite3
+import sys
+from bisect import bisect_left, bisect_right
+from datetime import date
+from decimal import Decimal, InvalidOperation
+
+from convert_csv_to_sql import clean_currency, clean_date
+from dimensoes import chave_documento, normalizar_fornecedor, normalizar_texto
+
+JANELA_DIAS = 3
+SQL_ABERTAS = """SELECT id, fornecedor_nome, numero_documento, data_vencimento,
+    valor_total - COALESCE(valor_pago, 0) FROM contas_pagar
+WHERE status IN ('PENDENTE', 'VENCIDA', 'PARCIAL') AND data_vencimento IS NOT NULL"""
+
+RESULTADOS = ('conciliada', 'ambigua', 'sem_correspondencia', 'ignorada')
+
+
+def _centavos(valor):
+    return int(round(valor * 100))
+
+
+def _ordinal(data_iso):
+    return date.fromisoformat(data_iso[:10]).toordinal()
+
+
+def _documentos_linha(linha):
+    chaves = {chave_documento(linha.get('documento'))}
+    for palavra in normalizar_texto(linha.get('descricao')).split():
+        if sum(c.isdigit() for c in palavra) >= 3:
+            chaves.add(chave_documento(palavra))
+    chaves.discard('')
+    return chaves
+
+
+# ---------------------------------------------------------------------------
+# Leitura do extrato
+# ---------------------------------------------------------------------------
+
+def _ler_texto(caminho):
+    with open(caminho, 'rb') as f:
+        dados = f.read()
+    try:
+        return dados.decode('utf-8-sig')
+    except UnicodeDecodeError:
+        return dados.decode('cp1252')
+
+
+def _coluna(palavras, usadas, *nomes):
+    """Primeira coluna livre cujo cabeçalho tem a palavra, na ordem de prioridade
+    dos nomes ("Data Lançamento;Histórico" dá HISTORICO à segunda coluna)."""
+    for nome in nomes:
+        for i, celula in enumerate(palavras):
+            if i not in usadas and nome in celula:
+                usadas.add(i)
+                return i
+    return None
+
+
+def _separador_decimal(valores):
+    """',' ou '.', pelo último separador do primeiro valor que decide.
+
+    "1.500,00" e "-42,5" dão ','; "1500.00" e "1,500.00" dão '.'. Um ponto
+    seguido de três dígitos ("1.500") é milhar ou decimal e não decide.
+    """
+    for valor in valores:
+        valor = valor.strip()
+        posicao = max(valor.rfind(','), valor.rfind('.'))
+        if posicao < 0:
+            continue
+        if valor[posicao] == ',':
+            return ','
+        if len(valor) - posicao - 1 != 3:
+            return '.'
+    return ','
+
+
+def _valor_ponto(valor):
+    """Valor com ponto decimal ("-1,500.00"), o inverso de clean_currency"""
+    try:
+        return float(re.sub(r'[R$\s,]', '', valor) or 0)
+    except ValueError:
+        return 0.0
+
+
+def ler_extrato_csv(caminho):
+    """Lê um extrato CSV (data; histórico; valor[; documento])."""
+    texto = _ler_texto(caminho)
+    amostra = texto[:1024]
+    delimitador = ',' if amostra.count(',') > amostra.count(';') else ';'
+    linhas_csv = list(csv.reader(io.StringIO(texto), delimiter=delimitador))
+
+    colunas = {'data': 0, 'descricao': 1, 'valor': 2, 'documento': 3}
+    inicio = 0
+    if linhas_csv and any(normalizar_texto(c).startswith(('DATA', 'VALOR')) for c in linhas_csv[0]):
+        palavras = [normalizar_texto(c).split() for c in linhas_csv[0]]
+        usadas = set()
+        colunas = {
+            'data': _coluna(palavras, usadas, 'DATA'),
+            'valor': _coluna(palavras, usadas, 'VALOR'),
+            'documento': _coluna(palavras, usadas, 'DOCUMENTO', 'DOC'),
+            'descricao': _coluna(palavras, usadas, 'HISTORICO', 'DESCRICAO', 'LANCAMENTO'),
+        }
+        inicio = 1
+
+    def celula(row, campo):
+        i = colunas[campo]
+        return row[i] if i is not None and i < len(row) else ''
+
+    linhas = [(numero, row) for numero, row in enumerate(linhas_csv[inicio:], start=inicio + 1)
+              if any(c.strip() for c in row)]
+    limpar_valor = clean_currency
+    if _separador_decimal(celula(row, 'valor') for _, row in linhas) == '.':
+        limpar_valor = _valor_ponto
+
+    extrato = []
+    for numero, row in linhas:
+        extrato.append({
+            'linha': numero,
+            'id': str(numero),
+            'data': clean_date(celula(row, 'data')),
+            'centavos': _centavos(limpar_valor(celula(row, 'valor'))),
+            'descricao': celula(row, 'descricao').strip(),
+            'documento': celula(row, 'documento').strip(),
+        })
+    return extrato
+
+
+def _campo_ofx(bloco, nome):
+    achado = re.search(rf'<{nome}>([^<\r\n]*)', bloco, re.IGNORECASE)
+    return achado.group(1).strip() if achado else ''
+
+
+def ler_extrato_ofx(caminho):
+    """Lê os lançamentos <STMTTRN> de um OFX (SGML 1.x ou XML 2.x)."""
+    texto = _ler_texto(caminho)
+    extrato = []
+    blocos = re.findall(r'<STMTTRN>(.*?)</STMTTRN>', texto, re.IGNORECASE | re.DOTALL)
+    for numero, bloco in enumerate(blocos, start=1):
+        valor = _campo_ofx(bloco, 'TRNAMT')
+        if ',' in valor:
+            valor = clean_currency(valor)
+        else:
+            try:
+                valor = Decimal(valor or '0')
+            except InvalidOperation:
+                valor = 0
+        postado = _campo_ofx(bloco, 'DTPOSTED')[:8]
+        memo = _campo_ofx(bloco, 'MEMO')
+        nome = _campo_ofx(bloco, 'NAME')
+        extrato.append({
+            'linha': numero,
+            'id': _campo_ofx(bloco, 'FITID') or str(numero),
+            'data': clean_date(f'{postado[:4]}-{postado[4:6]}-{postado[6:8]}') if len(postado) == 8 else None,
+            'centavos': _centavos(valor),
+            'descricao': ' '.join(p for p in (nome, memo) if p),
+            'documento': _campo_ofx(bloco, 'CHECKNUM') or _campo_ofx(bloco, 'REFNUM'),
+        })
+    return extrato
+
+
+def ler_extrato(caminho):
+    """CSV ou OFX, pela extensão do arquivo."""
+    if caminho.lower().endswith(('.ofx', '.qfx')):
+        return ler_extrato_ofx(caminho)
+    return ler_extrato_csv(caminho)
+
+
+# ---------------------------------------------------------------------------
+# Conciliação
+# ---------------------------------------------------------------------------
+
+class IndiceContas:
+    """Contas em aberto agrupadas por valor em centavos e ordenadas por vencimento."""
+
+    def __init__(self, contas):
+        grupos = {}
+        for conta in contas:
+            grupos.setdefault(conta['centavos'], []).append(conta)
+        self.grupos = {}
+        for centavos, grupo in grupos.items():
+            grupo.sort(key=lambda c: c['ordinal'])
+            self.grupos[centavos] = ([c['ordinal'] for c in grupo], grupo)
+
+    @classmethod
+    def carregar(cls, conn, sql=SQL_ABERTAS):
+        contas = []
+        for id_, fornecedor, documento, vencimento, valor in conn.execute(sql):
+            contas.append({
+                'id': id_,
+                'fornecedor': fornecedor,
+                'ordinal': _ordinal(vencimento),
+                'centavos': _centavos(valor or 0),
+                'documento': chave_documento(documento),
+                'palavras': frozenset(normalizar_fornecedor(fornecedor).split()),
+            })
+        return cls(contas)
+
+    def candidatos(self, centavos, ordinal, janela):
+        grupo = self.grupos.get(centavos)
+        if grupo is None:
+            return []
+        datas, contas = grupo
+        return contas[bisect_left(datas, ordinal - janela):bisect_right(datas, ordinal + janela)]
+
+
+def _pontuar(conta, documentos, palavras):
+    semelhanca = len(conta['palavras'] & palavras) / len(conta['palavras']) if conta['palavras'] else 0.0
+    return (conta['documento'] in documentos, semelhanca)
+
+
+def _avaliar(linha, indice, janela, usadas):
+    """Retorna (resultado, conta ou None, ids dos candidatos empatados)."""
+    if not linha['data'] or linha['centavos'] >= 0:
+        return 'ignorada', None, []
+    ordinal = _ordinal(linha['data'])
+    candidatos = [c for c in indice.candidatos(-linha['centavos'], ordinal, janela) if c['id'] not in usadas]
+    if not candidatos:
+        return 'sem_correspondencia', None, []
+    if len(candidatos) == 1:
+        return 'conciliada', candidatos[0], []
+
+    documentos = _documentos_linha(linha)
+    palavras = set(normalizar_texto(linha['descricao']).split())
+    pontuados = sorted(((_pontuar(c, documentos, palavras), c) for c in candidatos),
+                       key=lambda p: (p[0], -abs(p[1]['ordinal'] - ordinal)), reverse=True)
+    if pontuados[0][0] > pontuados[1][0]:
+        return 'conciliada', pontuados[0][1], []
+    return 'ambigua', None, [c['id'] for pontos, c in pontuados if pontos == pontuados[0][0]]
+
+
+def conciliar(extrato, indice, janela=JANELA_DIAS):
+    """Concilia as linhas do extrato contra o índice de contas.
+
+    Returns:
+        {resultado: [registros]} para cada um de RESULTADOS; cada registro
+        é a linha do extrato com 'conta_id', 'dias' (lançamento - vencimento)
+        e 'candidatos' (ids empatados, nas ambíguas).
+    """
+    usadas = set()
+    relatorio = {resultado: [] for resultado in RESULTADOS}
+    ambiguas = []
+
+    def registrar(linha, resultado, conta, empatados):
+        registro = dict(linha, conta_id=None, dias=None, candidatos=empatados)
+        if conta is not None:
+            usadas.add(conta['id'])
+            registro['conta_id'] = conta['id']
+            registro['dias'] = _ordinal(linha['data']) - conta['ordinal']
+        relatorio[resultado].append(registro)
+
+    for linha in extrato:
+        resultado, conta, empatados = _avaliar(linha, indice, janela, usadas)
+        if resultado == 'ambigua':
+            ambiguas.append(linha)
+        else:
+            registrar(linha, resultado, conta, empatados)
+
+    for linha in ambiguas:
+        registrar(linha, *_avaliar(linha, indice, janela, usadas))
+    return relatorio
+
+
+def gravar_relatorio(relatorio, caminho):
+    """Grava uma linha por lançamento do extrato com o resultado da conciliação."""
+    registros = sorted((r for resultado in RESULTADOS for r in relatorio[resultado]), key=lambda r: r['linha'])
+    resultado_de = {id(r): resultado for resultado in RESULTADOS for r in relatorio[resultado]}
+    with open(caminho, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f, delimiter=';')
+        writer.writerow(['linha', 'id', 'data', 'valor', 'historico', 'documento',
+                         'resultado', 'conta_id', 'dias', 'candidatos'])
+        for r in registros:
+            writer.writerow([r['linha'], r['id'], r['data'] or '', f"{r['centavos'] / 100:.2f}".replace('.', ','),
+                             r['descricao'], r['documento'], resultado_de[id(r)],
+                             '' if r['conta_id'] is None else r['conta_id'],
+                             '' if r['dias'] is None else r['dias'],
+                             ' '.join(str(c) for c in r['candidatos'])])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Conciliação em lote de extrato bancário com contas a pagar')
+    parser.add_argument('banco', help='arquivo SQLite com a tabela contas_pagar')
+    parser.add_argument('extrato', help='extrato .csv ou .ofx')
+    parser.add_argument('--janela', type=int, default=JANELA_DIAS,
+                        help='diferença máxima em dias entre lançamento e vencimento')
+    parser.add_argument('--saida', help='grava o resultado por lançamento neste CSV')
+    args = parser.parse_args(argv)
+
+    for caminho in (args.banco, args.extrato):
+        if not os.path.exists(caminho):
+            print(f"❌ Arquivo não encontrado: {caminho}")
+            return 1
+
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'scripts_auxiliares'))
+    from job_metrics import JobMetrics
+
+    conn = sqlite3.connect(args.banco)
+    try:
+        with JobMetrics('conciliacao_extrato') as metrics:
+            extrato = ler_extrato(args.extrato)
+            relatorio = conciliar(extrato, IndiceContas.carregar(conn), args.janela)
+            metrics.add(read=len(extrato), written=len(relatorio['conciliada']),
+                        rejected=len(relatorio['ambigua']) + len(relatorio['sem_correspondencia']))
+    finally:
+        conn.close()
+
+    print(f"🏦 Extrato: {len(extrato)} lançamentos")
+    print(f"✅ Conciliados: {len(relatorio['conciliada'])}")
+    print(f"⚠️ Ambíguos: {len(relatorio['ambigua'])}")
+    for registro in relatorio['ambigua'][:20]:
+        print(f"  • linha {registro['linha']} ({registro['data']}, R$ {-registro['centavos'] / 100:,.2f}): "
+              f"contas {', '.join(str(c) for c in registro['candidatos'])}")
+    print(f"❓ Sem correspondência: {len(relatorio['sem_correspondencia'])}")
+    print(f"➖ Ignorados (créditos ou sem data): {len(relatorio['ignorada'])}")
+    if args.saida:
+        gravar_relatorio(relatorio, args.saida)
+        print(f"📄 Resultado gravado em {args.saida}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,10 +4,21 @@
 Conversor CSV para SQL - Contas a Pagar
 """
 
+import contextlib
 import csv
+import os
 import re
+import sys
 from datetime import datetime
 
+from dimensoes import subconsulta_id
+from duplicatas import DetectorDuplicatas, filtrar_duplicatas
+
+try:
+    from documentos_fiscais import validar_em_lotes
+except ImportError:  # numpy é opcional: sem ele o CNPJ/CPF é gravado como veio
+    validar_em_lotes = None
+
 def clean_currency(value):
     """Limpa valores monetários"""
     if not value or value.strip() == '':
@@ -48,100 +59,195 @@ def clean_text(value):
         return ''
     return str(value).strip().replace("'", "''")
 
-def convert_csv_to_sql(csv_file):
-    """Converte CSV para SQL"""
+STATUS_VALIDOS = ['PENDENTE', 'PAGA', 'VENCIDA', 'CANCELADA']
+
+def parse_row(row, row_number):
+    """Limpa e valida uma linha do CSV
+    
+    Retorna um dicionário com os campos da conta; levanta ValueError
+    se a linha não puder ser importada.
+    """
+    # Mapear colunas (ajustar conforme sua planilha)
+    fornecedor = clean_text(row[0] if len(row) > 0 else '')
+    descricao = clean_text(row[1] if len(row) > 1 else '')
+    valor = clean_currency(row[2] if len(row) > 2 else 0)
+    data_vencimento = clean_date(row[3] if len(row) > 3 else '')
+    documento = clean_text(row[4] if len(row) > 4 else '')
+    categoria = clean_text(row[5] if len(row) > 5 else 'Geral')
+    status = clean_text(row[6] if len(row) > 6 else 'PENDENTE').upper()
+    fornecedor_cnpj = clean_text(row[7] if len(row) > 7 else '')
+    
+    # Validações
+    if not fornecedor:
+        fornecedor = f'Fornecedor {row_number}'
+    
+    if not descricao:
+        descricao = 'Conta a pagar'
+    
+    if valor <= 0:
+        raise ValueError(f"Valor inválido ({valor})")
+    
+    if not data_vencimento:
+        raise ValueError("Data de vencimento inválida")
+    
+    if status not in STATUS_VALIDOS:
+        status = 'PENDENTE'
+    
+    return {
+        'fornecedor': fornecedor,
+        'descricao': descricao,
+        'valor': valor,
+        'data_vencimento': data_vencimento,
+        'documento': documento,
+        'categoria': categoria,
+        'status': status,
+        'fornecedor_cnpj': fornecedor_cnpj,
+    }
+
+COLUNAS_IDS = ('fornecedor_id', 'categoria_id', 'centro_custo_id')
+
+def format_insert(conta):
+    """Gera o INSERT de uma conta já validada
+    
+    Se a conta passou por dimensoes.ResolvedorDimensoes, os ids de
+    fornecedor, categoria e centro de custo também são gravados, buscados
+    por nome_normalizado (os INSERTs das dimensões vêm antes no lote). Uma conta
+    marcada por duplicatas.filtrar_duplicatas sai com um comentário antes
+    do INSERT, assim como uma com CNPJ/CPF recusado por
+    documentos_fiscais.validar_contas (gravada sem o documento).
+    """
+    aviso = f"-- POSSÍVEL DUPLICATA de {conta['duplicata']}\n" if conta.get('duplicata') else ''
+    if conta.get('documento_invalido'):
+        aviso += f"-- CNPJ/CPF INVÁLIDO (não gravado): {' '.join(str(conta['documento_invalido']).split())}\n"
+    colunas_doc = valores_doc = ''
+    if conta.get('fornecedor_cnpj'):
+        colunas_doc = ', fornecedor_cnpj'
+        valores_doc = f",\n    '{conta['fornecedor_cnpj']}'"
+    colunas_ids = valores_ids = ''
+    if 'fornecedor_id' in conta:
+        colunas_ids = ',\n    ' + ', '.join(COLUNAS_IDS)
+        valores_ids = ''.join(',\n    ' + ('NULL' if conta[c] is None else subconsulta_id(*conta[c]))
+                              for c in COLUNAS_IDS)
+    return f"""{aviso}INSERT INTO contas_pagar (
+    fornecedor_nome, descricao, valor_original, data_vencimento,
+    numero_documento, categoria, status{colunas_doc}{colunas_ids}
+) VALUES (
+    '{conta['fornecedor']}',
+    '{conta['descricao']}',
+    {conta['valor']},
+    '{conta['data_vencimento']}',
+    '{conta['documento']}',
+    '{conta['categoria']}',
+    '{conta['status']}'{valores_doc}{valores_ids}
+);"""
+
+def read_rows(file):
+    """Detecta o delimitador e o cabeçalho e retorna o leitor de linhas"""
+    # Detectar delimitador
+    sample = file.read(1024)
+    file.seek(0)
+    
+    delimiter = ',' if sample.count(',') > sample.count(';') else ';'
+    
+    reader = csv.reader(file, delimiter=delimiter)
+    
+    # Pular cabeçalho se existir
+    first_row = next(reader, None)
+    if first_row and any('fornecedor' in str(cell).lower() for cell in first_row):
+        print("📋 Cabeçalho detectado, pulando primeira linha...")
+    else:
+        # Primeira linha são dados, processar
+        file.seek(0)
+        reader = csv.reader(file, delimiter=delimiter)
+    return reader
+
+def normalize_rows(rows):
+    """Descarta linhas sem as colunas mínimas"""
+    for row in rows:
+        if len(row) >= 3:  # Mínimo: fornecedor, descrição, valor
+            yield row
+
+def clean_rows(rows, errors):
+    """Limpa e valida as linhas, registrando os erros em errors"""
+    row_number = 1
+    
+    for row in rows:
+        try:
+            conta = parse_row(row, row_number)
+        except ValueError as e:
+            errors.append(f"Linha {row_number}: {e}")
+            continue
+        except Exception as e:
+            errors.append(f"Linha {row_number}: {str(e)}")
+        else:
+            conta['linha'] = row_number
+            yield conta
+        
+        row_number += 1
+
+# Mesmo comportamento de phase_profiler.phase: este módulo é importado sem
+# scripts_auxiliares no sys.path (o profiler só é carregado no __main__)
+def _phase(profiler, name):
+    return profiler.phase(name) if profiler else contextlib.nullcontext()
+
+def _stage(profiler, name, items):
+    """Sem profiler, mantém o pipeline preguiçoso; com profiler, executa a
+    etapa inteira dentro da sua fase para medir tempo e memória dela"""
+    if profiler is None:
+        return items
+    with profiler.phase(name):
+        return list(items)
+
+def convert_csv_to_sql(csv_file, profiler=None, metrics=None, detector=None, pular_quase=False):
+    """Converte CSV para SQL
+    
+    Com um PhaseProfiler (scripts_auxiliares/phase_profiler.py), cada etapa
+    (read, normalize, clean, documentos, dedup, emit, write) é medida
+    separadamente. Com um JobMetrics (scripts_auxiliares/job_metrics.py), as
+    contagens de linhas lidas, gravadas e recusadas são registradas nele.
+    
+    Com um duplicatas.DetectorDuplicatas, duplicatas exatas (no próprio
+    arquivo ou nas contas que o detector carregou do banco) não são
+    gravadas e as quase duplicatas saem marcadas (ou são puladas também,
+    com pular_quase).
+    
+    Com numpy instalado, o CNPJ/CPF do fornecedor (8ª coluna, opcional)
+    tem os dígitos verificadores conferidos em lotes
+    (documentos_fiscais.py): os válidos são gravados com a máscara e os
+    inválidos não são gravados, com um comentário antes do INSERT.
+    """
     
     if not os.path.exists(csv_file):
         print(f"❌ Arquivo não encontrado: {csv_file}")
         return False
     
-    sql_inserts = []
     errors = []
-    success_count = 0
+    duplicatas = []
     
     try:
         with open(csv_file, 'r', encoding='utf-8') as file:
-            # Detectar delimitador
-            sample = file.read(1024)
-            file.seek(0)
-            
-            delimiter = ',' if sample.count(',') > sample.count(';') else ';'
-            
-            reader = csv.reader(file, delimiter=delimiter)
-            
-            # Pular cabeçalho se existir
-            first_row = next(reader, None)
-            if first_row and any('fornecedor' in str(cell).lower() for cell in first_row):
-                print("📋 Cabeçalho detectado, pulando primeira linha...")
-            else:
-                # Primeira linha são dados, processar
-                file.seek(0)
-                reader = csv.reader(file, delimiter=delimiter)
-            
-            row_number = 1
-            
-            for row in reader:
-                try:
-                    if len(row) < 3:  # Mínimo: fornecedor, descrição, valor
-                        continue
-                    
-                    # Mapear colunas (ajustar conforme sua planilha)
-                    fornecedor = clean_text(row[0] if len(row) > 0 else '')
-                    descricao = clean_text(row[1] if len(row) > 1 else '')
-                    valor = clean_currency(row[2] if len(row) > 2 else 0)
-                    data_vencimento = clean_date(row[3] if len(row) > 3 else '')
-                    documento = clean_text(row[4] if len(row) > 4 else '')
-                    categoria = clean_text(row[5] if len(row) > 5 else 'Geral')
-                    status = clean_text(row[6] if len(row) > 6 else 'PENDENTE').upper()
-                    
-                    # Validações
-                    if not fornecedor:
-                        fornecedor = f'Fornecedor {row_number}'
-                    
-                    if not descricao:
-                        descricao = 'Conta a pagar'
-                    
-                    if valor <= 0:
-                        errors.append(f"Linha {row_number}: Valor inválido ({valor})")
-                        continue
-                    
-                    if not data_vencimento:
-                        errors.append(f"Linha {row_number}: Data de vencimento inválida")
-                        continue
-                    
-                    if status not in ['PENDENTE', 'PAGA', 'VENCIDA', 'CANCELADA']:
-                        status = 'PENDENTE'
-                    
-                    # Gerar INSERT
-                    sql_insert = f"""INSERT INTO contas_pagar (
-    fornecedor_nome, descricao, valor_original, data_vencimento,
-    numero_documento, categoria, status
-) VALUES (
-    '{fornecedor}',
-    '{descricao}',
-    {valor},
-    '{data_vencimento}',
-    '{documento}',
-    '{categoria}',
-    '{status}'
-);"""
-                    
-                    sql_inserts.append(sql_insert)
-                    success_count += 1
-                    
-                except Exception as e:
-                    errors.append(f"Linha {row_number}: {str(e)}")
-                
-                row_number += 1
+            rows = _stage(profiler, 'read', read_rows(file))
+            rows = _stage(profiler, 'normalize', normalize_rows(rows))
+            contas = _stage(profiler, 'clean', clean_rows(rows, errors))
+            if validar_em_lotes is not None:
+                contas = _stage(profiler, 'documentos', validar_em_lotes(contas))
+            if detector is not None:
+                contas = _stage(profiler, 'dedup', filtrar_duplicatas(contas, detector, duplicatas, pular_quase))
+            sql_inserts = list(_stage(profiler, 'emit', map(format_insert, contas)))
     
     except Exception as e:
         print(f"❌ Erro ao processar CSV: {str(e)}")
         return False
     
+    success_count = len(sql_inserts)
+    if metrics:
+        metrics.add(read=success_count + len(errors) + len(duplicatas), written=success_count,
+                    rejected=len(errors) + len(duplicatas))
+    
     # Gerar arquivo SQL
     sql_file = csv_file.replace('.csv', '_import.sql')
     
-    with open(sql_file, 'w', encoding='utf-8') as f:
+    with _phase(profiler, 'write'), open(sql_file, 'w', encoding='utf-8') as f:
         f.write(f"""-- =====================================================
 -- IMPORTAÇÃO AUTOMÁTICA: CONTAS A PAGAR
 -- Arquivo origem: {csv_file}
@@ -150,6 +256,7 @@ def convert_csv_to_sql(csv_file):
 
 -- Registros processados: {success_count}
 -- Erros encontrados: {len(errors)}
+-- Duplicatas ignoradas: {len(duplicatas)}
 
 """)
         
@@ -165,6 +272,14 @@ def convert_csv_to_sql(csv_file):
             for error in errors:
                 f.write(f"-- {error}\n")
         
+        # Duplicatas que não foram gravadas
+        if duplicatas:
+            f.write("\n-- =====================================================\n")
+            f.write("-- DUPLICATAS IGNORADAS:\n")
+            f.write("-- =====================================================\n")
+            for dup in duplicatas:
+                f.write(f"-- Linha {dup['linha']}: duplicata {dup['tipo']} de {dup['de']}\n")
+        
         # Verificação final
         f.write(f"""
 -- =====================================================
@@ -190,6 +305,12 @@ GROUP BY status;
     print(f"📁 Arquivo SQL gerado: {sql_file}")
     print(f"📊 Registros processados: {success_count}")
     print(f"❌ Erros encontrados: {len(errors)}")
+    if detector is not None:
+        marcadas = sum(1 for insert in sql_inserts if insert.startswith('-- POSSÍVEL DUPLICATA'))
+        print(f"♊ Duplicatas ignoradas: {len(duplicatas)} | marcadas para revisão: {marcadas}")
+    documentos_invalidos = sum(1 for insert in sql_inserts if '-- CNPJ/CPF INVÁLIDO' in insert)
+    if documentos_invalidos:
+        print(f"🪪 CNPJ/CPF inválidos (gravados sem o documento): {documentos_invalidos}")
     
     if errors:
         print(f"\n🔍 Primeiros erros:")
@@ -199,13 +320,43 @@ GROUP BY status;
     return True
 
 if __name__ == "__main__":
-    csv_file = "contas_pagar.csv"
+    import argparse
+    
+    parser = argparse.ArgumentParser(description='Conversor CSV para SQL - Contas a Pagar')
+    parser.add_argument('csv_file', nargs='?', default='contas_pagar.csv')
+    parser.add_argument('--profile', metavar='PERFIL.json',
+                        help='mede tempo e memória de cada etapa e grava o relatório em JSON')
+    parser.add_argument('--profile-time-only', action='store_true',
+                        help='no --profile, mede só tempo (sem o custo do tracemalloc)')
+    parser.add_argument('--db', metavar='BANCO.sqlite',
+                        help='também procura duplicatas nas contas que já estão neste banco')
+    parser.add_argument('--pular-quase', action='store_true',
+                        help='não grava as quase duplicatas (por padrão saem marcadas com um comentário)')
+    args = parser.parse_args()
+    csv_file = args.csv_file
     
     print("🚀 ALUFORCE v2.0 - Conversor CSV para SQL")
     print("=" * 50)
     
     if os.path.exists(csv_file):
-        convert_csv_to_sql(csv_file)
+        sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'scripts_auxiliares'))
+        from job_metrics import JobMetrics
+        profiler = None
+        if args.profile:
+            from phase_profiler import PhaseProfiler
+            profiler = PhaseProfiler('convert_csv_to_sql', source=csv_file, memory=not args.profile_time_only)
+        detector = DetectorDuplicatas()
+        if args.db:
+            import sqlite3
+            with contextlib.closing(sqlite3.connect(args.db)) as conn:
+                print(f"🔎 Contas já no banco: {detector.carregar_tabela(conn)}")
+        # Métricas Prometheus (textfile) quando ZYNTRA_METRICS_DIR estiver definido
+        with JobMetrics('convert_csv_to_sql') as metrics:
+            metrics.failed = not convert_csv_to_sql(csv_file, profiler, metrics, detector, args.pular_quase)
+        if profiler:
+            profiler.write(args.profile)
+            profiler.print_summary()
+            print(f"📁 Perfil salvo em: {args.profile}")
     else:
         print(f"❌ Arquivo {csv_file} não encontrado!")
         print("💡 Primeiro exporte seu Excel para CSV com o nome 'contas_pagar.csv'")
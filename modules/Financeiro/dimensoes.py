@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Resolução de fornecedor, categoria e centro de custo para ids
+
+Os importadores gravavam só o texto (fornecedor_nome, categoria,
+centro_custo) e os relatórios agrupavam por texto livre: "Materiais
+Industriais Ltda." e "MATERIAIS INDUSTRIAIS LTDA" viravam dois
+fornecedores. Aqui cada nome é normalizado (maiúsculas, sem acentos nem
+pontuação e, para fornecedores, sem sufixos societários como LTDA, S/A,
+ME, EPP, EIRELI) e a conta passa a apontar para a tabela de dimensão pelo
+nome normalizado:
+
+    resolvedor = ResolvedorDimensoes(conn)   # conn opcional; um SELECT por dimensão
+    inserts = resolvedor.resolver(contas)    # preenche fornecedor_id, ...
+
+resolver() não grava nada no banco. Devolve, por dimensão, um único
+INSERT OR IGNORE em lote com os nomes que o lote usa pela primeira vez,
+e cada conta guarda (tabela, nome normalizado) nas colunas de id; o
+INSERT da conta (convert_csv_to_sql.format_insert) busca o id com uma
+subconsulta por nome_normalizado. Assim o .sql gerado vale em qualquer
+banco com o esquema, não só naquele em que os nomes foram conferidos. A
+conexão só serve para contar os nomes que ainda não existem nele.
+"""
+
+import re
+import unicodedata
+
+# campo da conta -> (tabela de dimensão, coluna de id em contas_pagar, remove sufixos)
+DIMENSOES = {
+    'fornecedor': ('fornecedores_financeiro', 'fornecedor_id', True),
+    'categoria': ('categorias_financeiro', 'categoria_id', False),
+    'centro_custo': ('centros_custo_financeiro', 'centro_custo_id', False),
+}
+
+SUFIXOS_SOCIETARIOS = [('S', 'A'), ('SA',), ('LTDA',), ('ME',), ('EPP',), ('EIRELI',), ('MEI',), ('S', 'S'), ('SS',)]
+
+
+def normalizar_texto(nome):
+    """Chave de comparação: maiúsculas, sem acentos e sem pontuação."""
+    if nome is None:
+        return ''
+    texto = str(nome).replace("''", "'")
+    texto = unicodedata.normalize('NFKD', texto).encode('ascii', 'ignore').decode('ascii')
+    return ' '.join(re.sub(r'[^A-Z0-9&]+', ' ', texto.upper()).split())
+
+
+def normalizar_fornecedor(nome):
+    """Como normalizar_texto, removendo sufixos societários do fim do nome."""
+    palavras = normalizar_texto(nome).split()
+    removeu = True
+    while removeu:
+        removeu = False
+        for sufixo in SUFIXOS_SOCIETARIOS:
+            n = len(sufixo)
+            if len(palavras) > n and tuple(palavras[-n:]) == sufixo:
+                del palavras[-n:]
+                removeu = True
+                break
+    return ' '.join(palavras)
+
+
+def chave_documento(texto):
+    """Número do documento comparável: só dígitos, sem zeros à esquerda.
+
+    'NF-001234', 'nf 1234' e '1234' dão '1234'. Sem dígitos, usa as letras
+    em maiúsculas; vazio se não sobrar nada.
+    """
+    if not texto:
+        return ''
+    digitos = re.sub(r'\D', '', str(texto)).lstrip('0')
+    if digitos:
+        return digitos
+    return re.sub(r'[^A-Z]', '', normalizar_texto(texto))
+
+
+def garantir_esquema(conn):
+    """Cria as tabelas de dimensão e as colunas/índices de id em contas_pagar."""
+    for tabela, _, _ in DIMENSOES.values():
+        conn.execute(f"""CREATE TABLE IF NOT EXISTS {tabela} (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    nome VARCHAR(255) NOT NULL,
+    nome_normalizado VARCHAR(255) NOT NULL UNIQUE,
+    data_criacao DATETIME DEFAULT CURRENT_TIMESTAMP
+)""")
+    colunas = {linha[1] for linha in conn.execute("PRAGMA table_info(contas_pagar)")}
+    if colunas:
+        for tabela, coluna, _ in DIMENSOES.values():
+            if coluna not in colunas:
+                conn.execute(f"ALTER TABLE contas_pagar ADD COLUMN {coluna} INTEGER REFERENCES {tabela}(id)")
+            conn.execute(f"CREATE INDEX IF NOT EXISTS idx_contas_pagar_{coluna} ON contas_pagar({coluna})")
+    conn.commit()
+
+
+def _texto_sql(texto):
+    return "'" + texto.replace("'", "''") + "'"
+
+
+def subconsulta_id(tabela, chave):
+    """Expressão SQL do id de uma dimensão pelo nome normalizado"""
+    return f"(SELECT id FROM {tabela} WHERE nome_normalizado = {_texto_sql(chave)})"
+
+
+class Dimensao:
+    """Nomes normalizados de uma tabela de dimensão."""
+
+    def __init__(self, tabela, normalizar=normalizar_texto):
+        self.tabela = tabela
+        self.normalizar = normalizar
+        self.existentes = set()
+        self.emitidos = set()
+        self.pendentes = {}
+
+    def carregar(self, conn):
+        """Carrega os nomes já cadastrados numa consulta."""
+        self.existentes = {chave for chave, in conn.execute(f"SELECT nome_normalizado FROM {self.tabela}")}
+
+    def registrar(self, nome):
+        """Marca o nome para o INSERT do lote se ainda não foi emitido; retorna a chave."""
+        chave = self.normalizar(nome)
+        if chave and chave not in self.emitidos and chave not in self.pendentes:
+            self.pendentes[chave] = str(nome).replace("''", "'").strip()
+        return chave
+
+    def sql_pendentes(self):
+        """INSERT OR IGNORE em lote dos nomes pendentes.
+
+        Returns:
+            (sql, quantos não existiam no banco carregado); ('', 0) sem pendentes.
+        """
+        if not self.pendentes:
+            return '', 0
+        valores = ',\n    '.join(f"({_texto_sql(nome)}, {_texto_sql(chave)})"
+                                 for chave, nome in self.pendentes.items())
+        sql = f"INSERT OR IGNORE INTO {self.tabela} (nome, nome_normalizado) VALUES\n    {valores};"
+        novos = sum(1 for chave in self.pendentes if chave not in self.existentes)
+        self.emitidos.update(self.pendentes)
+        self.pendentes = {}
+        return sql, novos
+
+
+class ResolvedorDimensoes:
+    """Resolve fornecedor/categoria/centro_custo das contas para as dimensões."""
+
+    def __init__(self, conn=None):
+        if conn is not None:
+            garantir_esquema(conn)
+        self.dimensoes = {}
+        for campo, (tabela, coluna, sufixos) in DIMENSOES.items():
+            dimensao = Dimensao(tabela, normalizar_fornecedor if sufixos else normalizar_texto)
+            if conn is not None:
+                dimensao.carregar(conn)
+            self.dimensoes[campo] = (dimensao, coluna)
+        self.criados = {campo: 0 for campo in DIMENSOES}
+
+    def resolver(self, contas):
+        """Preenche <campo>_id com (tabela, nome normalizado) em cada conta.
+
+        Contas sem o campo (ou com ele vazio) recebem None.
+
+        Returns:
+            Os INSERTs das dimensões, a gravar antes dos INSERTs das contas.
+        """
+        inserts = []
+        for campo, (dimensao, coluna) in self.dimensoes.items():
+            for conta in contas:
+                chave = dimensao.registrar(conta[campo]) if conta.get(campo) else ''
+                conta[coluna] = (dimensao.tabela, chave) if chave else None
+            sql, novos = dimensao.sql_pendentes()
+            if sql:
+                inserts.append(sql)
+                self.criados[campo] += novos
+        return inserts
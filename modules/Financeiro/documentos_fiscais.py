@@ -0,0 +1,309 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Validação e normalização vetorizadas de CNPJ/CPF (NumPy)
+
+As importações gravam fornecedor_cnpj (ex.: 17.853.788/0001-95) e o
+CPF/CNPJ do cliente (C15 do modelo VENDAS_PCP) como vieram, sem conferir
+os dígitos verificadores; um documento errado só aparecia quando a
+emissão da NF-e falhava. Aqui uma coluna inteira é validada de uma vez:
+
+    1. os textos viram uma matriz (linhas x caracteres) de códigos
+       Unicode (view uint32 do array 'U', sem laço por caractere) e uma
+       tabela troca cada código pelo seu valor (pontuação e espaço = 0)
+    2. 11 caracteres mantidos é CPF, 14 é CNPJ; as linhas de cada tamanho
+       são compactadas de uma vez (seleção booleana + reshape)
+    3. os dois dígitos verificadores são o produto da matriz pelos
+       vetores de pesos
+    4. os válidos são remontados com a máscara (000.000.000-00 ou
+       00.000.000/0000-00) direto na matriz de códigos
+
+Sequências repetidas (000.000.000-00, 11.111.111/1111-11) são recusadas.
+O CNPJ alfanumérico (IN RFB 2.229/2024) já é aceito: as 12 primeiras
+posições podem ter letras, que valem código ASCII - 48 no cálculo, e os
+verificadores continuam numéricos. As letras só contam quando o valor
+limpo tem 14 caracteres e termina em dois dígitos; fora disso (ou se o
+CNPJ alfanumérico não confere) são descartadas, e "CPF 123.456.789-09"
+vale como o CPF.
+
+Números (células numéricas do Excel, que perdem os zeros à esquerda)
+são completados com zeros até 11 dígitos, ou 14 a partir de 10^11; um
+número menor que não confere como CPF é conferido de novo como CNPJ com
+14 dígitos (CNPJ com três ou mais zeros à esquerda).
+
+Um milhão de documentos vindos de uma lista de textos são validados em
+menos de um segundo; boa parte disso é montar o array 'U'.
+
+Uso:
+    python documentos_fiscais.py 17853788000195 123.456.789-09 ...
+"""
+
+import argparse
+import numbers
+import sys
+
+import numpy as np
+
+TAMANHO_CPF = 11
+TAMANHO_CNPJ = 14
+TAMANHO_LOTE = 5000
+
+PESOS_CPF_1 = np.arange(10, 1, -1, dtype=np.int32)
+PESOS_CPF_2 = np.arange(11, 1, -1, dtype=np.int32)
+PESOS_CNPJ_1 = np.array([5, 4, 3, 2, 9, 8, 7, 6, 5, 4, 3, 2], dtype=np.int32)
+PESOS_CNPJ_2 = np.array([6, 5, 4, 3, 2, 9, 8, 7, 6, 5, 4, 3, 2], dtype=np.int32)
+
+MASCARA_CPF = '###.###.###-##'
+MASCARA_CNPJ = '##.###.###/####-##'
+LARGURA_FORMATADO = len(MASCARA_CNPJ)
+
+# Valor no cálculo dos verificadores (+ 1) de cada caractere ASCII: dígitos
+# valem 0-9 e letras (maiúsculas ou não) o código ASCII - 48; o resto é 0
+VALOR_CARACTERE = np.zeros(128, dtype=np.uint8)
+VALOR_CARACTERE[ord('0'):ord('9') + 1] = np.arange(1, 11)
+VALOR_CARACTERE[ord('A'):ord('Z') + 1] = np.arange(ord('A') - 47, ord('Z') - 46)
+VALOR_CARACTERE[ord('a'):ord('z') + 1] = VALOR_CARACTERE[ord('A'):ord('Z') + 1]
+
+
+def _mascara(molde):
+    """(códigos da pontuação, posições dos caracteres) de uma máscara"""
+    codigos = np.array([0 if c == '#' else ord(c) for c in molde], dtype=np.uint32)
+    return codigos, np.array([i for i, c in enumerate(molde) if c == '#'])
+
+
+class Documentos:
+    """Resultado de validar_documentos: arrays paralelos, um item por valor.
+
+    normalizado  só os dígitos/letras, sem máscara; '' se não tem 11 nem 14
+    formatado    com a máscara de CPF ou CNPJ; '' se inválido
+    tipo         'CPF' ou 'CNPJ' pelo tamanho, '' se não tem nenhum dos dois
+    valido       dígitos verificadores conferem
+    vazio        nada para validar (None, NaN, '' ou só pontuação)
+    """
+
+    def __init__(self, normalizado, formatado, tipo, valido, vazio):
+        self.normalizado = normalizado
+        self.formatado = formatado
+        self.tipo = tipo
+        self.valido = valido
+        self.vazio = vazio
+
+    def __len__(self):
+        return len(self.valido)
+
+    @property
+    def invalido(self):
+        """Preenchido mas com dígitos verificadores errados ou tamanho inválido"""
+        return ~(self.valido | self.vazio)
+
+
+def _texto(valor):
+    if valor is None:
+        return ''
+    if isinstance(valor, float):
+        if valor != valor:  # NaN (células vazias do pandas)
+            return ''
+        if valor.is_integer():
+            valor = int(valor)
+    if isinstance(valor, numbers.Integral) and not isinstance(valor, bool):
+        return str(valor).zfill(TAMANHO_CPF if valor < 10 ** TAMANHO_CPF else TAMANHO_CNPJ)
+    return str(valor)
+
+
+def _numero_curto(valor):
+    """Número inteiro que _texto completa só até 11 dígitos"""
+    if isinstance(valor, float):
+        if valor != valor or not valor.is_integer():
+            return False
+        valor = int(valor)
+    return isinstance(valor, numbers.Integral) and not isinstance(valor, bool) and 0 <= valor < 10 ** TAMANHO_CPF
+
+
+def _matriz(valores):
+    """Matriz (n, largura) com o código Unicode de cada caractere"""
+    if isinstance(valores, np.ndarray) and valores.dtype.kind == 'U':
+        textos = np.ascontiguousarray(valores.ravel())
+    else:
+        textos = np.array([v if type(v) is str else _texto(v) for v in valores], dtype=str)
+    largura = textos.dtype.itemsize // 4
+    if largura == 0:
+        return np.zeros((len(textos), 0), dtype=np.uint32)
+    return textos.view(np.uint32).reshape(len(textos), largura)
+
+
+def _dv_cnpj(soma):
+    resto = soma % 11
+    return np.where(resto < 2, 0, 11 - resto)
+
+
+def _valido_cpf(numeros):
+    dv1 = numeros[:, :9] @ PESOS_CPF_1 * 10 % 11 % 10
+    dv2 = numeros[:, :10] @ PESOS_CPF_2 * 10 % 11 % 10
+    return (numeros < 10).all(axis=1) & (dv1 == numeros[:, 9]) & (dv2 == numeros[:, 10])
+
+
+def _valido_cnpj(numeros):
+    dv1 = _dv_cnpj(numeros[:, :12] @ PESOS_CNPJ_1)
+    dv2 = _dv_cnpj(numeros[:, :13] @ PESOS_CNPJ_2)
+    return (numeros[:, 12:] < 10).all(axis=1) & (dv1 == numeros[:, 12]) & (dv2 == numeros[:, 13])
+
+
+def _validar(valor):
+    """Valida a matriz de valores (+ 1) de _matriz; devolve Documentos."""
+    tamanho = np.count_nonzero(valor, axis=1)
+    n = len(valor)
+
+    normalizado = np.zeros((n, TAMANHO_CNPJ), dtype=np.uint32)
+    formatado = np.zeros((n, LARGURA_FORMATADO), dtype=np.uint32)
+    valido = np.zeros(n, dtype=bool)
+    for tipo, validar, mascara in ((TAMANHO_CPF, _valido_cpf, MASCARA_CPF),
+                                   (TAMANHO_CNPJ, _valido_cnpj, MASCARA_CNPJ)):
+        indices = np.flatnonzero(tamanho == tipo)
+        # Cada linha selecionada tem exatamente `tipo` caracteres mantidos, então
+        # a seleção booleana (em ordem de linha) já sai compactada à esquerda
+        linhas = valor[indices]
+        numeros = linhas[linhas > 0].reshape(-1, tipo).astype(np.int32) - 1
+        codigos = (numeros + ord('0')).astype(np.uint32)
+        normalizado[indices, :tipo] = codigos
+
+        ok = validar(numeros) & ~(numeros == numeros[:, :1]).all(axis=1)
+        valido[indices[ok]] = True
+        pontuacao, posicoes = _mascara(mascara)
+        com_mascara = np.empty((int(ok.sum()), LARGURA_FORMATADO), dtype=np.uint32)
+        com_mascara[:, :len(mascara)] = pontuacao
+        com_mascara[:, len(mascara):] = 0
+        com_mascara[:, posicoes] = codigos[ok]
+        formatado[indices[ok]] = com_mascara
+
+    return Documentos(
+        normalizado=normalizado.view(f'U{TAMANHO_CNPJ}').ravel(),
+        formatado=formatado.view(f'U{LARGURA_FORMATADO}').ravel(),
+        tipo=np.where(tamanho == TAMANHO_CPF, 'CPF', np.where(tamanho == TAMANHO_CNPJ, 'CNPJ', '')),
+        valido=valido,
+        vazio=tamanho == 0,
+    )
+
+
+def _aproveitar(resultado, indices, outro):
+    """Copia de `outro` (validado para as linhas `indices`) o que for válido"""
+    ok = outro.valido
+    for campo in ('normalizado', 'formatado', 'tipo', 'valido'):
+        getattr(resultado, campo)[indices[ok]] = getattr(outro, campo)[ok]
+
+
+def _sem_letras(linhas):
+    linhas = linhas.copy()
+    linhas[linhas > 10] = 0
+    return linhas
+
+
+def validar_documentos(valores):
+    """Valida e normaliza uma coluna de CNPJ/CPF de uma vez.
+
+    Args:
+        valores: lista, array ou coluna do pandas com textos
+            (pontuados ou não), números, None ou NaN
+
+    Returns:
+        Documentos com os arrays normalizado, formatado, tipo, valido
+        e vazio.
+    """
+    # Valor de cada caractere + 1 (0 = pontuação/espaço, descartado; > 10 = letra)
+    valor = VALOR_CARACTERE[np.minimum(_matriz(valores), 127)]
+    tamanho = np.count_nonzero(valor, axis=1)
+    com_letras = (valor > 10).any(axis=1)
+
+    # Letras só num candidato a CNPJ alfanumérico: 14 caracteres e os dois
+    # últimos (verificadores) dígitos
+    candidatos = np.flatnonzero(com_letras & (tamanho == TAMANHO_CNPJ))
+    linhas = valor[candidatos]
+    finais = linhas[linhas > 0].reshape(-1, TAMANHO_CNPJ)[:, TAMANHO_CPF + 1:]
+    alfanumerico = np.zeros(len(valor), dtype=bool)
+    alfanumerico[candidatos[(finais <= 10).all(axis=1)]] = True
+    descartar = np.flatnonzero(com_letras & ~alfanumerico)
+    valor[descartar] = _sem_letras(valor[descartar])
+
+    resultado = _validar(valor)
+    resultado.vazio = tamanho == 0
+
+    # Um CNPJ alfanumérico que não confere pode ser texto com o documento
+    # ("CPF 123.456.789-09"): sem as letras, vale o que sobrar
+    refazer = np.flatnonzero(alfanumerico & ~resultado.valido)
+    if len(refazer):
+        _aproveitar(resultado, refazer, _validar(_sem_letras(valor[refazer])))
+
+    # Número do Excel abaixo de 10^11 foi completado como CPF; se não confere,
+    # pode ser um CNPJ que perdeu três ou mais zeros à esquerda
+    suspeitos = np.flatnonzero((tamanho == TAMANHO_CPF) & ~resultado.valido)
+    if len(suspeitos) and not (isinstance(valores, np.ndarray) and valores.dtype.kind == 'U'):
+        if not isinstance(valores, (list, tuple, np.ndarray)):
+            valores = list(valores)
+        indices = np.array([i for i in suspeitos if _numero_curto(valores[i])], dtype=np.intp)
+        if len(indices):
+            cnpjs = [str(int(valores[i])).zfill(TAMANHO_CNPJ) for i in indices]
+            _aproveitar(resultado, indices, _validar(VALOR_CARACTERE[np.minimum(_matriz(cnpjs), 127)]))
+    return resultado
+
+
+def validar_contas(contas, campo='fornecedor_cnpj'):
+    """Valida o documento de um lote de contas (dicts de parse_row) numa chamada.
+
+    Os válidos são regravados com a máscara. Os inválidos ficam vazios
+    (o INSERT grava NULL) e o valor lido vai para conta['documento_invalido'].
+    Contas sem o campo preenchido não são tocadas.
+
+    Returns:
+        Quantos documentos do lote eram inválidos.
+    """
+    preenchidas = [conta for conta in contas if conta.get(campo)]
+    if not preenchidas:
+        return 0
+    resultado = validar_documentos([conta[campo] for conta in preenchidas])
+    invalidos = 0
+    for conta, formatado, invalido in zip(preenchidas, resultado.formatado.tolist(), resultado.invalido.tolist()):
+        if invalido:
+            conta['documento_invalido'] = conta[campo]
+            invalidos += 1
+        conta[campo] = formatado
+    return invalidos
+
+
+def validar_em_lotes(contas, campo='fornecedor_cnpj', tamanho_lote=TAMANHO_LOTE):
+    """Etapa de pipeline: valida as contas em lotes de tamanho_lote com validar_contas
+
+    Só as contas com documento abrem um lote; sem lote aberto, as demais
+    seguem direto, então um arquivo sem a coluna continua preguiçoso (uma
+    conta por vez na memória).
+    """
+    lote = []
+    for conta in contas:
+        if not lote and not conta.get(campo):
+            yield conta
+            continue
+        lote.append(conta)
+        if len(lote) >= tamanho_lote:
+            validar_contas(lote, campo)
+            yield from lote
+            lote = []
+    if lote:
+        validar_contas(lote, campo)
+        yield from lote
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Valida CNPJ/CPF (dígitos verificadores)')
+    parser.add_argument('documentos', nargs='*', help='documentos; sem nenhum, lê um por linha da entrada')
+    args = parser.parse_args(argv)
+
+    valores = args.documentos or [linha.strip() for linha in sys.stdin]
+    resultado = validar_documentos(valores)
+    for valor, tipo, formatado, valido in zip(valores, resultado.tipo, resultado.formatado, resultado.valido):
+        if valido:
+            print(f"✅ {tipo} {formatado}")
+        else:
+            print(f"❌ {valor!r}: {tipo + ' ' if tipo else ''}inválido")
+    return 0 if resultado.valido.all() else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
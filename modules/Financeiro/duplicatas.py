@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Detecção de contas a pagar duplicadas na importação
+
+Rodar convert_csv_to_sql duas vezes sobre exportações que se sobrepõem
+gravava as mesmas contas de novo: o único filtro era o INSERT OR IGNORE
+pelo codigo, que as importações não preenchem. Aqui cada conta vira
+chaves de bloqueio, todas consultadas num dicionário (uma passada, sem
+comparar contas duas a duas):
+
+    exata       fornecedor + documento + centavos + vencimento
+    documento   fornecedor + documento + centavos, vencimento a até
+                JANELA_DIAS dias (a mesma nota com a data redigitada)
+    data        fornecedor + centavos + vencimento, quando uma das duas
+                contas não tem documento
+
+O fornecedor é comparado por normalizar_fornecedor e o documento por
+chave_documento (dimensoes.py), então "Cobre Sul Ltda." / "NF-0012" e
+"COBRE SUL LTDA" / "12" caem na mesma chave. Bater na chave exata é
+duplicata ("exata"); bater só numa das outras é "quase". Parcelas da
+mesma nota (vencimentos a um mês de distância) e notas diferentes com o
+mesmo valor no mesmo dia não são duplicatas.
+
+As chaves vêm das contas já lidas do arquivo e, com carregar_tabela, das
+que já estão em contas_pagar (uma leitura, só as colunas das chaves).
+"""
+
+from datetime import date
+
+from dimensoes import chave_documento, normalizar_fornecedor
+
+JANELA_DIAS = 3
+TAMANHO_BLOCO = 5000
+SQL_CHAVES = "SELECT id, fornecedor_nome, numero_documento, data_vencimento, valor_original FROM contas_pagar"
+
+
+class DetectorDuplicatas:
+    """Índice de chaves de bloqueio das contas já vistas."""
+
+    def __init__(self, janela_dias=JANELA_DIAS):
+        self.janela_dias = janela_dias
+        self.exatas = {}
+        self.por_documento = {}
+        self.por_data = {}
+
+    def _chaves(self, fornecedor, documento, valor, vencimento):
+        return (normalizar_fornecedor(fornecedor), chave_documento(documento),
+                int(round((valor or 0) * 100)), str(vencimento or '')[:10])
+
+    def carregar_tabela(self, conn, tamanho_bloco=TAMANHO_BLOCO):
+        """Registra as contas que já estão em contas_pagar; retorna quantas."""
+        cursor = conn.execute(SQL_CHAVES)
+        total = 0
+        while True:
+            bloco = cursor.fetchmany(tamanho_bloco)
+            if not bloco:
+                return total
+            for id_, fornecedor, documento, vencimento, valor in bloco:
+                self.registrar_chaves(self._chaves(fornecedor, documento, valor, vencimento), f'id {id_}')
+            total += len(bloco)
+
+    def registrar_chaves(self, chaves, origem):
+        """Registra chaves já calculadas (ex.: relidas de um checkpoint)."""
+        fornecedor, documento, centavos, vencimento = chaves
+        self.exatas.setdefault(chaves, origem)
+        if documento and vencimento:
+            self.por_documento.setdefault((fornecedor, documento, centavos), []).append(
+                (date.fromisoformat(vencimento).toordinal(), origem))
+        self.por_data.setdefault((fornecedor, centavos, vencimento), {}).setdefault(documento, origem)
+
+    def _procurar(self, chaves):
+        fornecedor, documento, centavos, vencimento = chaves
+        if chaves in self.exatas:
+            return 'exata', self.exatas[chaves]
+        if documento and vencimento:
+            dia = date.fromisoformat(vencimento).toordinal()
+            for outro, origem in self.por_documento.get((fornecedor, documento, centavos), ()):
+                if abs(outro - dia) <= self.janela_dias:
+                    return 'quase', origem
+        documentos = self.por_data.get((fornecedor, centavos, vencimento))
+        if documentos:
+            if not documento:
+                return 'quase', next(iter(documentos.values()))
+            if '' in documentos:
+                return 'quase', documentos['']
+        return None
+
+    def chaves(self, conta):
+        """Chaves de bloqueio de uma conta (dict de parse_row)."""
+        return self._chaves(conta['fornecedor'], conta.get('documento'), conta['valor'], conta['data_vencimento'])
+
+    def verificar(self, conta):
+        """Procura a conta entre as já registradas.
+
+        Returns:
+            None se for nova, ou (tipo, origem da conta igual) com tipo
+            'exata' ou 'quase'.
+        """
+        return self._procurar(self.chaves(conta))
+
+    def registrar(self, conta, origem):
+        """Registra a conta (que vai ser gravada) sob a origem dada, ex.: 'linha 12'."""
+        self.registrar_chaves(self.chaves(conta), origem)
+
+    def filtrar(self, conta, pular_quase=False):
+        """Verifica a conta (com conta['linha']) e, se ela vai ser gravada, a registra.
+
+        Returns:
+            (tipo, origem) se a conta deve ser descartada: duplicata exata
+            ou, com pular_quase, quase duplicata. Senão None; uma quase
+            duplicata mantida recebe conta['duplicata'] = origem.
+        """
+        achado = self.verificar(conta)
+        if achado is not None:
+            if achado[0] == 'exata' or pular_quase:
+                return achado
+            conta['duplicata'] = achado[1]
+        self.registrar(conta, f"linha {conta['linha']}")
+        return None
+
+
+def filtrar_duplicatas(contas, detector, duplicatas, pular_quase=False):
+    """Etapa de pipeline: descarta duplicatas exatas e marca as quase.
+
+    As descartadas vão para `duplicatas` como {'linha', 'tipo', 'de'}.
+    """
+    for conta in contas:
+        achado = detector.filtrar(conta, pular_quase)
+        if achado is None:
+            yield conta
+        else:
+            duplicatas.append({'linha': conta['linha'], 'tipo': achado[0], 'de': achado[1]})
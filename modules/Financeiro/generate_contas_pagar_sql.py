@@ -22,11 +22,34 @@ def generate_contas_pagar_sql():
 -- Gerado em: {datetime.now().strftime('%d/%m/%Y %H:%M:%S')}
 -- =====================================================
 
+-- Dimensões: nomes normalizados (maiúsculas, sem acentos nem sufixos
+-- societários) -> id; preenchidas pelo import_jobs.py --db (dimensoes.py)
+CREATE TABLE IF NOT EXISTS fornecedores_financeiro (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    nome VARCHAR(255) NOT NULL,
+    nome_normalizado VARCHAR(255) NOT NULL UNIQUE,
+    data_criacao DATETIME DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS categorias_financeiro (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    nome VARCHAR(255) NOT NULL,
+    nome_normalizado VARCHAR(255) NOT NULL UNIQUE,
+    data_criacao DATETIME DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS centros_custo_financeiro (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    nome VARCHAR(255) NOT NULL,
+    nome_normalizado VARCHAR(255) NOT NULL UNIQUE,
+    data_criacao DATETIME DEFAULT CURRENT_TIMESTAMP
+);
+
 -- Criar tabela de contas a pagar
 CREATE TABLE IF NOT EXISTS contas_pagar (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
     codigo VARCHAR(20) UNIQUE,
-    fornecedor_id INTEGER,
+    fornecedor_id INTEGER REFERENCES fornecedores_financeiro(id),
     fornecedor_nome VARCHAR(255) NOT NULL,
     fornecedor_cnpj VARCHAR(18),
     descricao TEXT NOT NULL,
@@ -43,7 +66,9 @@ CREATE TABLE IF NOT EXISTS contas_pagar (
         valor_original + valor_juros + valor_multa - valor_desconto
     ) STORED,
     categoria VARCHAR(100) DEFAULT 'Geral',
+    categoria_id INTEGER REFERENCES categorias_financeiro(id),
     centro_custo VARCHAR(100),
+    centro_custo_id INTEGER REFERENCES centros_custo_financeiro(id),
     forma_pagamento VARCHAR(50),
     conta_bancaria VARCHAR(100),
     status VARCHAR(20) DEFAULT 'PENDENTE' CHECK (
@@ -68,6 +93,10 @@ CREATE INDEX IF NOT EXISTS idx_contas_pagar_vencimento ON contas_pagar(data_venc
 CREATE INDEX IF NOT EXISTS idx_contas_pagar_status ON contas_pagar(status);
 CREATE INDEX IF NOT EXISTS idx_contas_pagar_categoria ON contas_pagar(categoria);
 CREATE INDEX IF NOT EXISTS idx_contas_pagar_documento ON contas_pagar(numero_documento);
+CREATE INDEX IF NOT EXISTS idx_contas_pagar_fornecedor_id ON contas_pagar(fornecedor_id);
+CREATE INDEX IF NOT EXISTS idx_contas_pagar_categoria_id ON contas_pagar(categoria_id);
+CREATE INDEX IF NOT EXISTS idx_contas_pagar_centro_custo_id ON contas_pagar(centro_custo_id);
+CREATE INDEX IF NOT EXISTS idx_contas_pagar_atualizacao ON contas_pagar(data_atualizacao);
 
 -- Trigger para atualizar data_atualizacao
 CREATE TRIGGER IF NOT EXISTS trg_contas_pagar_updated
@@ -220,6 +249,27 @@ FROM contas_pagar
 GROUP BY fornecedor_nome
 ORDER BY valor_aberto DESC;
 
+-- View: Resumo por fornecedor resolvido (agrupa pelo id, não pelo texto)
+CREATE VIEW IF NOT EXISTS v_resumo_fornecedor_id AS
+SELECT 
+    r.fornecedor_id,
+    f.nome as fornecedor_nome,
+    r.total_contas,
+    r.valor_total,
+    r.valor_aberto
+FROM (
+    SELECT 
+        fornecedor_id,
+        COUNT(*) as total_contas,
+        SUM(valor_total) as valor_total,
+        SUM(CASE WHEN status IN ('PENDENTE', 'VENCIDA') THEN valor_total ELSE 0 END) as valor_aberto
+    FROM contas_pagar
+    WHERE fornecedor_id IS NOT NULL
+    GROUP BY fornecedor_id
+) r
+JOIN fornecedores_financeiro f ON f.id = r.fornecedor_id
+ORDER BY r.valor_aberto DESC;
+
 -- View: Fluxo de caixa
 CREATE VIEW IF NOT EXISTS v_fluxo_caixa AS
 SELECT 
@@ -234,6 +284,8 @@ ORDER BY data_vencimento;
 
 -- =====================================================
 -- CONSULTAS ÚTEIS PARA GESTÃO
+-- (resumo_financeiro.py calcula todas elas e as estatísticas
+--  finais numa única leitura da tabela)
 -- =====================================================
 
 -- 1. Contas vencidas hoje
@@ -5,12 +5,15 @@ Script para analisar arquivo Excel de Contas a Pagar
 e gerar script SQL para importação no ALUFORCE
 """
 
+import contextlib
 import pandas as pd
 import sqlite3
 import os
 from datetime import datetime
 import re
 
+from documentos_fiscais import validar_documentos
+
 def clean_currency(value):
     """Limpa valores monetários para conversão"""
     if pd.isna(value) or value == '':
@@ -92,11 +95,8 @@ def analyze_excel_file(file_path):
         print(f"❌ Erro ao ler arquivo: {str(e)}")
         return None
 
-def generate_sql_script(df, table_name='contas_pagar'):
-    """Gera script SQL baseado no DataFrame"""
-    
-    if df is None or df.empty:
-        return None
+def normalize_dataframe(df):
+    """Padroniza os nomes das colunas do DataFrame"""
     
     # Mapear colunas comuns
     column_mapping = {
@@ -125,7 +125,12 @@ def generate_sql_script(df, table_name='contas_pagar'):
         'CENTRO_CUSTO': 'centro_custo',
         'OBSERVAÇÕES': 'observacoes',
         'OBSERVACOES': 'observacoes',
-        'OBS': 'observacoes'
+        'OBS': 'observacoes',
+        'CNPJ': 'fornecedor_cnpj',
+        'CPF/CNPJ': 'fornecedor_cnpj',
+        'CNPJ/CPF': 'fornecedor_cnpj',
+        'CNPJ FORNECEDOR': 'fornecedor_cnpj',
+        'CNPJ DO FORNECEDOR': 'fornecedor_cnpj'
     }
     
     # Normalizar nomes das colunas
@@ -137,36 +142,30 @@ def generate_sql_script(df, table_name='contas_pagar'):
         if old_col in df_normalized.columns:
             df_normalized = df_normalized.rename(columns={old_col: new_col})
     
-    # Script SQL
-    sql_script = f"""-- Script de Importação: Contas a Pagar
--- Gerado automaticamente em {datetime.now().strftime('%d/%m/%Y %H:%M:%S')}
--- Sistema: ALUFORCE v2.0
+    return df_normalized
 
--- Criar tabela se não existir
-CREATE TABLE IF NOT EXISTS {table_name} (
-    id INTEGER PRIMARY KEY AUTOINCREMENT,
-    fornecedor TEXT NOT NULL,
-    descricao TEXT,
-    valor DECIMAL(10,2) NOT NULL DEFAULT 0.00,
-    data_vencimento DATE,
-    data_emissao DATE,
-    numero_documento TEXT,
-    categoria TEXT,
-    centro_custo TEXT,
-    status TEXT DEFAULT 'PENDENTE',
-    observacoes TEXT,
-    data_criacao DATETIME DEFAULT CURRENT_TIMESTAMP,
-    data_atualizacao DATETIME DEFAULT CURRENT_TIMESTAMP
-);
-
--- Limpar dados anteriores (opcional - comentar se quiser manter)
--- DELETE FROM {table_name};
-
--- Inserir dados
-"""
+def validate_documents(df_normalized):
+    """Confere os dígitos verificadores da coluna de CNPJ/CPF inteira de uma vez
     
-    # Gerar INSERTs
-    insert_count = 0
+    Os válidos ficam com a máscara; os inválidos ficam vazios e o valor
+    lido vai para a coluna documento_invalido.
+    """
+    if 'fornecedor_cnpj' not in df_normalized.columns:
+        return df_normalized
+    
+    lidos = df_normalized['fornecedor_cnpj'].to_numpy(dtype=object)
+    resultado = validar_documentos(lidos)
+    invalidos = resultado.invalido
+    if invalidos.any():
+        print(f"🪪 CNPJ/CPF inválidos (gravados sem o documento): {int(invalidos.sum())}")
+    
+    return df_normalized.assign(
+        fornecedor_cnpj=resultado.formatado,
+        documento_invalido=[str(lido) if invalido else '' for lido, invalido in zip(lidos, invalidos.tolist())],
+    )
+
+def clean_records(df_normalized):
+    """Limpa cada linha; gera (index, registro) ou (index, exceção)"""
     
     for index, row in df_normalized.iterrows():
         try:
@@ -206,35 +205,103 @@ CREATE TABLE IF NOT EXISTS {table_name} (
             if observacoes == 'nan':
                 observacoes = ''
             
-            # Gerar INSERT
-            sql_script += f"""
+            fornecedor_cnpj = row.get('fornecedor_cnpj', '')
+            documento_invalido = ' '.join(str(row.get('documento_invalido', '')).split())
+            
+        except Exception as e:
+            yield index, e
+            continue
+        
+        yield index, {
+            'fornecedor': fornecedor,
+            'descricao': descricao,
+            'valor': valor,
+            'data_vencimento': data_vencimento,
+            'data_emissao': data_emissao,
+            'numero_documento': numero_documento,
+            'categoria': categoria,
+            'centro_custo': centro_custo,
+            'status': status,
+            'observacoes': observacoes,
+            'fornecedor_cnpj': fornecedor_cnpj,
+            'documento_invalido': documento_invalido,
+        }
+
+def emit_sql(registros, total_registros, table_name='contas_pagar'):
+    """Monta o script SQL a partir dos registros limpos"""
+    
+    # Script SQL
+    sql_script = f"""-- Script de Importação: Contas a Pagar
+-- Gerado automaticamente em {datetime.now().strftime('%d/%m/%Y %H:%M:%S')}
+-- Sistema: ALUFORCE v2.0
+
+-- Criar tabela se não existir
+CREATE TABLE IF NOT EXISTS {table_name} (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    fornecedor TEXT NOT NULL,
+    fornecedor_cnpj TEXT,
+    descricao TEXT,
+    valor DECIMAL(10,2) NOT NULL DEFAULT 0.00,
+    data_vencimento DATE,
+    data_emissao DATE,
+    numero_documento TEXT,
+    categoria TEXT,
+    centro_custo TEXT,
+    status TEXT DEFAULT 'PENDENTE',
+    observacoes TEXT,
+    data_criacao DATETIME DEFAULT CURRENT_TIMESTAMP,
+    data_atualizacao DATETIME DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Limpar dados anteriores (opcional - comentar se quiser manter)
+-- DELETE FROM {table_name};
+
+-- Inserir dados
+"""
+    
+    # Gerar INSERTs
+    insert_count = 0
+    
+    for index, registro in registros:
+        if isinstance(registro, Exception):
+            sql_script += f"\n-- ERRO na linha {index + 1}: {str(registro)}"
+            continue
+        
+        if registro['documento_invalido']:
+            sql_script += f"\n-- CNPJ/CPF INVÁLIDO na linha {index + 1} (não gravado): {registro['documento_invalido']}"
+        
+        # fornecedor_cnpj só entra quando há documento válido: tabelas criadas
+        # por versões anteriores deste script não têm a coluna
+        coluna_cnpj = valor_cnpj = ''
+        if registro['fornecedor_cnpj']:
+            coluna_cnpj = 'fornecedor_cnpj, '
+            valor_cnpj = f"\n    '{registro['fornecedor_cnpj']}',"
+        
+        # Gerar INSERT
+        sql_script += f"""
 INSERT INTO {table_name} (
-    fornecedor, descricao, valor, data_vencimento, data_emissao,
+    fornecedor, {coluna_cnpj}descricao, valor, data_vencimento, data_emissao,
     numero_documento, categoria, centro_custo, status, observacoes
 ) VALUES (
-    '{fornecedor.replace("'", "''")}',
-    '{descricao.replace("'", "''")}',
-    {valor},
-    {f"'{data_vencimento}'" if data_vencimento else 'NULL'},
-    {f"'{data_emissao}'" if data_emissao else 'NULL'},
-    '{numero_documento.replace("'", "''")}',
-    '{categoria.replace("'", "''")}',
-    '{centro_custo.replace("'", "''")}',
-    '{status}',
-    '{observacoes.replace("'", "''")}'
+    '{registro['fornecedor'].replace("'", "''")}',{valor_cnpj}
+    '{registro['descricao'].replace("'", "''")}',
+    {registro['valor']},
+    {f"'{registro['data_vencimento']}'" if registro['data_vencimento'] else 'NULL'},
+    {f"'{registro['data_emissao']}'" if registro['data_emissao'] else 'NULL'},
+    '{registro['numero_documento'].replace("'", "''")}',
+    '{registro['categoria'].replace("'", "''")}',
+    '{registro['centro_custo'].replace("'", "''")}',
+    '{registro['status']}',
+    '{registro['observacoes'].replace("'", "''")}'
 );"""
-            
-            insert_count += 1
-            
-        except Exception as e:
-            sql_script += f"\n-- ERRO na linha {index + 1}: {str(e)}"
-            continue
+        
+        insert_count += 1
     
     # Estatísticas finais
     sql_script += f"""
 
 -- Estatísticas da Importação
--- Total de registros processados: {len(df_normalized)}
+-- Total de registros processados: {total_registros}
 -- Total de registros inseridos: {insert_count}
 -- Data da importação: {datetime.now().strftime('%d/%m/%Y %H:%M:%S')}
 
@@ -268,26 +335,63 @@ LIMIT 10;
     
     return sql_script
 
-def main():
-    """Função principal"""
-    file_path = r"C:\Users\Administrator\Documents\Sistema - Aluforce v.2 - BETA\modules\Financeiro\CONTAS A PAGAR.xlsx"
+# Mesmo comportamento de phase_profiler.phase: este módulo é importado sem
+# scripts_auxiliares no sys.path (o profiler só é carregado no __main__)
+def _phase(profiler, name):
+    return profiler.phase(name) if profiler else contextlib.nullcontext()
+
+def _stage(profiler, name, items):
+    """Sem profiler, mantém o pipeline preguiçoso; com profiler, executa a
+    etapa inteira dentro da sua fase para medir tempo e memória dela"""
+    if profiler is None:
+        return items
+    with profiler.phase(name):
+        return list(items)
+
+def generate_sql_script(df, table_name='contas_pagar', profiler=None):
+    """Gera script SQL baseado no DataFrame"""
+    
+    if df is None or df.empty:
+        return None
+    
+    with _phase(profiler, 'normalize'):
+        df_normalized = normalize_dataframe(df)
+    with _phase(profiler, 'documentos'):
+        df_normalized = validate_documents(df_normalized)
+    registros = _stage(profiler, 'clean', clean_records(df_normalized))
+    with _phase(profiler, 'emit'):
+        return emit_sql(registros, len(df_normalized), table_name)
+
+def main(file_path=None, profiler=None, metrics=None):
+    """Função principal
+    
+    Retorna True se o script SQL foi gerado. Com um JobMetrics
+    (scripts_auxiliares/job_metrics.py), registra as linhas lidas,
+    gravadas e recusadas.
+    """
+    file_path = file_path or r"C:\Users\Administrator\Documents\Sistema - Aluforce v.2 - BETA\modules\Financeiro\CONTAS A PAGAR.xlsx"
     
     print("🚀 ALUFORCE v2.0 - Gerador de Script SQL")
     print("=" * 50)
     
     # Analisar arquivo
-    df = analyze_excel_file(file_path)
+    with _phase(profiler, 'read'):
+        df = analyze_excel_file(file_path)
     
     if df is not None:
         # Gerar SQL
         print("\n📝 Gerando script SQL...")
-        sql_script = generate_sql_script(df)
+        sql_script = generate_sql_script(df, profiler=profiler)
+        
+        if sql_script and metrics:
+            recusadas = sql_script.count('\n-- ERRO na linha ')
+            metrics.add(read=len(df), written=len(df) - recusadas, rejected=recusadas)
         
         if sql_script:
             # Salvar arquivo SQL
             output_file = file_path.replace('.xlsx', '_import.sql')
             
-            with open(output_file, 'w', encoding='utf-8') as f:
+            with _phase(profiler, 'write'), open(output_file, 'w', encoding='utf-8') as f:
                 f.write(sql_script)
             
             print(f"✅ Script SQL gerado com sucesso!")
@@ -307,6 +411,30 @@ def main():
             print("❌ Erro ao gerar script SQL")
     
     print("\n🏁 Processamento concluído!")
+    return df is not None and bool(sql_script)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    import argparse
+    import sys
+    
+    parser = argparse.ArgumentParser(description='Gerador de script SQL de contas a pagar a partir do Excel')
+    parser.add_argument('file_path', nargs='?')
+    parser.add_argument('--profile', metavar='PERFIL.json',
+                        help='mede tempo e memória de cada etapa e grava o relatório em JSON')
+    parser.add_argument('--profile-time-only', action='store_true',
+                        help='no --profile, mede só tempo (sem o custo do tracemalloc)')
+    args = parser.parse_args()
+    
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'scripts_auxiliares'))
+    from job_metrics import JobMetrics
+    profiler = None
+    if args.profile:
+        from phase_profiler import PhaseProfiler
+        profiler = PhaseProfiler('generate_sql_from_excel', source=args.file_path, memory=not args.profile_time_only)
+    # Métricas Prometheus (textfile) quando ZYNTRA_METRICS_DIR estiver definido
+    with JobMetrics('generate_sql_from_excel') as metrics:
+        metrics.failed = not main(args.file_path, profiler, metrics)
+    if profiler:
+        profiler.write(args.profile)
+        profiler.print_summary()
+        print(f"📁 Perfil salvo em: {args.profile}")
\ No newline at end of file
@@ -0,0 +1,382 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Importação retomável de contas a pagar (CSV -> SQL) com checkpoints
+
+convert_csv_to_sql monta tudo em memória e, se falhar perto do fim,
+recomeça do zero. Aqui o CSV é lido em lotes e, a cada lote gravado
+(INSERTs dentro de BEGIN/COMMIT, arquivo sincronizado em disco), um
+checkpoint JSON registra:
+
+    offset          posição em bytes no CSV após o último registro do lote
+    linha           número da última linha lida
+    saida_bytes     tamanho do .sql até o fim do lote
+    importadas      contas gravadas
+    valor_total     soma de valor_original
+    por_status      {status: [quantidade, valor]}
+    total_erros     linhas recusadas
+    erros           as primeiras MAX_ERROS: [{"linha": n, "erro": "..."}]
+    total_duplicatas  contas descartadas como duplicatas
+    duplicatas      as primeiras MAX_ERROS: [{"linha": n, "tipo": "exata", "de": "linha m"}]
+    chaves_bytes    tamanho do arquivo de chaves até o fim do lote
+    total_documentos_invalidos  contas gravadas sem o CNPJ/CPF (inválido)
+
+Se o processo cair, a próxima execução trunca o .sql no último lote
+confirmado, posiciona o CSV no offset salvo e continua: nenhuma linha
+anterior é lida ou gravada de novo. O checkpoint só vale para o mesmo
+arquivo de origem (tamanho e data de modificação) e é apagado ao concluir.
+
+As regras de limpeza e validação são as de convert_csv_to_sql.
+
+Com ZYNTRA_METRICS_DIR definido, cada execução grava import_jobs.prom
+(scripts_auxiliares/job_metrics.py): linhas lidas, gravadas e recusadas
+contam só lotes confirmados, e a latência de cada lote (da primeira linha
+lida ao checkpoint gravado) entra no histograma.
+
+Com --db banco.sqlite, cada lote passa antes por dimensoes.py: fornecedor
+e categoria são normalizados, o lote começa com um INSERT OR IGNORE por
+dimensão dos nomes novos e os INSERTs das contas gravam
+fornecedor_id/categoria_id/centro_custo_id com uma subconsulta por
+nome_normalizado. Nada é gravado no banco além do esquema: o .sql pode
+ser aplicado nele ou em qualquer outro banco com as mesmas tabelas.
+
+Cada conta passa também por duplicatas.py: duplicatas exatas (no próprio
+arquivo ou, com --db, no banco) não são gravadas e as quase duplicatas
+saem com um comentário antes do INSERT (ou são puladas, --pular-quase).
+As chaves das contas de cada lote confirmado vão para <sql>.chaves.jsonl,
+que a retomada relê para continuar detectando duplicatas das linhas
+anteriores ao checkpoint sem ler o CSV de novo.
+
+Com numpy instalado, o CNPJ/CPF do fornecedor (8ª coluna, opcional) de
+cada lote é validado numa chamada (documentos_fiscais.py): os válidos são
+gravados com a máscara e os inválidos ficam de fora do INSERT, com um
+comentário.
+
+Uso:
+    python import_jobs.py contas_pagar.csv [saida.sql] [--lote 5000] [--reiniciar] [--db banco.sqlite]
+                          [--pular-quase]
+"""
+
+import argparse
+import csv
+import json
+import os
+import sqlite3
+import sys
+import time
+from datetime import datetime
+
+from convert_csv_to_sql import format_insert, parse_row
+from dimensoes import ResolvedorDimensoes
+from duplicatas import DetectorDuplicatas
+
+try:
+    from documentos_fiscais import validar_contas
+except ImportError:  # numpy é opcional: sem ele o CNPJ/CPF é gravado como veio
+    validar_contas = None
+
+TAMANHO_LOTE = 5000
+MAX_ERROS = 1000
+VERSAO_CHECKPOINT = 3
+BOM = b'\xef\xbb\xbf'
+
+
+def _assinatura(caminho):
+    st = os.stat(caminho)
+    return [st.st_size, st.st_mtime_ns]
+
+
+def _gravar_json(caminho, dados):
+    """Grava o JSON de forma atômica (arquivo temporário + rename)."""
+    tmp = caminho + '.tmp'
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(dados, f, ensure_ascii=False)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, caminho)
+
+
+def carregar_checkpoint(caminho, csv_file):
+    """Retorna o checkpoint salvo para este CSV, ou None."""
+    try:
+        with open(caminho, 'r', encoding='utf-8') as f:
+            dados = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if dados.get('versao') != VERSAO_CHECKPOINT or dados.get('origem') != _assinatura(csv_file):
+        return None
+    return dados
+
+
+def _detectar_formato(csv_file):
+    """Retorna (delimitador, offset_inicial, tem_cabecalho) como convert_csv_to_sql."""
+    with open(csv_file, 'rb') as f:
+        inicio = f.read(1024)
+        offset = len(BOM) if inicio.startswith(BOM) else 0
+        sample = inicio[offset:].decode('utf-8', 'ignore')
+        delimiter = ',' if sample.count(',') > sample.count(';') else ';'
+        f.seek(offset)
+        primeira = next(csv.reader([f.readline().decode('utf-8')], delimiter=delimiter), [])
+    tem_cabecalho = any('fornecedor' in str(cell).lower() for cell in primeira)
+    return delimiter, offset, tem_cabecalho
+
+
+def iterar_registros(f, delimiter):
+    """Lê registros CSV de um arquivo binário, com o offset após cada um.
+
+    Campos entre aspas com quebra de linha são juntados antes do parse,
+    então o offset sempre cai no início de um registro.
+    """
+    while True:
+        bruto = f.readline()
+        if not bruto:
+            return
+        while bruto.count(b'"') % 2:
+            continuacao = f.readline()
+            if not continuacao:
+                break
+            bruto += continuacao
+        texto = bruto.decode('utf-8')
+        row = next(csv.reader([texto], delimiter=delimiter), [])
+        yield row, f.tell()
+
+
+def _novo_estado(csv_file, delimiter, offset):
+    return {
+        'versao': VERSAO_CHECKPOINT,
+        'origem': _assinatura(csv_file),
+        'delimitador': delimiter,
+        'offset': offset,
+        'linha': 0,
+        'saida_bytes': 0,
+        'lotes': 0,
+        'importadas': 0,
+        'valor_total': 0.0,
+        'por_status': {},
+        'total_erros': 0,
+        'erros': [],
+        'total_duplicatas': 0,
+        'duplicatas': [],
+        'chaves_bytes': 0,
+        'total_documentos_invalidos': 0,
+    }
+
+
+def executar_importacao(csv_file, sql_file=None, checkpoint_file=None,
+                        tamanho_lote=TAMANHO_LOTE, reiniciar=False, metrics=None,
+                        resolvedor=None, detector=None, pular_quase=False):
+    """Converte o CSV em SQL por lotes, retomando do último checkpoint.
+
+    Args:
+        csv_file: CSV de contas a pagar
+        sql_file: arquivo de saída (padrão: <csv>_import.sql)
+        checkpoint_file: checkpoint (padrão: <sql>.checkpoint.json)
+        tamanho_lote: registros por lote confirmado
+        reiniciar: ignora um checkpoint existente
+        metrics: JobMetrics opcional; recebe as contagens e a latência
+            de cada lote confirmado
+        resolvedor: ResolvedorDimensoes opcional; grava no lote os nomes
+            de fornecedor/categoria/centro de custo e os ids por subconsulta
+        detector: DetectorDuplicatas opcional; descarta as duplicatas exatas
+            e marca (ou, com pular_quase, descarta) as quase duplicatas
+
+    Returns:
+        Estado final (mesmos campos do checkpoint) com 'retomado_de',
+        a linha em que a execução recomeçou (0 se começou do início).
+    """
+    sql_file = sql_file or os.path.splitext(csv_file)[0] + '_import.sql'
+    checkpoint_file = checkpoint_file or sql_file + '.checkpoint.json'
+    chaves_file = sql_file + '.chaves.jsonl'
+
+    estado = None if reiniciar else carregar_checkpoint(checkpoint_file, csv_file)
+    if estado is None:
+        delimiter, offset, tem_cabecalho = _detectar_formato(csv_file)
+        estado = _novo_estado(csv_file, delimiter, offset)
+        with open(sql_file, 'w', encoding='utf-8') as saida:
+            saida.write(f"""-- =====================================================
+-- IMPORTAÇÃO AUTOMÁTICA: CONTAS A PAGAR (em lotes de {tamanho_lote})
+-- Arquivo origem: {csv_file}
+-- Gerado em: {datetime.now().strftime('%d/%m/%Y %H:%M:%S')}
+-- =====================================================
+
+""")
+        estado['saida_bytes'] = os.path.getsize(sql_file)
+        if tem_cabecalho:
+            with open(csv_file, 'rb') as f:
+                f.seek(offset)
+                for _, fim in iterar_registros(f, delimiter):
+                    estado['offset'] = fim
+                    break
+        _gravar_json(checkpoint_file, estado)
+    retomado_de = estado['linha']
+
+    with open(csv_file, 'rb') as origem, open(sql_file, 'r+b') as saida, open(chaves_file, 'a+b') as chaves:
+        # Descarta o que foi escrito depois do último lote confirmado
+        saida.truncate(estado['saida_bytes'])
+        saida.seek(estado['saida_bytes'])
+        origem.seek(estado['offset'])
+        chaves.truncate(estado['chaves_bytes'])
+        if detector is not None:
+            chaves.seek(0)
+            for registro in chaves:
+                *chave, origem_chave = json.loads(registro)
+                detector.registrar_chaves(tuple(chave), origem_chave)
+
+        confirmado = [estado['linha'], estado['importadas'], estado['total_erros'] + estado['total_duplicatas']]
+        inicio_lote = time.perf_counter()
+
+        def confirmar(lote):
+            nonlocal inicio_lote
+            dimensoes = resolvedor.resolver(lote) if resolvedor and lote else []
+            if validar_contas is not None and lote:
+                estado['total_documentos_invalidos'] += validar_contas(lote)
+            if detector is not None and lote:
+                chaves.write(''.join(json.dumps(list(detector.chaves(conta)) + [f"linha {conta['linha']}"],
+                                                ensure_ascii=False) + '\n' for conta in lote).encode('utf-8'))
+                chaves.flush()
+                os.fsync(chaves.fileno())
+                estado['chaves_bytes'] = chaves.tell()
+            _confirmar_lote(saida, dimensoes + [format_insert(conta) for conta in lote], estado, checkpoint_file)
+            if metrics:
+                if lote:
+                    metrics.observe_batch(time.perf_counter() - inicio_lote)
+                atual = [estado['linha'], estado['importadas'], estado['total_erros'] + estado['total_duplicatas']]
+                metrics.add(read=atual[0] - confirmado[0], written=atual[1] - confirmado[1],
+                            rejected=atual[2] - confirmado[2])
+                confirmado[:] = atual
+            inicio_lote = time.perf_counter()
+
+        lote = []
+        for row, fim in iterar_registros(origem, estado['delimitador']):
+            estado['linha'] += 1
+            if len(row) >= 3:  # Mínimo: fornecedor, descrição, valor
+                try:
+                    conta = parse_row(row, estado['linha'])
+                except ValueError as e:
+                    estado['total_erros'] += 1
+                    if len(estado['erros']) < MAX_ERROS:
+                        estado['erros'].append({'linha': estado['linha'], 'erro': str(e)})
+                else:
+                    conta['linha'] = estado['linha']
+                    duplicata = detector.filtrar(conta, pular_quase) if detector is not None else None
+                    if duplicata is not None:
+                        estado['total_duplicatas'] += 1
+                        if len(estado['duplicatas']) < MAX_ERROS:
+                            estado['duplicatas'].append({'linha': estado['linha'], 'tipo': duplicata[0],
+                                                         'de': duplicata[1]})
+                        estado['offset'] = fim
+                        continue
+                    lote.append(conta)
+                    estado['importadas'] += 1
+                    estado['valor_total'] = round(estado['valor_total'] + conta['valor'], 2)
+                    resumo = estado['por_status'].setdefault(conta['status'], [0, 0.0])
+                    resumo[0] += 1
+                    resumo[1] = round(resumo[1] + conta['valor'], 2)
+            estado['offset'] = fim
+            if len(lote) >= tamanho_lote:
+                confirmar(lote)
+                lote = []
+        confirmar(lote)
+
+        saida.write(_rodape(estado).encode('utf-8'))
+        saida.flush()
+        os.fsync(saida.fileno())
+
+    os.remove(checkpoint_file)
+    os.remove(chaves_file)
+    estado['retomado_de'] = retomado_de
+    estado['sql_file'] = sql_file
+    return estado
+
+
+def _confirmar_lote(saida, lote, estado, checkpoint_file):
+    """Grava o lote no .sql, sincroniza e só então avança o checkpoint."""
+    if lote:
+        estado['lotes'] += 1
+        saida.write(("BEGIN;\n\n" + "\n\n".join(lote) + "\n\nCOMMIT;\n\n").encode('utf-8'))
+        saida.flush()
+        os.fsync(saida.fileno())
+    estado['saida_bytes'] = saida.tell()
+    _gravar_json(checkpoint_file, estado)
+
+
+def _rodape(estado):
+    linhas = [
+        "-- =====================================================",
+        f"-- Registros processados: {estado['importadas']}",
+        f"-- Valor total: {estado['valor_total']:.2f}",
+        f"-- Erros encontrados: {estado['total_erros']}",
+        f"-- Duplicatas ignoradas: {estado['total_duplicatas']}",
+        f"-- CNPJ/CPF inválidos (gravados sem o documento): {estado['total_documentos_invalidos']}",
+    ]
+    for status, (quantidade, valor) in sorted(estado['por_status'].items()):
+        linhas.append(f"--   {status}: {quantidade} contas, {valor:.2f}")
+    if estado['erros']:
+        linhas.append(f"-- ERROS ENCONTRADOS (primeiros {len(estado['erros'])}):")
+        linhas.extend(f"-- Linha {e['linha']}: {e['erro']}" for e in estado['erros'])
+    if estado['duplicatas']:
+        linhas.append(f"-- DUPLICATAS IGNORADAS (primeiras {len(estado['duplicatas'])}):")
+        linhas.extend(f"-- Linha {d['linha']}: duplicata {d['tipo']} de {d['de']}" for d in estado['duplicatas'])
+    linhas.append("-- =====================================================")
+    linhas.append("")
+    linhas.append("SELECT status, COUNT(*) as quantidade, SUM(valor_original) as valor_total")
+    linhas.append("FROM contas_pagar")
+    linhas.append("GROUP BY status;")
+    return "\n".join(linhas) + "\n"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Importação CSV -> SQL de contas a pagar, retomável')
+    parser.add_argument('csv_file', nargs='?', default='contas_pagar.csv')
+    parser.add_argument('sql_file', nargs='?')
+    parser.add_argument('--lote', type=int, default=TAMANHO_LOTE, help='registros por lote')
+    parser.add_argument('--reiniciar', action='store_true', help='ignora o checkpoint e começa do início')
+    parser.add_argument('--db', metavar='BANCO.sqlite',
+                        help='grava fornecedor/categoria como ids (nomes novos contados neste banco) '
+                             'e procura duplicatas nas contas que já estão nele')
+    parser.add_argument('--pular-quase', action='store_true',
+                        help='não grava as quase duplicatas (por padrão saem marcadas com um comentário)')
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(args.csv_file):
+        print(f"❌ Arquivo não encontrado: {args.csv_file}")
+        return 1
+
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'scripts_auxiliares'))
+    from job_metrics import JobMetrics
+
+    print("🚀 ALUFORCE v2.0 - Importação CSV para SQL (retomável)")
+    print("=" * 50)
+    conn = sqlite3.connect(args.db) if args.db else None
+    try:
+        resolvedor = ResolvedorDimensoes(conn) if conn else None
+        detector = DetectorDuplicatas()
+        if conn:
+            detector.carregar_tabela(conn)
+        with JobMetrics('import_jobs') as metrics:
+            estado = executar_importacao(args.csv_file, args.sql_file, tamanho_lote=args.lote,
+                                         reiniciar=args.reiniciar, metrics=metrics, resolvedor=resolvedor,
+                                         detector=detector, pular_quase=args.pular_quase)
+    finally:
+        if conn:
+            conn.close()
+    if estado['retomado_de']:
+        print(f"♻️ Retomado após a linha {estado['retomado_de']}")
+    print(f"✅ Conversão concluída!")
+    print(f"📁 Arquivo SQL gerado: {estado['sql_file']}")
+    print(f"📊 Registros processados: {estado['importadas']} em {estado['lotes']} lotes")
+    print(f"💰 Valor total: R$ {estado['valor_total']:,.2f}")
+    print(f"❌ Erros encontrados: {estado['total_erros']}")
+    for erro in estado['erros'][:5]:
+        print(f"  • Linha {erro['linha']}: {erro['erro']}")
+    print(f"♊ Duplicatas ignoradas: {estado['total_duplicatas']}")
+    if estado['total_documentos_invalidos']:
+        print(f"🪪 CNPJ/CPF inválidos (gravados sem o documento): {estado['total_documentos_invalidos']}")
+    if resolvedor:
+        criados = ', '.join(f"{quantidade} {campo}" for campo, quantidade in resolvedor.criados.items())
+        print(f"🏷️ Dimensões novas no banco (criadas ao aplicar o .sql): {criados}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Índice de trigramas para busca de fornecedores e clientes por trecho do nome
+
+idx_contas_pagar_fornecedor só ajuda em busca exata ou por prefixo de
+fornecedor_nome; quem procura "ENERGISA" ou "MATERIAIS" no meio do nome
+cai numa varredura com LIKE '%...%'. Aqui os nomes (fornecedor_nome de
+contas_pagar e razão social / nome fantasia da planilha Omie
+Clientes_Fornecedores) são normalizados como em dimensoes.py e
+quebrados em trigramas por palavra (" EN", "ENE", ..., "SA "). Cada
+trigrama vira um inteiro (ALFABETO tem 38 símbolos: 38**3 códigos) e o
+índice invertido fica em dois arrays NumPy no formato CSR:
+
+    offsets[codigo] .. offsets[codigo + 1]   fatia de postings
+    postings                                 ids dos nomes, por trigrama
+
+Uma busca junta as fatias dos trigramas da consulta, conta por nome com
+bincount e ordena os que têm pelo menos `minimo` dos trigramas da
+consulta (empate: nome mais curto primeiro). Nomes adicionados depois da
+construção ficam num delta em dicionário, consultado junto, até o
+próximo compactar() (automático quando o delta passa de LIMITE_DELTA).
+
+Arquivo (salvar/carregar):
+
+    b'ZTRI1\\n' + tamanho do cabeçalho (4 bytes, big-endian) + cabeçalho JSON
+    + offsets (uint32) + postings (uint32) + tamanhos (uint16) + tipos (uint8)
+    + nomes (JSON com zlib)
+
+Uso:
+    python indice_nomes.py construir nomes.ztri [--banco banco.sqlite] [--omie Clientes_Fornecedores.xlsx]
+    python indice_nomes.py buscar nomes.ztri "energisa" [--limite 10]
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import struct
+import sys
+import time
+import zlib
+
+import numpy as np
+
+from dimensoes import normalizar_fornecedor
+
+MAGICO = b'ZTRI1\n'
+ALFABETO = ' 0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ&'
+CODIGO = {c: i for i, c in enumerate(ALFABETO)}
+TOTAL_CODIGOS = len(ALFABETO) ** 3
+LIMITE_DELTA = 5000
+MINIMO = 0.5
+
+# tipos (bits): um nome pode ser de fornecedor e de cliente
+FORNECEDOR = 1
+CLIENTE = 2
+
+# Omie_Clientes_Fornecedores: cabeçalho na linha 5, dados a partir da 6
+OMIE_LINHA_INICIAL = 6
+OMIE_COLUNAS = {'razao_social': 2, 'nome_fantasia': 4, 'cliente': 5, 'fornecedor': 6}  # índices a partir da coluna A
+
+
+def trigramas(chave):
+    """Códigos dos trigramas (sem repetição) das palavras de uma chave normalizada."""
+    codigos = set()
+    for palavra in chave.split():
+        texto = f' {palavra} '
+        for i in range(len(texto) - 2):
+            a, b, c = texto[i:i + 3]
+            codigos.add((CODIGO[a] * 38 + CODIGO[b]) * 38 + CODIGO[c])
+    return sorted(codigos)
+
+
+class IndiceNomes:
+    """Índice invertido de trigramas sobre nomes normalizados."""
+
+    def __init__(self):
+        self.nomes = []
+        self.ids = {}
+        self.tipos = np.zeros(1024, dtype=np.uint8)
+        self.tamanhos = np.zeros(1024, dtype=np.uint16)
+        self.offsets = np.zeros(TOTAL_CODIGOS + 1, dtype=np.uint32)
+        self.postings = np.empty(0, dtype=np.uint32)
+        self.delta = {}
+        self.total_delta = 0
+
+    def __len__(self):
+        return len(self.nomes)
+
+    @classmethod
+    def construir(cls, nomes):
+        """Monta o índice de uma vez a partir de (nome, tipo)."""
+        indice = cls()
+        for nome, tipo in nomes:
+            indice._registrar(nome, tipo)
+        indice.compactar()
+        return indice
+
+    def _registrar(self, nome, tipo):
+        chave = normalizar_fornecedor(nome)
+        if not chave:
+            return None, False
+        if self.ids is None:
+            # índice carregado de arquivo: o mapa de chaves só é montado na primeira inclusão
+            self.ids = {normalizar_fornecedor(n): i for i, n in enumerate(self.nomes)}
+        id_ = self.ids.get(chave)
+        if id_ is not None:
+            self.tipos[id_] |= tipo
+            return id_, False
+        id_ = len(self.nomes)
+        if id_ == len(self.tamanhos):
+            crescer = max(1024, id_)
+            self.tipos = np.concatenate([self.tipos, np.zeros(crescer, dtype=np.uint8)])
+            self.tamanhos = np.concatenate([self.tamanhos, np.zeros(crescer, dtype=np.uint16)])
+        self.ids[chave] = id_
+        self.nomes.append(str(nome).replace("''", "'").strip())
+        codigos = trigramas(chave)
+        self.tipos[id_] = tipo
+        self.tamanhos[id_] = len(codigos)
+        for codigo in codigos:
+            self.delta.setdefault(codigo, []).append(id_)
+        self.total_delta += len(codigos)
+        return id_, True
+
+    def adicionar(self, nome, tipo=FORNECEDOR):
+        """Inclui um nome (ex.: logo após o INSERT da conta); retorna o id ou None."""
+        id_, _ = self._registrar(nome, tipo)
+        if self.total_delta > LIMITE_DELTA:
+            self.compactar()
+        return id_
+
+    def compactar(self):
+        """Junta o delta aos arrays CSR.
+
+        Os ids do delta são maiores que todos os já compactados, então cada
+        um entra no fim da fatia do seu trigrama (np.insert, sem reordenar).
+        """
+        if not self.delta:
+            return
+        codigos = sorted(self.delta)
+        novos_codigos = np.repeat(np.asarray(codigos, dtype=np.int64), [len(self.delta[c]) for c in codigos])
+        novos_ids = np.fromiter((i for c in codigos for i in self.delta[c]), dtype=np.uint32,
+                                count=self.total_delta)
+        self.postings = np.insert(self.postings, self.offsets[novos_codigos + 1].astype(np.int64), novos_ids)
+        self.offsets = self.offsets + np.concatenate(
+            [[0], np.cumsum(np.bincount(novos_codigos, minlength=TOTAL_CODIGOS))]).astype(np.uint32)
+        self.delta = {}
+        self.total_delta = 0
+
+    def buscar(self, consulta, limite=10, tipo=None, minimo=MINIMO):
+        """Nomes mais parecidos com a consulta.
+
+        Args:
+            consulta: trecho do nome, em qualquer caixa/acentuação
+            tipo: FORNECEDOR ou CLIENTE para filtrar (None = todos)
+            minimo: fração mínima dos trigramas da consulta presentes no nome
+
+        Returns:
+            [(nome, pontuação 0..1)] do mais para o menos parecido
+        """
+        codigos = trigramas(normalizar_fornecedor(consulta))
+        if not codigos or not self.nomes:
+            return []
+        partes = [self.postings[self.offsets[c]:self.offsets[c + 1]] for c in codigos]
+        partes.extend(np.asarray(self.delta[c], dtype=np.uint32) for c in codigos if c in self.delta)
+        contagem = np.bincount(np.concatenate(partes), minlength=len(self.nomes))
+        candidatos = np.flatnonzero(contagem >= max(1, int(np.ceil(minimo * len(codigos)))))
+        if tipo is not None:
+            candidatos = candidatos[(self.tipos[candidatos] & tipo) != 0]
+        # mais trigramas em comum primeiro; no empate, o nome com menos trigramas
+        chave = contagem[candidatos].astype(np.int64) * 65536 - self.tamanhos[candidatos]
+        if len(candidatos) > limite:
+            melhores = np.argpartition(-chave, limite)[:limite]
+            candidatos, chave = candidatos[melhores], chave[melhores]
+        ordem = np.argsort(-chave, kind='stable')
+        return [(self.nomes[i], float(contagem[i]) / len(codigos)) for i in candidatos[ordem]]
+
+    def salvar(self, caminho):
+        """Grava o índice compactado (arquivo temporário + rename)."""
+        self.compactar()
+        nomes = zlib.compress(json.dumps(self.nomes, ensure_ascii=False).encode('utf-8'), 6)
+        cabecalho = json.dumps({'nomes': len(self.nomes), 'postings': len(self.postings),
+                                'bytes_nomes': len(nomes)}).encode('utf-8')
+        tmp = caminho + '.tmp'
+        with open(tmp, 'wb') as f:
+            f.write(MAGICO + struct.pack('>I', len(cabecalho)) + cabecalho)
+            f.write(self.offsets.astype('<u4').tobytes())
+            f.write(self.postings.astype('<u4').tobytes())
+            f.write(self.tamanhos[:len(self.nomes)].astype('<u2').tobytes())
+            f.write(self.tipos[:len(self.nomes)].astype('<u1').tobytes())
+            f.write(nomes)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, caminho)
+
+    @classmethod
+    def carregar(cls, caminho):
+        with open(caminho, 'rb') as f:
+            if f.read(len(MAGICO)) != MAGICO:
+                raise ValueError(f"Arquivo não é um índice de nomes: {caminho}")
+            (tamanho,) = struct.unpack('>I', f.read(4))
+            cabecalho = json.loads(f.read(tamanho))
+            dados = f.read()
+        n, p = cabecalho['nomes'], cabecalho['postings']
+        indice = cls()
+        inicio = 0
+        for atributo, dtype, quantidade in (('offsets', '<u4', TOTAL_CODIGOS + 1), ('postings', '<u4', p),
+                                            ('tamanhos', '<u2', n), ('tipos', '<u1', n)):
+            array = np.frombuffer(dados, dtype=dtype, count=quantidade, offset=inicio)
+            inicio += array.nbytes
+            setattr(indice, atributo, array.astype(dtype[1:]))
+        indice.nomes = json.loads(zlib.decompress(dados[inicio:inicio + cabecalho['bytes_nomes']]))
+        indice.ids = None
+        return indice
+
+
+def nomes_do_banco(conn):
+    """(nome, FORNECEDOR) de contas_pagar e, se existir, de fornecedores_financeiro."""
+    yield from ((nome, FORNECEDOR) for (nome,) in
+                conn.execute("SELECT DISTINCT fornecedor_nome FROM contas_pagar WHERE fornecedor_nome IS NOT NULL"))
+    if conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'fornecedores_financeiro'").fetchone():
+        yield from ((nome, FORNECEDOR) for (nome,) in conn.execute("SELECT nome FROM fornecedores_financeiro"))
+
+
+def nomes_da_planilha_omie(caminho):
+    """(nome, tipo) da planilha Omie/Zyntra Clientes_Fornecedores (requer openpyxl).
+
+    Razão social e nome fantasia entram os dois; o tipo vem das colunas
+    "É um Cliente?" / "É um Fornecedor?" (sem nenhuma marcada, vale como ambos).
+    """
+    import openpyxl
+
+    wb = openpyxl.load_workbook(caminho, read_only=True, data_only=True)
+    try:
+        ws = wb.worksheets[0]
+        for row in ws.iter_rows(min_row=OMIE_LINHA_INICIAL, values_only=True):
+            if len(row) <= OMIE_COLUNAS['fornecedor']:
+                continue
+            tipo = ((CLIENTE if str(row[OMIE_COLUNAS['cliente']] or '').strip().upper().startswith('S') else 0)
+                    | (FORNECEDOR if str(row[OMIE_COLUNAS['fornecedor']] or '').strip().upper().startswith('S') else 0))
+            for coluna in ('razao_social', 'nome_fantasia'):
+                if row[OMIE_COLUNAS[coluna]]:
+                    yield row[OMIE_COLUNAS[coluna]], tipo or (CLIENTE | FORNECEDOR)
+    finally:
+        wb.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Índice de trigramas de fornecedores e clientes')
+    sub = parser.add_subparsers(dest='comando', required=True)
+    construir = sub.add_parser('construir', help='monta o índice e grava no arquivo')
+    construir.add_argument('arquivo')
+    construir.add_argument('--banco', help='SQLite com contas_pagar')
+    construir.add_argument('--omie', action='append', default=[],
+                           help='planilha Clientes_Fornecedores (pode repetir)')
+    buscar = sub.add_parser('buscar', help='busca um trecho de nome no índice')
+    buscar.add_argument('arquivo')
+    buscar.add_argument('consulta')
+    buscar.add_argument('--limite', type=int, default=10)
+    buscar.add_argument('--tipo', choices=('fornecedor', 'cliente'))
+    args = parser.parse_args(argv)
+
+    if args.comando == 'buscar':
+        if not os.path.exists(args.arquivo):
+            print(f"❌ Índice não encontrado: {args.arquivo}")
+            return 1
+        indice = IndiceNomes.carregar(args.arquivo)
+        tipo = {'fornecedor': FORNECEDOR, 'cliente': CLIENTE}.get(args.tipo)
+        inicio = time.perf_counter()
+        resultados = indice.buscar(args.consulta, args.limite, tipo)
+        decorrido = (time.perf_counter() - inicio) * 1000
+        print(f"🔎 {len(resultados)} resultados em {decorrido:.2f} ms ({len(indice)} nomes)")
+        for nome, pontos in resultados:
+            print(f"  {pontos:4.0%}  {nome}")
+        return 0
+
+    fontes = []
+    if args.banco:
+        if not os.path.exists(args.banco):
+            print(f"❌ Banco não encontrado: {args.banco}")
+            return 1
+        conn = sqlite3.connect(args.banco)
+        fontes.append(list(nomes_do_banco(conn)))
+        conn.close()
+    for planilha in args.omie:
+        fontes.append(list(nomes_da_planilha_omie(planilha)))
+    indice = IndiceNomes.construir(nome for fonte in fontes for nome in fonte)
+    indice.salvar(args.arquivo)
+    print(f"✅ Índice com {len(indice)} nomes e {len(indice.postings)} trigramas gravado em {args.arquivo}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Resumo de contas a pagar numa única leitura da tabela
+
+As "CONSULTAS ÚTEIS" e "ESTATÍSTICAS FINAIS" de generate_contas_pagar_sql
+fazem nove agregações separadas sobre contas_pagar (vencidas hoje,
+vencendo em 7 dias, por categoria, maiores fornecedores, contagem por
+status, valor em aberto, fornecedores únicos), cada uma varrendo a tabela.
+ResumoContasPagar lê a tabela uma vez, em blocos, e mantém agregações em
+dicionários:
+
+    por_status              status -> [quantidade, centavos]
+    fornecedores            fornecedor -> quantidade (todas as contas)
+    abertas_por_categoria   categoria -> [quantidade, centavos]
+    abertas_por_fornecedor  fornecedor -> [quantidade, centavos]
+    abertas_por_data        vencimento -> [quantidade, centavos]
+
+("abertas" = PENDENTE ou VENCIDA). resultado() monta todos os relatórios a
+partir delas; os que dependem da data (vencidas hoje, próximos 7 dias)
+saem de abertas_por_data, então mudar o dia não exige nova leitura.
+
+Valores são somados em centavos inteiros para que somar e subtrair a
+mesma conta seja exato. Com a última versão de cada conta guardada, o
+resumo é atualizado só com as linhas que mudaram:
+
+    resumo = ResumoContasPagar.carregar(conn)
+    ...
+    resumo.atualizar(conn)            # inseridas/alteradas desde a última leitura
+    resumo.atualizar_ids(conn, ids)   # ids conhecidos (p.ex. apagados ou arquivados)
+
+Uso:
+    python resumo_financeiro.py banco.sqlite [--json] [--hoje YYYY-MM-DD]
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import sys
+from datetime import date, timedelta
+from heapq import nlargest
+
+CAMPOS = ('id', 'fornecedor_nome', 'categoria', 'status', 'data_vencimento', 'valor_total', 'data_atualizacao')
+STATUS_ABERTOS = ('PENDENTE', 'VENCIDA')
+TAMANHO_BLOCO = 5000
+MAIORES_FORNECEDORES = 10
+
+
+def _centavos(valor):
+    return int(round((valor or 0) * 100))
+
+
+def _somar(mapa, chave, quantidade, centavos):
+    total = mapa.setdefault(chave, [0, 0])
+    total[0] += quantidade
+    total[1] += centavos
+    if total[0] == 0:
+        del mapa[chave]
+
+
+def _item(quantidade, centavos):
+    return {'quantidade': quantidade, 'valor': centavos / 100}
+
+
+class ResumoContasPagar:
+    """Agregações de contas_pagar mantidas a partir de uma leitura e de deltas."""
+
+    def __init__(self):
+        self.contas = {}
+        self.por_status = {}
+        self.fornecedores = {}
+        self.abertas_por_categoria = {}
+        self.abertas_por_fornecedor = {}
+        self.abertas_por_data = {}
+        self.marca = None
+
+    @classmethod
+    def carregar(cls, conn, tamanho_bloco=TAMANHO_BLOCO):
+        """Lê contas_pagar uma vez e monta o resumo."""
+        resumo = cls()
+        resumo._ler(conn, f"SELECT {', '.join(CAMPOS)} FROM contas_pagar", (), tamanho_bloco)
+        return resumo
+
+    def _ler(self, conn, sql, parametros, tamanho_bloco=TAMANHO_BLOCO):
+        cursor = conn.execute(sql, parametros)
+        while True:
+            bloco = cursor.fetchmany(tamanho_bloco)
+            if not bloco:
+                break
+            for linha in bloco:
+                self.aplicar(linha[0], linha[1:6])
+                if linha[6] is not None and (self.marca is None or linha[6] > self.marca):
+                    self.marca = linha[6]
+
+    def _contribuir(self, conta, sinal):
+        fornecedor, categoria, status, vencimento, centavos = conta
+        centavos *= sinal
+        _somar(self.por_status, status, sinal, centavos)
+        self.fornecedores[fornecedor] = self.fornecedores.get(fornecedor, 0) + sinal
+        if not self.fornecedores[fornecedor]:
+            del self.fornecedores[fornecedor]
+        if status in STATUS_ABERTOS:
+            _somar(self.abertas_por_categoria, categoria, sinal, centavos)
+            _somar(self.abertas_por_fornecedor, fornecedor, sinal, centavos)
+            _somar(self.abertas_por_data, vencimento, sinal, centavos)
+
+    def aplicar(self, id_, linha):
+        """Troca a versão conhecida da conta `id_` por `linha` (None = apagada).
+
+        linha: (fornecedor_nome, categoria, status, data_vencimento, valor_total)
+        """
+        anterior = self.contas.pop(id_, None)
+        if anterior is not None:
+            self._contribuir(anterior, -1)
+        if linha is not None:
+            fornecedor, categoria, status, vencimento, valor = linha
+            conta = (fornecedor, categoria, status, vencimento, _centavos(valor))
+            self.contas[id_] = conta
+            self._contribuir(conta, 1)
+
+    def atualizar(self, conn):
+        """Aplica as contas inseridas ou alteradas desde a última leitura.
+
+        Usa data_atualizacao (mantida pelo trigger trg_contas_pagar_updated);
+        contas apagadas não aparecem aqui, use atualizar_ids para elas.
+        """
+        if self.marca is None:
+            self._ler(conn, f"SELECT {', '.join(CAMPOS)} FROM contas_pagar", ())
+        else:
+            self._ler(conn, f"SELECT {', '.join(CAMPOS)} FROM contas_pagar WHERE data_atualizacao >= ?",
+                      (self.marca,))
+
+    def atualizar_ids(self, conn, ids):
+        """Relê as contas indicadas; as que não existem mais saem do resumo."""
+        ids = list(ids)
+        for i in range(0, len(ids), 900):
+            parte = ids[i:i + 900]
+            encontrados = set()
+            for linha in conn.execute(
+                    f"SELECT {', '.join(CAMPOS)} FROM contas_pagar WHERE id IN ({', '.join('?' * len(parte))})",
+                    parte):
+                encontrados.add(linha[0])
+                self.aplicar(linha[0], linha[1:6])
+            for id_ in parte:
+                if id_ not in encontrados:
+                    self.aplicar(id_, None)
+
+    def resultado(self, hoje=None, maiores=MAIORES_FORNECEDORES):
+        """Todos os relatórios num só dicionário."""
+        hoje = hoje or date.today()
+        hoje = hoje if isinstance(hoje, date) else date.fromisoformat(str(hoje))
+        inicio, fim = hoje.isoformat(), (hoje + timedelta(days=7)).isoformat()
+
+        vencidas_hoje = self.abertas_por_data.get(inicio, [0, 0])
+        vencendo = [0, 0]
+        for vencimento, (quantidade, centavos) in self.abertas_por_data.items():
+            if vencimento is not None and inicio <= vencimento <= fim:
+                vencendo[0] += quantidade
+                vencendo[1] += centavos
+
+        abertas = [0, 0]
+        for status in STATUS_ABERTOS:
+            quantidade, centavos = self.por_status.get(status, [0, 0])
+            abertas[0] += quantidade
+            abertas[1] += centavos
+
+        return {
+            'data_referencia': inicio,
+            'total_contas': len(self.contas),
+            'contas_pendentes': self.por_status.get('PENDENTE', [0, 0])[0],
+            'contas_vencidas': self.por_status.get('VENCIDA', [0, 0])[0],
+            'valor_aberto': abertas[1] / 100,
+            'fornecedores_unicos': len(self.fornecedores),
+            'por_status': {status: _item(*total) for status, total in sorted(self.por_status.items())},
+            'vencidas_hoje': _item(*vencidas_hoje),
+            'vencendo_7_dias': _item(*vencendo),
+            'abertas_por_categoria': [
+                dict(categoria=categoria, **_item(*total))
+                for categoria, total in sorted(self.abertas_por_categoria.items(), key=lambda i: -i[1][1])
+            ],
+            'maiores_fornecedores': [
+                dict(fornecedor=fornecedor, **_item(*total))
+                for fornecedor, total in nlargest(maiores, self.abertas_por_fornecedor.items(),
+                                                  key=lambda i: i[1][1])
+            ],
+        }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Resumo de contas a pagar numa única leitura')
+    parser.add_argument('banco', help='arquivo SQLite com a tabela contas_pagar')
+    parser.add_argument('--hoje', help='data de referência YYYY-MM-DD (padrão: hoje)')
+    parser.add_argument('--json', action='store_true', help='imprime o resultado em JSON')
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(args.banco):
+        print(f"❌ Banco não encontrado: {args.banco}")
+        return 1
+
+    conn = sqlite3.connect(args.banco)
+    try:
+        resultado = ResumoContasPagar.carregar(conn).resultado(args.hoje)
+    finally:
+        conn.close()
+
+    if args.json:
+        print(json.dumps(resultado, ensure_ascii=False, indent=2))
+        return 0
+
+    print("=== ESTATÍSTICAS DO SISTEMA ===")
+    print(f"📊 Total de contas: {resultado['total_contas']}")
+    print(f"⏳ Pendentes: {resultado['contas_pendentes']} | 🔴 Vencidas: {resultado['contas_vencidas']}")
+    print(f"💰 Valor total em aberto: R$ {resultado['valor_aberto']:,.2f}")
+    print(f"🏢 Fornecedores únicos: {resultado['fornecedores_unicos']}")
+    print(f"📅 Vencendo hoje: {resultado['vencidas_hoje']['quantidade']} "
+          f"(R$ {resultado['vencidas_hoje']['valor']:,.2f})")
+    print(f"📅 Próximos 7 dias: {resultado['vencendo_7_dias']['quantidade']} "
+          f"(R$ {resultado['vencendo_7_dias']['valor']:,.2f})")
+    print("\n📂 Em aberto por categoria:")
+    for item in resultado['abertas_por_categoria']:
+        print(f"  {str(item['categoria'])[:30]:30s} {item['quantidade']:6d}  R$ {item['valor']:,.2f}")
+    print("\n🔝 Maiores fornecedores em débito:")
+    for item in resultado['maiores_fornecedores']:
+        print(f"  {str(item['fornecedor'])[:40]:40s} {item['quantidade']:6d}  R$ {item['valor']:,.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
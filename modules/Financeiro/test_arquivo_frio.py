@@ -0,0 +1,69 @@
+import sqlite3
+from datetime import date
+
+from arquivo_frio import ArquivoFrio, arquivar, data_corte
+from generate_contas_pagar_sql import generate_contas_pagar_sql
+
+
+def banco():
+    conn = sqlite3.connect(':memory:')
+    conn.executescript(generate_contas_pagar_sql())
+    conn.execute("DELETE FROM contas_pagar")
+    contas = []
+    for i in range(300):
+        mes = i % 12 + 1
+        contas.append((f'Fornecedor {i % 5}', f'2023-{mes:02d}-10', f'2023-{mes:02d}-12' if i % 3 else None,
+                       100 + i, ['PAGA', 'PAGA', 'CANCELADA', 'PENDENTE'][i // 12 % 4]))
+    conn.executemany("""INSERT INTO contas_pagar (fornecedor_nome, descricao, data_vencimento, data_pagamento,
+                        valor_original, status) VALUES (?, 'D', ?, ?, ?, ?)""", contas)
+    conn.commit()
+    return conn
+
+
+def totais_sql(conn, ano):
+    return {(f, ano): [n, round(v, 2)] for f, n, v in conn.execute("""
+        SELECT fornecedor_nome, COUNT(*), SUM(valor_total) FROM contas_pagar
+        WHERE status = 'PAGA' AND substr(COALESCE(data_pagamento, data_vencimento), 1, 4) = ?
+        GROUP BY fornecedor_nome""", (ano,))}
+
+
+class TestArquivoFrio:
+    """Testes para o arquivamento de contas liquidadas"""
+
+    def test_data_corte(self):
+        """Testa o primeiro dia do mês N meses atrás"""
+        assert data_corte(12, date(2025, 3, 15)) == '2024-03-01'
+        assert data_corte(2, date(2025, 1, 31)) == '2024-11-01'
+
+    def test_arquiva_remove_e_responde_pelo_arquivo(self, tmp_path):
+        """Testa que os totais do arquivo batem com os da tabela original"""
+        conn = banco()
+        esperado = totais_sql(conn, '2023')
+        diretorio = str(tmp_path / 'frio')
+
+        resultado = arquivar(conn, diretorio, meses=6, tamanho_lote=7, hoje=date(2024, 3, 1))
+        assert sorted(resultado['meses']) == [f'2023-{m:02d}' for m in range(1, 9)]
+        assert resultado['removidas'] == sum(resultado['meses'].values())
+        assert conn.execute("""SELECT COUNT(*) FROM contas_pagar WHERE status IN ('PAGA', 'CANCELADA')
+                               AND COALESCE(data_pagamento, data_vencimento) < '2023-09-01'""").fetchone() == (0,)
+
+        resto = arquivar(conn, diretorio, meses=0, hoje=date(2024, 3, 1))
+        assert sorted(resto['meses']) == ['2023-09', '2023-10', '2023-11', '2023-12']
+        assert conn.execute("SELECT DISTINCT status FROM contas_pagar").fetchall() == [('PENDENTE',)]
+
+        arquivo = ArquivoFrio(diretorio)
+        assert arquivo.totais_por_fornecedor_ano('2023', '2023') == esperado
+        assert arquivo.particoes('2023-11') == ['2023-11', '2023-12']
+        assert sum(p['linhas'] for p in arquivo.indice['particoes'].values()) == 228
+
+    def test_rearquivar_nao_duplica(self, tmp_path):
+        """Testa que arquivar de novo as mesmas linhas (queda antes do DELETE) não duplica"""
+        conn = banco()
+        diretorio = str(tmp_path / 'frio')
+        linhas = conn.execute("SELECT * FROM contas_pagar WHERE status = 'PAGA'")
+        colunas = [d[0] for d in linhas.description]
+        linhas = linhas.fetchall()
+        ArquivoFrio(diretorio).adicionar('2023-01', colunas, list(linhas))
+        ArquivoFrio(diretorio).adicionar('2023-01', colunas, list(linhas[:10]))
+        ids = [c['id'] for c in ArquivoFrio(diretorio).ler(['id'])]
+        assert sorted(ids) == sorted(l[0] for l in linhas)
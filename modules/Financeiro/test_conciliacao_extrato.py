@@ -0,0 +1,123 @@
+import sqlite3
+
+from conciliacao_extrato import IndiceContas, conciliar, ler_extrato
+
+
+def banco(contas):
+    from generate_contas_pagar_sql import generate_contas_pagar_sql
+    conn = sqlite3.connect(':memory:')
+    conn.executescript(generate_contas_pagar_sql())
+    conn.execute("DELETE FROM contas_pagar")
+    conn.executemany("""INSERT INTO contas_pagar (id, fornecedor_nome, descricao, numero_documento,
+        data_vencimento, valor_original, status) VALUES (?, ?, 'Conta', ?, ?, ?, ?)""", contas)
+    return conn
+
+
+def resultados(relatorio):
+    return {r['linha']: (resultado, r['conta_id'], r['candidatos'])
+            for resultado, registros in relatorio.items() for r in registros}
+
+
+class TestConciliacaoExtrato:
+    """Testes para a conciliação em lote de extrato com contas a pagar"""
+
+    def test_csv_valor_janela_e_desempate(self, tmp_path):
+        """Testa valor exato, janela de dias, documento, fornecedor e empate"""
+        conn = banco([
+            (1, 'Energisa Minas Gerais S.A.', 'NF-001234', '2025-03-10', 1850.75, 'PENDENTE'),
+            (2, 'Cobre Sul Ltda', '1234', '2025-03-11', 1850.75, 'PENDENTE'),
+            (3, 'Cobre Sul Ltda', '555', '2025-03-12', 300.00, 'PENDENTE'),
+            (4, 'Transportes Avila', '556', '2025-03-12', 300.00, 'PENDENTE'),
+            (5, 'Acme', '10', '2025-03-01', 99.90, 'PENDENTE'),
+            (6, 'Acme', '11', '2025-03-01', 99.90, 'PENDENTE'),
+            (7, 'Paga Ltda', '12', '2025-03-05', 42.00, 'PAGA'),
+            (8, 'Longe', '13', '2025-03-20', 77.00, 'PENDENTE'),
+        ])
+        extrato = tmp_path / 'extrato.csv'
+        extrato.write_text(
+            "Data;Histórico;Valor (R$);Documento\n"
+            "10/03/2025;PAGTO BOLETO ENERGISA MG;-1.850,75;\n"       # 2: documento empata, fornecedor decide
+            "11/03/2025;PAGTO TED NF 1234;-1.850,75;1234\n"           # 3: sobra a conta 2
+            "13/03/2025;PIX TRANSPORTES AVILA;-300,00;\n"              # 4: fornecedor
+            "02/03/2025;DEBITO AUTOMATICO;-99,90;\n"                   # 5: empate
+            "05/03/2025;PAGAMENTO;-42,00;\n"                          # 6: conta já paga
+            "14/03/2025;PAGAMENTO;-77,00;\n"                          # 7: fora da janela
+            "15/03/2025;DEPOSITO;1.000,00;\n",                        # 8: crédito
+            encoding='utf-8')
+
+        relatorio = conciliar(ler_extrato(str(extrato)), IndiceContas.carregar(conn), janela=3)
+        assert resultados(relatorio) == {
+            2: ('conciliada', 1, []),
+            3: ('conciliada', 2, []),
+            4: ('conciliada', 4, []),
+            5: ('ambigua', None, [5, 6]),
+            6: ('sem_correspondencia', None, []),
+            7: ('sem_correspondencia', None, []),
+            8: ('ignorada', None, []),
+        }
+
+        # cabeçalho com "Lançamento" na coluna da data: a descrição continua no histórico
+        outro = tmp_path / 'extrato2.csv'
+        outro.write_text("Data Lançamento;Histórico;Valor;Nº Documento\n05/03/2025;PAGTO ACME;-10,00;77\n",
+                         encoding='utf-8')
+        assert [(l['data'], l['descricao'], l['documento']) for l in ler_extrato(str(outro))] == [
+            ('2025-03-05', 'PAGTO ACME', '77')]
+
+    def test_ofx_e_reavaliacao_das_ambiguas(self, tmp_path):
+        """Testa a leitura do OFX e que uma ambígua se resolve quando a outra conta é consumida"""
+        conn = banco([
+            (1, 'Acme', '100', '2025-03-01', 250.00, 'PENDENTE'),
+            (2, 'Acme', '200', '2025-03-02', 250.00, 'VENCIDA'),
+        ])
+        extrato = tmp_path / 'extrato.ofx'
+        extrato.write_text("""OFXHEADER:100
+DATA:OFXSGML
+<OFX><BANKMSGSRSV1><STMTTRNRS><STMTRS><BANKTRANLIST>
+<STMTTRN>
+<TRNTYPE>DEBIT
+<DTPOSTED>20250301120000[-3:BRT]
+<TRNAMT>-250.00
+<FITID>A1
+<MEMO>PAGTO ACME
+</STMTTRN>
+<STMTTRN>
+<TRNTYPE>DEBIT
+<DTPOSTED>20250302
+<TRNAMT>-250,00
+<FITID>A2
+<CHECKNUM>000200
+<MEMO>PAGTO ACME
+</STMTTRN>
+</BANKTRANLIST></STMTRS></STMTTRNRS></BANKMSGSRSV1></OFX>
+""", encoding='cp1252')
+
+        linhas = ler_extrato(str(extrato))
+        assert [(l['id'], l['data'], l['centavos'], l['documento']) for l in linhas] == [
+            ('A1', '2025-03-01', -25000, ''), ('A2', '2025-03-02', -25000, '000200')]
+
+        relatorio = conciliar(linhas, IndiceContas.carregar(conn))
+        assert resultados(relatorio) == {1: ('conciliada', 1, []), 2: ('conciliada', 2, [])}
+
+    def test_csv_com_ponto_decimal(self, tmp_path):
+        """Testa CSV separado por vírgula com ponto decimal (e milhar com vírgula)"""
+        conn = banco([
+            (1, 'Acme', '10', '2025-01-05', 1500.00, 'PENDENTE'),
+            (2, 'Cobre Sul', '11', '2025-01-06', 1234.56, 'PENDENTE'),
+        ])
+        extrato = tmp_path / 'extrato.csv'
+        extrato.write_text('2025-01-05,PAG BOLETO ACME,-1500.00\n'
+                           '2025-01-06,TED COBRE SUL,"-1,234.56"\n', encoding='utf-8')
+
+        linhas = ler_extrato(str(extrato))
+        assert [l['centavos'] for l in linhas] == [-150000, -123456]
+        assert resultados(conciliar(linhas, IndiceContas.carregar(conn))) == {
+            1: ('conciliada', 1, []), 2: ('conciliada', 2, [])}
+
+    def test_volume(self):
+        """Testa 100 mil lançamentos contra 100 mil contas em lote"""
+        contas = [{'id': i, 'fornecedor': 'F', 'ordinal': 738000 + i % 365, 'centavos': 1000 + i,
+                   'documento': str(i), 'palavras': frozenset()} for i in range(100_000)]
+        extrato = [{'linha': i, 'id': str(i), 'data': '2021-08-%02d' % (1 + i % 28), 'centavos': -(1000 + i),
+                    'descricao': '', 'documento': ''} for i in range(100_000)]
+        relatorio = conciliar(extrato, IndiceContas(contas), janela=400)
+        assert len(relatorio['conciliada']) == 100_000
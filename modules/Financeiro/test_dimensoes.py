@@ -0,0 +1,69 @@
+import sqlite3
+
+import import_jobs
+from dimensoes import ResolvedorDimensoes, normalizar_fornecedor, normalizar_texto
+from generate_contas_pagar_sql import generate_contas_pagar_sql
+
+
+class TestDimensoes:
+    """Testes para a resolução de fornecedor/categoria em ids"""
+
+    def test_normalizacao(self):
+        """Testa caixa, acentos, pontuação e sufixos societários"""
+        assert normalizar_fornecedor('Materiais Industriais Ltda.') == 'MATERIAIS INDUSTRIAIS'
+        assert normalizar_fornecedor('MANUTENÇÃO E SERVIÇOS S/A') == 'MANUTENCAO E SERVICOS'
+        assert normalizar_fornecedor('Padaria Pão Quente ME - EPP') == 'PADARIA PAO QUENTE'
+        assert normalizar_fornecedor('Ltda') == 'LTDA'
+        assert normalizar_texto("D''Avila  Serviços") == 'D AVILA SERVICOS'
+
+    def test_resolve_reaproveita_e_cria_em_lote(self):
+        """Testa que nomes equivalentes viram a mesma dimensão e o banco não é tocado"""
+        conn = sqlite3.connect(':memory:')
+        conn.executescript(generate_contas_pagar_sql())
+        conn.execute("INSERT INTO fornecedores_financeiro (nome, nome_normalizado) VALUES ('Energisa', 'ENERGISA MINAS GERAIS')")
+        resolvedor = ResolvedorDimensoes(conn)
+
+        contas = [
+            {'fornecedor': 'Energisa Minas Gerais S.A.', 'categoria': 'Utilidades'},
+            {'fornecedor': "D''Avila Ltda", 'categoria': 'utilidades', 'centro_custo': 'Produção'},
+            {'fornecedor': "D''AVILA LTDA.", 'categoria': 'Geral', 'centro_custo': ''},
+        ]
+        inserts = resolvedor.resolver(contas)
+        assert len(inserts) == 3  # um INSERT em lote por dimensão
+        assert contas[1]['fornecedor_id'] == contas[2]['fornecedor_id'] == ('fornecedores_financeiro', 'D AVILA')
+        assert contas[0]['categoria_id'] == contas[1]['categoria_id']
+        assert contas[2]['centro_custo_id'] is None
+        assert resolvedor.criados == {'fornecedor': 1, 'categoria': 2, 'centro_custo': 1}
+        assert conn.execute("SELECT COUNT(*) FROM fornecedores_financeiro").fetchone() == (1,)  # só a Energisa
+        # nomes já emitidos não se repetem nos lotes seguintes
+        assert resolvedor.resolver([{'fornecedor': 'Energisa Minas Gerais', 'categoria': 'Geral'}]) == []
+
+        conn.executescript(';\n'.join(inserts) + ';')
+        assert conn.execute("SELECT nome FROM fornecedores_financeiro WHERE nome_normalizado = 'D AVILA'"
+                            ).fetchone() == ("D'Avila Ltda",)
+        assert conn.execute("SELECT nome FROM fornecedores_financeiro WHERE nome_normalizado = 'ENERGISA MINAS GERAIS'"
+                            ).fetchone() == ('Energisa',)
+
+    def test_importacao_grava_ids(self, tmp_path):
+        """Testa que o .sql com ids vale num banco diferente do --db"""
+        csv_file = str(tmp_path / 'contas.csv')
+        with open(csv_file, 'w', encoding='utf-8') as f:
+            f.write('Fornecedor;Descricao;Valor;Vencimento;Documento;Categoria;Status\n')
+            f.write("Acme Ltda;Cabos;10,00;10/01/2025;NF1;Materiais;PENDENTE\n")
+            f.write("ACME S/A;Cabos;20,00;10/02/2025;NF2;materiais;PENDENTE\n")
+        conn = sqlite3.connect(':memory:')
+        conn.executescript(generate_contas_pagar_sql())
+        estado = import_jobs.executar_importacao(csv_file, tamanho_lote=1, resolvedor=ResolvedorDimensoes(conn))
+        sql = open(estado['sql_file'], encoding='utf-8').read()
+        assert conn.execute("SELECT COUNT(*) FROM fornecedores_financeiro").fetchone() == (0,)
+
+        outro = sqlite3.connect(':memory:')
+        outro.executescript(generate_contas_pagar_sql())
+        outro.execute("INSERT INTO fornecedores_financeiro (nome, nome_normalizado) VALUES ('Beta', 'BETA')")
+        outro.execute("INSERT INTO categorias_financeiro (nome, nome_normalizado) VALUES ('Frete', 'FRETE')")
+        outro.executescript(sql)
+        assert outro.execute("""SELECT f.nome, c.nome, COUNT(*) FROM contas_pagar p
+                                JOIN fornecedores_financeiro f ON f.id = p.fornecedor_id
+                                JOIN categorias_financeiro c ON c.id = p.categoria_id
+                                WHERE numero_documento IN ('NF1', 'NF2') GROUP BY 1, 2""").fetchall() == [
+            ('Acme Ltda', 'Materiais', 2)]
@@ -0,0 +1,96 @@
+import pytest
+
+np = pytest.importorskip('numpy')
+
+import import_jobs
+from convert_csv_to_sql import convert_csv_to_sql
+from documentos_fiscais import validar_contas, validar_documentos
+
+
+class TestDocumentosFiscais:
+    """Testes para a validação vetorizada de CNPJ/CPF"""
+
+    def test_verificadores_e_mascara(self):
+        """Testa CPF, CNPJ (numérico e alfanumérico), números do Excel e recusados"""
+        resultado = validar_documentos([
+            '36408556000169', '529.982.247-25', '12.abc.345/01de-35', 36408556000169.0, 191,
+            '17.853.788/0001-95', '111.111.111-11', '12.ABC.345/01DE-3A', '123', None, float('nan'), '  ',
+        ])
+        assert resultado.formatado.tolist() == [
+            '36.408.556/0001-69', '529.982.247-25', '12.ABC.345/01DE-35', '36.408.556/0001-69',
+            '000.000.001-91', '', '', '', '', '', '', '']
+        assert resultado.normalizado.tolist()[:5] == [
+            '36408556000169', '52998224725', '12ABC34501DE35', '36408556000169', '00000000191']
+        assert resultado.tipo.tolist() == ['CNPJ', 'CPF', 'CNPJ', 'CNPJ', 'CPF', 'CNPJ', 'CPF', '', '', '', '', '']
+        assert resultado.valido.tolist() == [True] * 5 + [False] * 7
+        assert resultado.invalido.tolist() == [False] * 5 + [True] * 4 + [False] * 3
+        assert len(validar_documentos([])) == 0
+        # uma observação longa colada na coluna não derruba o lote inteiro
+        longo = validar_documentos(['1' * 267, '529.982.247-25', '1' * 256 + '52998224725'])
+        assert longo.valido.tolist() == [False, True, False]
+        assert longo.invalido.tolist() == [True, False, True]
+
+    def test_numero_e_texto_que_nao_sao_cnpj_alfanumerico(self):
+        """Testa CNPJ numérico com zeros à esquerda e letras fora do CNPJ alfanumérico"""
+        # 00.012.345/0001-65 vira 12345000165 no Excel: não confere como CPF
+        resultado = validar_documentos([12345000165, 12345000165.0, 52998224725, 'CPF 529.982.247-25',
+                                        'CNPJ 36.408.556/0001-69', 'ISENTO', 'CPF 529.982.247-26'])
+        assert resultado.formatado.tolist() == [
+            '00.012.345/0001-65', '00.012.345/0001-65', '529.982.247-25', '529.982.247-25',
+            '36.408.556/0001-69', '', '']
+        assert resultado.tipo.tolist()[:5] == ['CNPJ', 'CNPJ', 'CPF', 'CPF', 'CNPJ']
+        assert resultado.invalido.tolist() == [False] * 5 + [True, True]
+
+    def test_volume_igual_ao_calculo_por_linha(self):
+        """Testa 200 mil documentos aleatórios contra o cálculo escalar"""
+        def dv(digitos, pesos):
+            resto = sum(d * p for d, p in zip(digitos, pesos)) % 11
+            return 0 if resto < 2 else 11 - resto
+
+        def cnpj(raiz):
+            digitos = [int(c) for c in raiz]
+            digitos.append(dv(digitos, [5, 4, 3, 2, 9, 8, 7, 6, 5, 4, 3, 2]))
+            digitos.append(dv(digitos, [6, 5, 4, 3, 2, 9, 8, 7, 6, 5, 4, 3, 2]))
+            return ''.join(map(str, digitos))
+
+        rng = np.random.default_rng(7)
+        raizes = ['%012d' % r for r in rng.integers(1, 10 ** 12, 1000)]
+        validos = [cnpj(raiz) for raiz in raizes]
+        valores, esperado = [], []
+        for i in rng.integers(0, 1000, 200_000):
+            documento = validos[i]
+            if i % 2:  # troca o último dígito
+                documento = documento[:-1] + str((int(documento[-1]) + 1) % 10)
+            valores.append(f'{documento[:2]}.{documento[2:5]}.{documento[5:8]}/{documento[8:12]}-{documento[12:]}')
+            esperado.append(not i % 2)
+
+        resultado = validar_documentos(valores)
+        assert resultado.valido.tolist() == esperado
+        assert (resultado.formatado[resultado.valido] == np.array(valores)[resultado.valido]).all()
+
+    def test_importacoes(self, tmp_path):
+        """Testa o CNPJ/CPF nos INSERTs do convert_csv_to_sql e do import_jobs"""
+        contas = [{'fornecedor_cnpj': '36408556000169'}, {'fornecedor_cnpj': '17853788000195'}, {}]
+        assert validar_contas(contas) == 1
+        assert contas == [{'fornecedor_cnpj': '36.408.556/0001-69'},
+                          {'fornecedor_cnpj': '', 'documento_invalido': '17853788000195'},
+                          {}]
+
+        csv_file = tmp_path / 'contas.csv'
+        csv_file.write_text(
+            "Acme;Serviço;100,00;10/03/2025;1;Geral;PENDENTE;36408556000169\n"
+            "Cobre Sul;Material;200,00;11/03/2025;2;Geral;PENDENTE;17.853.788/0001-95\n"
+            "Sem CNPJ;Frete;300,00;12/03/2025;3;Geral;PENDENTE\n",
+            encoding='utf-8')
+        assert convert_csv_to_sql(str(csv_file))
+        sql = (tmp_path / 'contas_import.sql').read_text(encoding='utf-8')
+        assert sql.count('INSERT INTO contas_pagar') == 3
+        assert sql.count(', fornecedor_cnpj') == 1
+        assert "'PENDENTE',\n    '36.408.556/0001-69'\n);" in sql
+        assert '-- CNPJ/CPF INVÁLIDO (não gravado): 17.853.788/0001-95\nINSERT' in sql
+
+        estado = import_jobs.executar_importacao(str(csv_file), str(tmp_path / 'lotes.sql'), tamanho_lote=2)
+        assert estado['importadas'] == 3
+        assert estado['total_documentos_invalidos'] == 1
+        lotes = (tmp_path / 'lotes.sql').read_text(encoding='utf-8')
+        assert "'36.408.556/0001-69'" in lotes and '-- CNPJ/CPF INVÁLIDO' in lotes
@@ -0,0 +1,90 @@
+import sqlite3
+
+import pytest
+
+import import_jobs
+from convert_csv_to_sql import convert_csv_to_sql
+from duplicatas import DetectorDuplicatas
+from generate_contas_pagar_sql import generate_contas_pagar_sql
+
+
+def conta(fornecedor, documento, valor, vencimento, linha=1):
+    return {'fornecedor': fornecedor, 'documento': documento, 'valor': valor,
+            'data_vencimento': vencimento, 'linha': linha}
+
+
+class TestDuplicatas:
+    """Testes para a detecção de duplicatas por chaves de bloqueio"""
+
+    def test_chaves_exatas_e_quase(self):
+        """Testa exata, quase por documento/data e o que não é duplicata"""
+        detector = DetectorDuplicatas()
+        assert detector.filtrar(conta('Cobre Sul Ltda.', 'NF-0012', 1500.0, '2025-03-10', 1)) is None
+        assert detector.filtrar(conta('Acme', '', 80.0, '2025-03-10', 2)) is None
+
+        assert detector.verificar(conta('COBRE SUL LTDA', '12', 1500.0, '2025-03-10')) == ('exata', 'linha 1')
+        assert detector.verificar(conta('Cobre Sul', 'NF 12', 1500.0, '2025-03-12')) == ('quase', 'linha 1')
+        assert detector.verificar(conta('Cobre Sul', '', 1500.0, '2025-03-10')) == ('quase', 'linha 1')
+        assert detector.verificar(conta('Acme', 'NF 9', 80.0, '2025-03-10')) == ('quase', 'linha 2')
+        # parcela do mês seguinte, outra nota no mesmo dia, outro valor
+        assert detector.verificar(conta('Cobre Sul', '12', 1500.0, '2025-04-10')) is None
+        assert detector.verificar(conta('Cobre Sul', '13', 1500.0, '2025-03-10')) is None
+        assert detector.verificar(conta('Cobre Sul', '12', 1500.01, '2025-03-10')) is None
+
+        marcada = conta('Cobre Sul', '', 1500.0, '2025-03-10', 3)
+        assert detector.filtrar(marcada) is None
+        assert marcada['duplicata'] == 'linha 1'
+        assert detector.filtrar(conta('Cobre Sul', 'NF 12', 1500.0, '2025-03-11', 4), pular_quase=True) == \
+            ('quase', 'linha 1')
+
+    def test_convert_csv_contra_o_banco(self, tmp_path):
+        """Testa que o conversor pula as já existentes e as repetidas no arquivo"""
+        conn = sqlite3.connect(':memory:')
+        conn.executescript(generate_contas_pagar_sql())
+        fornecedor, documento, vencimento, valor = conn.execute(
+            "SELECT fornecedor_nome, numero_documento, data_vencimento, valor_original FROM contas_pagar "
+            "ORDER BY id LIMIT 1").fetchone()
+        detector = DetectorDuplicatas()
+        assert detector.carregar_tabela(conn) == 5
+
+        dia, mes, ano = vencimento[8:10], vencimento[5:7], vencimento[:4]
+        csv_file = tmp_path / 'contas.csv'
+        csv_file.write_text(
+            f"{fornecedor.upper()};Reimportada;{valor:.2f}".replace('.', ',') + f";{dia}/{mes}/{ano};{documento};Geral\n"
+            "Acme Ltda;Nova;100,00;10/03/2025;77;Geral\n"
+            "ACME;Repetida;100,00;10/03/2025;0077;Geral\n"
+            "Acme;Sem documento;100,00;10/03/2025;;Geral\n",
+            encoding='utf-8')
+        assert convert_csv_to_sql(str(csv_file), detector=detector)
+
+        sql = (tmp_path / 'contas_import.sql').read_text(encoding='utf-8')
+        assert sql.count('INSERT INTO contas_pagar') == 2
+        assert '-- POSSÍVEL DUPLICATA de linha 2\nINSERT' in sql
+        assert '-- Linha 1: duplicata exata de id 1' in sql
+        assert '-- Linha 3: duplicata exata de linha 2' in sql
+
+    def test_retomada_mantem_as_chaves_do_checkpoint(self, tmp_path, monkeypatch):
+        """Testa que duplicatas de linhas anteriores ao checkpoint continuam detectadas"""
+        csv_file = str(tmp_path / 'contas.csv')
+        with open(csv_file, 'w', encoding='utf-8') as f:
+            for i in range(30):
+                n = i % 20  # as linhas 21-30 repetem as 1-10
+                f.write(f'Acme {n};Parcela;{n + 1},00;10/01/2025;NF{n};Geral;PENDENTE\n')
+
+        original = import_jobs.parse_row
+
+        def falha_na_linha_25(row, linha):
+            if linha == 25:
+                raise KeyboardInterrupt
+            return original(row, linha)
+
+        monkeypatch.setattr(import_jobs, 'parse_row', falha_na_linha_25)
+        with pytest.raises(KeyboardInterrupt):
+            import_jobs.executar_importacao(csv_file, tamanho_lote=4, detector=DetectorDuplicatas())
+
+        monkeypatch.setattr(import_jobs, 'parse_row', original)
+        estado = import_jobs.executar_importacao(csv_file, tamanho_lote=4, detector=DetectorDuplicatas())
+        assert estado['retomado_de'] == 20
+        assert estado['importadas'] == 20
+        assert estado['total_duplicatas'] == 10
+        assert estado['duplicatas'][0] == {'linha': 21, 'tipo': 'exata', 'de': 'linha 1'}
@@ -0,0 +1,104 @@
+import os
+
+import pytest
+
+import import_jobs
+
+
+def escrever_csv(caminho, linhas):
+    with open(caminho, 'w', encoding='utf-8', newline='') as f:
+        f.write('Fornecedor;Descricao;Valor;Vencimento;Documento;Categoria;Status\n')
+        for i in range(linhas):
+            valor = '0' if i % 7 == 0 else f'{i},50'
+            f.write(f'Fornecedor {i};"Parcela\n{i}";{valor};10/01/2025;NF{i};Geral;PAGA\n')
+
+
+def sem_data(caminho):
+    with open(caminho, encoding='utf-8') as f:
+        return [l for l in f if not l.startswith('-- Gerado em')]
+
+
+class TestImportJobs:
+    """Testes para a importação retomável"""
+
+    def test_importacao_completa(self, tmp_path):
+        """Testa contagens, agregados e erros estruturados"""
+        csv_file = str(tmp_path / 'contas.csv')
+        escrever_csv(csv_file, 20)
+        estado = import_jobs.executar_importacao(csv_file, tamanho_lote=4)
+        assert estado['importadas'] == 17
+        assert estado['total_erros'] == 3
+        assert estado['erros'][0] == {'linha': 1, 'erro': 'Valor inválido (0.0)'}
+        assert estado['valor_total'] == round(sum(i + 0.5 for i in range(20) if i % 7), 2)
+        assert estado['por_status'] == {'PAGA': [17, estado['valor_total']]}
+        assert estado['lotes'] == 5
+        assert not os.path.exists(estado['sql_file'] + '.checkpoint.json')
+
+    def test_retoma_do_ultimo_lote(self, tmp_path, monkeypatch):
+        """Testa que uma falha no meio retoma sem reprocessar linhas anteriores"""
+        csv_file = str(tmp_path / 'contas.csv')
+        escrever_csv(csv_file, 50)
+        referencia = import_jobs.executar_importacao(csv_file, str(tmp_path / 'ref.sql'), tamanho_lote=5)
+
+        original = import_jobs.parse_row
+        linhas_lidas = []
+
+        def falha_na_linha_33(row, linha):
+            linhas_lidas.append(linha)
+            if linha == 33:
+                raise KeyboardInterrupt
+            return original(row, linha)
+
+        monkeypatch.setattr(import_jobs, 'parse_row', falha_na_linha_33)
+        sql_file = str(tmp_path / 'saida.sql')
+        with pytest.raises(KeyboardInterrupt):
+            import_jobs.executar_importacao(csv_file, sql_file, tamanho_lote=5)
+        assert os.path.exists(sql_file + '.checkpoint.json')
+
+        linhas_lidas.clear()
+
+        def contando(row, linha):
+            linhas_lidas.append(linha)
+            return original(row, linha)
+
+        monkeypatch.setattr(import_jobs, 'parse_row', contando)
+        estado = import_jobs.executar_importacao(csv_file, sql_file, tamanho_lote=5)
+
+        assert estado['retomado_de'] > 0
+        assert min(linhas_lidas) == estado['retomado_de'] + 1
+        assert estado['importadas'] == referencia['importadas']
+        assert estado['valor_total'] == referencia['valor_total']
+        assert sem_data(sql_file) == sem_data(str(tmp_path / 'ref.sql'))
+
+    def test_checkpoint_de_outro_arquivo_e_ignorado(self, tmp_path):
+        """Testa que um CSV alterado recomeça do início"""
+        csv_file = str(tmp_path / 'contas.csv')
+        escrever_csv(csv_file, 10)
+        estado = import_jobs._novo_estado(csv_file, ';', 0)
+        escrever_csv(csv_file, 12)
+        os.utime(csv_file, ns=(1, 1))
+        checkpoint = str(tmp_path / 'cp.json')
+        import_jobs._gravar_json(checkpoint, estado)
+        assert import_jobs.carregar_checkpoint(checkpoint, csv_file) is None
+
+    def test_metricas_por_lote_confirmado(self, tmp_path):
+        """Testa que as métricas recebem contagens e latência de cada lote"""
+        class Registro:
+            def __init__(self):
+                self.linhas = {'read': 0, 'written': 0, 'rejected': 0}
+                self.lotes = []
+
+            def add(self, read=0, written=0, rejected=0):
+                self.linhas['read'] += read
+                self.linhas['written'] += written
+                self.linhas['rejected'] += rejected
+
+            def observe_batch(self, segundos):
+                self.lotes.append(segundos)
+
+        csv_file = str(tmp_path / 'contas.csv')
+        escrever_csv(csv_file, 20)
+        metricas = Registro()
+        estado = import_jobs.executar_importacao(csv_file, tamanho_lote=4, metrics=metricas)
+        assert metricas.linhas == {'read': 20, 'written': 17, 'rejected': 3}
+        assert len(metricas.lotes) == estado['lotes']
@@ -0,0 +1,66 @@
+import sqlite3
+
+import pytest
+
+from generate_contas_pagar_sql import generate_contas_pagar_sql
+from indice_nomes import CLIENTE, FORNECEDOR, IndiceNomes, nomes_da_planilha_omie, nomes_do_banco
+
+NOMES = [
+    'Energisa Minas Gerais S.A.', 'ENERGISA SUL-SUDESTE', 'Materiais Industriais Ltda.',
+    'Comércio de Materiais Elétricos ME', 'Cobre Sul Ltda', "Transportes D''Ávila", 'Energia SP',
+]
+
+
+class TestIndiceNomes:
+    """Testes para o índice de trigramas de nomes"""
+
+    def test_busca_por_trecho(self):
+        """Testa trecho no meio do nome, acentos, sufixos e ordem por pontuação"""
+        indice = IndiceNomes.construir((nome, FORNECEDOR) for nome in NOMES + ['MATERIAIS INDUSTRIAIS LTDA'])
+        assert len(indice) == len(NOMES)
+
+        energisa = [nome for nome, _ in indice.buscar('energisa')]
+        assert energisa[:2] == ['ENERGISA SUL-SUDESTE', 'Energisa Minas Gerais S.A.']
+        assert indice.buscar('materiais', limite=1) == [('Materiais Industriais Ltda.', 1.0)]
+        assert indice.buscar('eletricos')[0][0] == 'Comércio de Materiais Elétricos ME'
+        assert indice.buscar("d'avila")[0][0] == "Transportes D'Ávila"
+        assert indice.buscar('enrgisa')[0][0] == 'ENERGISA SUL-SUDESTE'
+        assert indice.buscar('xyzw') == []
+
+    def test_inclusao_e_arquivo(self, tmp_path):
+        """Testa inclusões depois da construção, filtro por tipo e gravação/leitura"""
+        indice = IndiceNomes.construir((nome, FORNECEDOR) for nome in NOMES)
+        indice.adicionar('Energisa Tocantins', CLIENTE)
+        indice.adicionar('COBRE SUL', CLIENTE)
+        assert indice.buscar('energisa tocantins', limite=1) == [('Energisa Tocantins', 1.0)]
+        assert [n for n, _ in indice.buscar('cobre sul', tipo=CLIENTE)] == ['Cobre Sul Ltda']
+
+        caminho = str(tmp_path / 'nomes.ztri')
+        indice.salvar(caminho)
+        lido = IndiceNomes.carregar(caminho)
+        for consulta in ('energisa', 'materiais', 'cobre', 'transportes'):
+            assert lido.buscar(consulta) == indice.buscar(consulta)
+        lido.adicionar('Alumínio Paulista S/A')
+        assert lido.buscar('paulista') == [('Alumínio Paulista S/A', 1.0)]
+        assert len(lido) == len(NOMES) + 2
+
+    def test_fontes_banco_e_planilha(self, tmp_path):
+        """Testa a leitura de contas_pagar e da planilha Clientes_Fornecedores"""
+        openpyxl = pytest.importorskip('openpyxl')
+        conn = sqlite3.connect(':memory:')
+        conn.executescript(generate_contas_pagar_sql())
+        do_banco = list(nomes_do_banco(conn))
+        assert do_banco and all(tipo == FORNECEDOR for _, tipo in do_banco)
+
+        wb = openpyxl.Workbook()
+        ws = wb.active
+        ws.cell(5, 3, 'Razão Social / Nome Completo *')
+        for linha, valores in enumerate([('Padaria Pão Quente ME', 'Pão Quente', 'Sim', 'Não'),
+                                         ('Acme Ltda', None, 'Não', 'Sim')], start=6):
+            for coluna, valor in zip((3, 5, 6, 7), valores):
+                ws.cell(linha, coluna, valor)
+        planilha = str(tmp_path / 'Zyntra_Clientes_Fornecedores.xlsx')
+        wb.save(planilha)
+
+        assert list(nomes_da_planilha_omie(planilha)) == [
+            ('Padaria Pão Quente ME', CLIENTE), ('Pão Quente', CLIENTE), ('Acme Ltda', FORNECEDOR)]
@@ -0,0 +1,64 @@
+import sqlite3
+from datetime import date, timedelta
+
+import numpy as np
+import pytest
+
+from generate_contas_pagar_sql import generate_contas_pagar_sql
+from projecao_caixa import SQL_PAGAR, Carteira, aging, carregar_carteira, projetar
+
+HOJE = date(2025, 3, 12)  # quarta-feira
+
+
+def carteira(pares):
+    pares = list(pares)
+    return Carteira([HOJE + timedelta(days=d) for d, _ in pares], [c for _, c in pares])
+
+
+class TestProjecaoCaixa:
+    """Testes para aging e projeção vetorizados"""
+
+    def test_aging(self):
+        """Testa as faixas de atraso nos limites"""
+        contas = carteira([(5, 100), (0, 200), (-1, 300), (-30, 400), (-31, 500), (-90, 600), (-91, 700)])
+        assert [(f['faixa'], f['quantidade'], f['centavos']) for f in aging(contas, HOJE)] == [
+            ('a vencer', 2, 300), ('1-30', 2, 700), ('31-60', 1, 500), ('61-90', 1, 600), ('91+', 1, 700)]
+
+    def test_projecao_diaria_igual_ao_laco(self):
+        """Testa entradas, saídas e saldo contra um cálculo linha a linha"""
+        rng = np.random.default_rng(7)
+        pagar = carteira(zip(rng.integers(-20, 60, 500).tolist(), rng.integers(1, 10**6, 500).tolist()))
+        receber = carteira(zip(rng.integers(-5, 60, 300).tolist(), rng.integers(1, 10**6, 300).tolist()))
+        p = projetar(pagar, receber, HOJE, dias=45, saldo_inicial=1_000)
+
+        saldo = 1_000
+        for dia in range(45):
+            entradas = sum(int(c) for v, c in zip(receber.vencimento, receber.centavos)
+                           if max((v - np.datetime64(HOJE)).astype(int), 0) == dia)
+            saidas = sum(int(c) for v, c in zip(pagar.vencimento, pagar.centavos)
+                         if max((v - np.datetime64(HOJE)).astype(int), 0) == dia)
+            saldo += entradas - saidas
+            assert (p['entradas'][dia], p['saidas'][dia], p['saldo'][dia]) == (entradas, saidas, saldo)
+
+    def test_semana_e_mes(self):
+        """Testa o agrupamento por semana (segunda-feira) e por mês"""
+        pagar = carteira([(0, 100), (4, 200), (5, 300), (25, 400), (400, 999)])
+        semanas = projetar(pagar, Carteira.vazia(), HOJE, dias=30, periodo='semana')
+        assert semanas['inicio'][:3].tolist() == [HOJE, date(2025, 3, 17), date(2025, 3, 24)]
+        assert semanas['saidas'][:2].tolist() == [300, 300]
+        assert semanas['saldo'][-1] == -1_000
+
+        meses = projetar(pagar, Carteira.vazia(), HOJE, dias=30, periodo='mes')
+        assert meses['inicio'].tolist() == [HOJE, date(2025, 4, 1)]
+        assert meses['saidas'].tolist() == [600, 400]
+
+        with pytest.raises(ValueError):
+            projetar(pagar, pagar, HOJE, periodo='ano')
+
+    def test_carregar_do_banco(self):
+        """Testa a leitura das contas em aberto do SQLite"""
+        conn = sqlite3.connect(':memory:')
+        conn.executescript(generate_contas_pagar_sql())
+        contas = carregar_carteira(conn, SQL_PAGAR, bloco=2)
+        assert len(contas) == 4
+        assert contas.centavos.sum() == round((1850.75 + 5600.00 + 2300.50 + 1200.00) * 100)
@@ -0,0 +1,95 @@
+import sqlite3
+from datetime import date
+
+from generate_contas_pagar_sql import generate_contas_pagar_sql
+from resumo_financeiro import ResumoContasPagar
+
+HOJE = date(2025, 11, 10)
+
+
+def banco():
+    conn = sqlite3.connect(':memory:')
+    conn.executescript(generate_contas_pagar_sql())
+    contas = [(f'Fornecedor {i % 13}', f'2025-11-{i % 28 + 1:02d}', 10 + i * 1.25,
+               ['Materiais', 'Utilidades', None][i % 3], ['PENDENTE', 'VENCIDA', 'PAGA', 'CANCELADA'][i % 4])
+              for i in range(400)]
+    conn.executemany("""INSERT INTO contas_pagar (fornecedor_nome, descricao, data_vencimento, valor_original,
+                        categoria, status) VALUES (?, 'D', ?, ?, ?, ?)""", contas)
+    conn.commit()
+    return conn
+
+
+def por_sql(conn):
+    """As consultas separadas de generate_contas_pagar_sql, com DATE('now') fixado em HOJE"""
+    hoje = HOJE.isoformat()
+    um = lambda sql, *p: conn.execute(sql, p).fetchone()
+    aberto = "status IN ('PENDENTE', 'VENCIDA')"
+    return {
+        'total_contas': um("SELECT COUNT(*) FROM contas_pagar")[0],
+        'contas_pendentes': um("SELECT COUNT(*) FROM contas_pagar WHERE status = 'PENDENTE'")[0],
+        'contas_vencidas': um("SELECT COUNT(*) FROM contas_pagar WHERE status = 'VENCIDA'")[0],
+        'valor_aberto': round(um(f"SELECT SUM(valor_total) FROM contas_pagar WHERE {aberto}")[0], 2),
+        'fornecedores_unicos': um("SELECT COUNT(DISTINCT fornecedor_nome) FROM contas_pagar")[0],
+        'vencidas_hoje': um(f"SELECT COUNT(*), ROUND(SUM(valor_total), 2) FROM contas_pagar "
+                            f"WHERE data_vencimento = ? AND {aberto}", hoje),
+        'vencendo_7_dias': um(f"SELECT COUNT(*), ROUND(SUM(valor_total), 2) FROM contas_pagar "
+                              f"WHERE data_vencimento BETWEEN ? AND DATE(?, '+7 days') AND {aberto}", hoje, hoje),
+        'abertas_por_categoria': conn.execute(
+            f"SELECT categoria, COUNT(*), ROUND(SUM(valor_total), 2) FROM contas_pagar WHERE {aberto} "
+            f"GROUP BY categoria ORDER BY SUM(valor_total) DESC").fetchall(),
+        'maiores_fornecedores': conn.execute(
+            f"SELECT fornecedor_nome, COUNT(*), ROUND(SUM(valor_total), 2) FROM contas_pagar WHERE {aberto} "
+            f"GROUP BY fornecedor_nome ORDER BY SUM(valor_total) DESC LIMIT 10").fetchall(),
+    }
+
+
+def comparavel(resultado):
+    par = lambda item: (item['quantidade'], round(item['valor'], 2))
+    return {
+        'total_contas': resultado['total_contas'],
+        'contas_pendentes': resultado['contas_pendentes'],
+        'contas_vencidas': resultado['contas_vencidas'],
+        'valor_aberto': round(resultado['valor_aberto'], 2),
+        'fornecedores_unicos': resultado['fornecedores_unicos'],
+        'vencidas_hoje': par(resultado['vencidas_hoje']),
+        'vencendo_7_dias': par(resultado['vencendo_7_dias']),
+        'abertas_por_categoria': [(i['categoria'],) + par(i) for i in resultado['abertas_por_categoria']],
+        'maiores_fornecedores': [(i['fornecedor'],) + par(i) for i in resultado['maiores_fornecedores']],
+    }
+
+
+class TestResumoFinanceiro:
+    """Testes para o resumo em leitura única"""
+
+    def test_bate_com_as_consultas_separadas(self):
+        """Testa que uma leitura produz os mesmos números das nove consultas"""
+        conn = banco()
+        resumo = ResumoContasPagar.carregar(conn, tamanho_bloco=37)
+        assert comparavel(resumo.resultado(HOJE)) == por_sql(conn)
+
+    def test_atualizacao_incremental(self):
+        """Testa que aplicar só as linhas alteradas equivale a reler tudo"""
+        conn = banco()
+        with conn:
+            conn.execute("DROP TRIGGER trg_contas_pagar_updated")
+            conn.execute("UPDATE contas_pagar SET data_atualizacao = datetime('2025-01-01', '+' || id || ' seconds')")
+        resumo = ResumoContasPagar.carregar(conn)
+        with conn:
+            conn.execute("""UPDATE contas_pagar SET status = 'PAGA', data_atualizacao = '2025-01-02 08:00:00'
+                            WHERE id % 5 = 0""")
+            conn.execute("""INSERT INTO contas_pagar (fornecedor_nome, descricao, data_vencimento, valor_original,
+                            categoria, status) VALUES ('Novo', 'D', '2025-11-12', 999.99, 'Materiais', 'PENDENTE')""")
+
+        aplicadas = []
+        original = resumo.aplicar
+        resumo.aplicar = lambda id_, linha: aplicadas.append(id_) or original(id_, linha)
+        resumo.atualizar(conn)
+        assert len(set(aplicadas)) == 81 + 1  # alteradas (inclui a da marca) + a inserida
+        assert comparavel(resumo.resultado(HOJE)) == por_sql(conn)
+
+        apagadas = [i for (i,) in conn.execute("SELECT id FROM contas_pagar WHERE id % 7 = 0")]
+        with conn:
+            conn.execute("DELETE FROM contas_pagar WHERE id % 7 = 0")
+        resumo.atualizar_ids(conn, apagadas)
+        assert comparavel(resumo.resultado(HOJE)) == por_sql(conn)
+        assert resumo.contas.keys() == ResumoContasPagar.carregar(conn).contas.keys()
@@ -0,0 +1,57 @@
+import sqlite3
+
+from generate_contas_pagar_sql import generate_contas_pagar_sql
+from varredura_vencidas import marca_atual, varrer_vencidas
+
+
+def banco(vencimentos):
+    conn = sqlite3.connect(':memory:')
+    conn.executescript(generate_contas_pagar_sql())
+    conn.execute("DELETE FROM contas_pagar")
+    conn.executemany("""INSERT INTO contas_pagar (fornecedor_nome, descricao, data_vencimento, valor_original, status)
+                        VALUES ('F', 'D', ?, 10, ?)""", vencimentos)
+    conn.commit()
+    return conn
+
+
+def status(conn):
+    return dict(conn.execute("SELECT data_vencimento, status FROM contas_pagar"))
+
+
+class TestVarreduraVencidas:
+    """Testes para a varredura incremental de vencidas"""
+
+    def test_primeira_execucao_e_faixas_seguintes(self):
+        """Testa a varredura completa inicial e depois só a faixa desde a marca"""
+        conn = banco([('2025-01-05', 'PENDENTE'), ('2025-01-10', 'PENDENTE'),
+                      ('2025-01-12', 'PAGA'), ('2025-01-20', 'PENDENTE')])
+        assert varrer_vencidas(conn, '2025-01-10') == {'de': None, 'ate': '2025-01-10', 'alteradas': 1}
+        assert marca_atual(conn) == '2025-01-10'
+        assert varrer_vencidas(conn, '2025-01-10')['alteradas'] == 0
+
+        resultado = varrer_vencidas(conn, '2025-01-21')
+        assert resultado == {'de': '2025-01-10', 'ate': '2025-01-21', 'alteradas': 2}
+        assert status(conn) == {'2025-01-05': 'VENCIDA', '2025-01-10': 'VENCIDA',
+                                '2025-01-12': 'PAGA', '2025-01-20': 'VENCIDA'}
+
+    def test_atualizacao_usa_indice(self):
+        """Testa que a faixa é lida pelo índice de status + vencimento"""
+        conn = banco([])
+        varrer_vencidas(conn, '2025-01-01')
+        plano = ' '.join(str(l) for l in conn.execute("""EXPLAIN QUERY PLAN UPDATE contas_pagar SET status = 'VENCIDA'
+            WHERE status = 'PENDENTE' AND data_vencimento >= '2025-01-01' AND data_vencimento < '2025-01-02'"""))
+        assert 'idx_contas_pagar_status_vencimento (status=? AND data_vencimento>? AND data_vencimento<?)' in plano
+
+    def test_linhas_atras_da_marca(self):
+        """Testa os triggers para contas inseridas ou alteradas atrás da marca"""
+        conn = banco([('2025-03-01', 'PENDENTE')])
+        varrer_vencidas(conn, '2025-02-01')
+        with conn:
+            conn.execute("""INSERT INTO contas_pagar (fornecedor_nome, descricao, data_vencimento, valor_original)
+                            VALUES ('F', 'D', '2025-01-15', 10)""")
+            conn.execute("UPDATE contas_pagar SET data_vencimento = '2025-01-20' WHERE data_vencimento = '2025-03-01'")
+        assert status(conn) == {'2025-01-15': 'VENCIDA', '2025-01-20': 'VENCIDA'}
+
+        with conn:
+            conn.execute("UPDATE contas_pagar SET data_vencimento = '2025-02-10' WHERE data_vencimento = '2025-01-20'")
+        assert status(conn)['2025-02-10'] == 'PENDENTE'
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Varredura incremental de contas vencidas (contas_pagar)
+
+A view v_contas_pagar_abertas recalcula o vencimento a cada leitura
+(CASE WHEN data_vencimento < DATE('now') e julianday por linha) e o status
+gravado nunca muda sozinho para VENCIDA. Esta varredura grava o status:
+
+    marca d'água   controle_varreduras('contas_pagar_vencidas') guarda a
+                   data até a qual (exclusive) tudo já foi varrido
+    por execução   UPDATE ... SET status = 'VENCIDA' WHERE status = 'PENDENTE'
+                   AND data_vencimento >= marca AND data_vencimento < hoje
+                   (índice em status, data_vencimento), e a
+                   marca avança para hoje na mesma transação
+
+Rodar várias vezes no mesmo dia não faz nada; ficar dias sem rodar só
+aumenta o intervalo da próxima execução. Na primeira execução (sem marca)
+todas as pendentes com vencimento anterior a hoje são varridas.
+
+Contas inseridas ou alteradas com vencimento atrás da marca não seriam
+vistas pela próxima faixa, então dois triggers cuidam delas: uma PENDENTE
+nessa situação já é gravada como VENCIDA, e uma VENCIDA cujo vencimento
+é adiado para depois da marca volta a PENDENTE.
+
+Agendamento (uma vez por dia, logo após a meia-noite):
+    cron:   5 0 * * *  python varredura_vencidas.py /caminho/banco.sqlite
+    Windows: schtasks /create /sc daily /st 00:05 /tn VarreduraVencidas
+             /tr "python varredura_vencidas.py C:\\caminho\\banco.sqlite"
+"""
+
+import argparse
+import os
+import sqlite3
+import sys
+from datetime import date
+
+NOME_VARREDURA = 'contas_pagar_vencidas'
+
+ESQUEMA = f"""
+CREATE TABLE IF NOT EXISTS controle_varreduras (
+    nome VARCHAR(100) PRIMARY KEY,
+    marca_data DATE NOT NULL,
+    executado_em DATETIME DEFAULT CURRENT_TIMESTAMP,
+    linhas_alteradas INTEGER DEFAULT 0
+);
+
+CREATE INDEX IF NOT EXISTS idx_contas_pagar_status_vencimento
+    ON contas_pagar(status, data_vencimento);
+
+CREATE TRIGGER IF NOT EXISTS trg_contas_pagar_vencida_insert
+    AFTER INSERT ON contas_pagar
+    FOR EACH ROW
+    WHEN NEW.status = 'PENDENTE' AND NEW.data_vencimento <
+        (SELECT marca_data FROM controle_varreduras WHERE nome = '{NOME_VARREDURA}')
+BEGIN
+    UPDATE contas_pagar SET status = 'VENCIDA' WHERE id = NEW.id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_contas_pagar_vencida_update
+    AFTER UPDATE OF data_vencimento, status ON contas_pagar
+    FOR EACH ROW
+    WHEN NEW.status = 'PENDENTE' AND NEW.data_vencimento <
+        (SELECT marca_data FROM controle_varreduras WHERE nome = '{NOME_VARREDURA}')
+BEGIN
+    UPDATE contas_pagar SET status = 'VENCIDA' WHERE id = NEW.id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_contas_pagar_vencimento_adiado
+    AFTER UPDATE OF data_vencimento ON contas_pagar
+    FOR EACH ROW
+    WHEN NEW.status = 'VENCIDA' AND NEW.data_vencimento >=
+        (SELECT marca_data FROM controle_varreduras WHERE nome = '{NOME_VARREDURA}')
+BEGIN
+    UPDATE contas_pagar SET status = 'PENDENTE' WHERE id = NEW.id;
+END;
+"""
+
+
+def garantir_esquema(conn):
+    """Cria a tabela de controle, o índice de status + vencimento e os triggers."""
+    conn.executescript(ESQUEMA)
+
+
+def marca_atual(conn):
+    """Data (ISO) até a qual a varredura já foi feita, ou None."""
+    linha = conn.execute("SELECT marca_data FROM controle_varreduras WHERE nome = ?",
+                         (NOME_VARREDURA,)).fetchone()
+    return linha[0] if linha else None
+
+
+def varrer_vencidas(conn, hoje=None):
+    """Marca como VENCIDA as pendentes que venceram desde a última execução.
+
+    Args:
+        conn: conexão sqlite3 com a tabela contas_pagar
+        hoje: date ou 'YYYY-MM-DD' (padrão: a data local de hoje)
+
+    Returns:
+        {'de': marca anterior ou None, 'ate': hoje, 'alteradas': n}
+    """
+    hoje = hoje or date.today()
+    hoje = hoje.isoformat() if isinstance(hoje, date) else str(hoje)
+    garantir_esquema(conn)
+
+    with conn:
+        marca = marca_atual(conn)
+        if marca is not None and marca >= hoje:
+            return {'de': marca, 'ate': hoje, 'alteradas': 0}
+
+        if marca is None:
+            cursor = conn.execute("""UPDATE contas_pagar SET status = 'VENCIDA'
+                WHERE status = 'PENDENTE' AND data_vencimento < ?""", (hoje,))
+        else:
+            cursor = conn.execute("""UPDATE contas_pagar SET status = 'VENCIDA'
+                WHERE status = 'PENDENTE' AND data_vencimento >= ? AND data_vencimento < ?""",
+                                  (marca, hoje))
+        alteradas = cursor.rowcount
+        conn.execute("""INSERT INTO controle_varreduras (nome, marca_data, executado_em, linhas_alteradas)
+            VALUES (?, ?, CURRENT_TIMESTAMP, ?)
+            ON CONFLICT(nome) DO UPDATE SET marca_data = excluded.marca_data,
+                executado_em = excluded.executado_em, linhas_alteradas = excluded.linhas_alteradas""",
+                     (NOME_VARREDURA, hoje, alteradas))
+    return {'de': marca, 'ate': hoje, 'alteradas': alteradas}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Varredura incremental de contas a pagar vencidas')
+    parser.add_argument('banco', help='arquivo SQLite com a tabela contas_pagar')
+    parser.add_argument('--hoje', help='data de referência YYYY-MM-DD (padrão: hoje)')
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(args.banco):
+        print(f"❌ Banco não encontrado: {args.banco}")
+        return 1
+
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'scripts_auxiliares'))
+    from job_metrics import JobMetrics
+
+    conn = sqlite3.connect(args.banco)
+    try:
+        with JobMetrics('varredura_vencidas') as metrics:
+            resultado = varrer_vencidas(conn, args.hoje)
+            metrics.add(written=resultado['alteradas'])
+    finally:
+        conn.close()
+
+    faixa = f"{resultado['de']} a {resultado['ate']}" if resultado['de'] else f"antes de {resultado['ate']}"
+    print(f"✅ Varredura de vencidas ({faixa}): {resultado['alteradas']} contas marcadas como VENCIDA")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
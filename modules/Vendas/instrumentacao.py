@@ -0,0 +1,105 @@
+"""Instrumentação opcional das funções de preço de vendas.py.
+
+Desligada (padrão), nada muda: o módulo vendas mantém as funções
+originais e não há custo algum por chamada. ativar() troca
+calcular_total, aplicar_desconto, calcular_imposto e registrar_venda no
+módulo vendas por versões que contam chamadas, erros e tempo acumulado;
+desativar() devolve as originais.
+
+Como registrar_venda chama as outras pelo módulo, o tempo das etapas
+internas também é medido. Referências importadas antes de ativar()
+(``from vendas import calcular_total``) continuam apontando para a função
+original e não são contadas.
+
+Uso:
+    import instrumentacao
+    instrumentacao.ativar()
+    ...
+    print(instrumentacao.snapshot())
+    instrumentacao.desativar()
+"""
+
+import functools
+import threading
+import time
+
+import vendas
+
+FUNCOES = ('calcular_total', 'aplicar_desconto', 'calcular_imposto', 'registrar_venda')
+
+_originais = {}
+_estatisticas = {}
+_lock = threading.Lock()
+
+
+def _novas_estatisticas():
+    return {'chamadas': 0, 'erros': 0, 'tempo_total': 0.0, 'tempo_max': 0.0}
+
+
+def _instrumentar(nome, funcao):
+    estat = _estatisticas.setdefault(nome, _novas_estatisticas())
+    relogio = time.perf_counter
+
+    @functools.wraps(funcao)
+    def instrumentada(*args, **kwargs):
+        inicio = relogio()
+        try:
+            return funcao(*args, **kwargs)
+        except Exception:
+            with _lock:
+                estat['erros'] += 1
+            raise
+        finally:
+            duracao = relogio() - inicio
+            with _lock:
+                estat['chamadas'] += 1
+                estat['tempo_total'] += duracao
+                if duracao > estat['tempo_max']:
+                    estat['tempo_max'] = duracao
+
+    return instrumentada
+
+
+def ativo() -> bool:
+    """Indica se as funções de vendas estão instrumentadas."""
+    return bool(_originais)
+
+
+def ativar() -> None:
+    """Substitui as funções de vendas pelas versões instrumentadas (idempotente)."""
+    if _originais:
+        return
+    for nome in FUNCOES:
+        original = getattr(vendas, nome)
+        _originais[nome] = original
+        setattr(vendas, nome, _instrumentar(nome, original))
+
+
+def desativar() -> None:
+    """Restaura as funções originais; os totais já coletados são mantidos."""
+    for nome, original in _originais.items():
+        setattr(vendas, nome, original)
+    _originais.clear()
+
+
+def zerar() -> None:
+    """Zera os contadores sem mudar o estado ativo/inativo."""
+    with _lock:
+        for estat in _estatisticas.values():
+            estat.update(_novas_estatisticas())
+
+
+def snapshot() -> dict:
+    """Retorna uma cópia dos totais por função.
+
+    Returns:
+        {nome: {'chamadas', 'erros', 'tempo_total', 'tempo_max', 'tempo_medio'}},
+        tempos em segundos. Funções nunca instrumentadas aparecem zeradas.
+    """
+    with _lock:
+        resultado = {}
+        for nome in FUNCOES:
+            estat = dict(_estatisticas.get(nome) or _novas_estatisticas())
+            estat['tempo_medio'] = estat['tempo_total'] / estat['chamadas'] if estat['chamadas'] else 0.0
+            resultado[nome] = estat
+        return resultado
@@ -0,0 +1,54 @@
+import pytest
+
+import instrumentacao
+import vendas
+
+
+@pytest.fixture(autouse=True)
+def limpar_instrumentacao():
+    instrumentacao.desativar()
+    instrumentacao.zerar()
+    yield
+    instrumentacao.desativar()
+    instrumentacao.zerar()
+
+
+class TestInstrumentacao:
+    """Testes para a instrumentação opcional de vendas"""
+
+    def test_desativada_nao_altera_funcoes(self):
+        """Testa que, desligada, vendas mantém as funções originais"""
+        originais = [getattr(vendas, nome) for nome in instrumentacao.FUNCOES]
+        instrumentacao.ativar()
+        instrumentacao.desativar()
+        assert [getattr(vendas, nome) for nome in instrumentacao.FUNCOES] == originais
+        assert not instrumentacao.ativo()
+
+    def test_conta_chamadas_internas(self):
+        """Testa que registrar_venda conta também as etapas internas"""
+        instrumentacao.ativar()
+        venda = vendas.registrar_venda("Cabo", 10, 2.5, desconto_percentual=10, imposto_percentual=5)
+        assert venda["total"] == 23.62
+        stats = instrumentacao.snapshot()
+        for nome in instrumentacao.FUNCOES:
+            assert stats[nome]["chamadas"] == 1
+            assert stats[nome]["erros"] == 0
+        assert stats["registrar_venda"]["tempo_total"] >= stats["calcular_total"]["tempo_total"]
+
+    def test_conta_erros(self):
+        """Testa que exceções são contadas e repassadas"""
+        instrumentacao.ativar()
+        with pytest.raises(ValueError):
+            vendas.aplicar_desconto(100, 150)
+        stats = instrumentacao.snapshot()["aplicar_desconto"]
+        assert stats["chamadas"] == 1
+        assert stats["erros"] == 1
+
+    def test_snapshot_e_copia(self):
+        """Testa que o snapshot não muda com chamadas posteriores"""
+        instrumentacao.ativar()
+        vendas.calcular_total(1.0, 1)
+        antes = instrumentacao.snapshot()
+        vendas.calcular_total(1.0, 1)
+        assert antes["calcular_total"]["chamadas"] == 1
+        assert instrumentacao.snapshot()["calcular_total"]["chamadas"] == 2
@@ -11,8 +11,12 @@ from copy import copy
 import warnings
 import shutil
 import os
+import sys
 import tempfile
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'scripts_auxiliares'))
+from job_metrics import JobMetrics
+
 warnings.filterwarnings('ignore')
 
 # Paths
@@ -157,13 +161,20 @@ def replace_logo_in_template(omie_filename):
 # Process all templates
 print('Recriando templates com logo Zyntra...\n')
 
+# Metrics (ZYNTRA_METRICS_DIR): one batch per template, failures as rejected
+metrics = JobMetrics('create_zyntra_templates')
 created_files = []
-for omie_file in OMIE_FILES:
-    try:
-        out_name = replace_logo_in_template(omie_file)
-        created_files.append(out_name)
-    except Exception as e:
-        print(f'  ERRO: {omie_file} -> {e}')
+with metrics:
+    for omie_file in OMIE_FILES:
+        try:
+            with metrics.batch():
+                out_name = replace_logo_in_template(omie_file)
+            created_files.append(out_name)
+            metrics.add(read=1, written=1)
+        except Exception as e:
+            metrics.add(read=1, rejected=1)
+            print(f'  ERRO: {omie_file} -> {e}')
+    metrics.failed = len(created_files) < len(OMIE_FILES)
 
 print(f'\n{len(created_files)} templates criados em: {OUTPUT_DIR}')
 
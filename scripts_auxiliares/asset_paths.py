@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Map the URLs used in pages to files on disk, the same way server.js serves them.
+
+STATIC_MOUNTS mirrors the express.static() mounts of server.js, in the same
+order: express tries each matching mount in turn and the first one that has
+the file wins. Relative URLs are resolved against the page's directory.
+"""
+
+import os
+import posixpath
+from urllib.parse import urlsplit
+
+# (url prefix, directory relative to the repo root) - keep in sync with server.js
+STATIC_MOUNTS = [
+    ('/ajuda', 'ajuda'),
+    ('/Ajuda', 'ajuda'),
+    ('/_shared', '_shared'),
+    ('/css', 'public/css'),
+    ('/js', 'public/js'),
+    ('/Fundos', 'public/Fundos'),
+    ('/chat', 'public/chat'),
+    ('/chat', 'Chat/public'),
+    ('/', 'public'),
+    ('/Vendas/js', 'modules/Vendas/public/js'),
+    ('/Vendas/css', 'modules/Vendas/public/css'),
+    ('/Vendas/images', 'modules/Vendas/public/images'),
+    ('/Vendas/assets', 'modules/Vendas/public/assets'),
+    ('/PCP', 'modules/PCP'),
+    ('/modules/PCP', 'modules/PCP'),
+    ('/NFe', 'modules/NFe'),
+    ('/e-Nf-e', 'modules/NFe'),
+    ('/Financeiro', 'modules/Financeiro/public'),
+    ('/Compras', 'modules/Compras'),
+    ('/RecursosHumanos', 'modules/RH/public'),
+    ('/RH', 'modules/RH/public'),
+    ('/_shared', 'modules/_shared'),
+    ('/modules', 'modules'),
+    ('/modules/Vendas', 'modules/Vendas'),
+]
+
+
+def is_local_url(url):
+    """True for URLs served by this app (no scheme, host, data: or template placeholders)."""
+    if not url or url.startswith(('#', '//', 'data:', 'blob:', 'javascript:', 'mailto:')):
+        return False
+    if '${' in url or '{{' in url or '<%' in url:
+        return False
+    return not urlsplit(url).scheme
+
+
+def resolve_asset(root, url, page_rel=None):
+    """Return the path (relative to root, '/' separated) of the file serving url, or None."""
+    if not is_local_url(url):
+        return None
+    path = urlsplit(url).path
+    if not path:
+        return None
+    if not path.startswith('/'):
+        if page_rel is None:
+            return None
+        page_dir = posixpath.dirname(page_rel.replace(os.sep, '/'))
+        candidate = posixpath.normpath(posixpath.join(page_dir, path))
+        if candidate.startswith('..'):
+            return None
+        return candidate if os.path.isfile(os.path.join(root, candidate)) else None
+
+    path = posixpath.normpath(path)
+    for prefix, directory in STATIC_MOUNTS:
+        if prefix == '/':
+            sub = path.lstrip('/')
+        elif path == prefix or path.startswith(prefix + '/'):
+            sub = path[len(prefix):].lstrip('/')
+        else:
+            continue
+        if not sub:
+            continue
+        candidate = posixpath.join(directory, sub)
+        if os.path.isfile(os.path.join(root, candidate)):
+            return candidate
+    return None
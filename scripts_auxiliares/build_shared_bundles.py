@@ -0,0 +1,340 @@
+#!/usr/bin/env python3
+"""
+Per-module bundles of the shared scripts, precompressed for nginx gzip_static.
+
+Every module page loads its own copy of auth-unified.js, user-dropdown.js
+and sidebar-click-animation.js as separate requests. This build step scans the pages of each module, collects which of
+those shared scripts it uses and writes one minified bundle per module:
+
+    public/js/bundles/<module>.js       served as /js/bundles/<module>.js
+    public/js/bundles/<module>.js.gz    gzip level 9, picked up by gzip_static
+
+Builds are incremental: bundles-manifest.json records the sha256 of every
+input, and a bundle is only rebuilt when an input, the input list or the
+minifier changed (or an output file is missing).
+
+The minifier is deliberately conservative: it removes comments and
+indentation and collapses whitespace, but never renames or reorders code,
+and keeps line breaks so automatic semicolon insertion is unaffected.
+Strings, template literals and regex literals are copied verbatim.
+
+No page loads the bundles yet (the shared tags mix sync and defer loading
+at different points of each page), so deploy.sh does not build them and
+nginx.conf has no location for them. Switch a module's pages over, then
+add both.
+
+Usage:
+    python build_shared_bundles.py [--root DIR] [--force] [--dry-run]
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import re
+import sys
+
+from asset_paths import resolve_asset
+from html_patch_engine import atomic_write, decode_bytes, iter_files
+
+# Shared scripts, in load order (the order the pages include them)
+SHARED_SCRIPTS = (
+    'public/js/auth-unified.js',
+    'public/js/user-dropdown.js',
+    'public/js/sidebar-click-animation.js',
+)
+OUTPUT_DIR = 'public/js/bundles'
+MANIFEST_NAME = 'bundles-manifest.json'
+MINIFIER_VERSION = 1
+GZIP_LEVEL = 9
+PAGE_PATHS = ('modules', 'public')
+SKIP_DIRS = {'node_modules', '.git', '__pycache__', 'uploads', 'avatars', 'bundles',
+             '_backup', 'backup', 'Backup', '_backups'}
+
+SCRIPT_SRC_RE = re.compile(r'<script\b[^>]*\bsrc\s*=\s*(["\'])([^"\']+)\1', re.IGNORECASE)
+HTML_COMMENT_RE = re.compile(r'<!--.*?-->', re.DOTALL)
+DIRECTIVE_RE = re.compile(r'^\s*(["\'])use strict\1')
+
+# A '/' after one of these (or at the start) begins a regex literal, not a division
+_REGEX_PREV_CHARS = set('(,=:[!&|?{};+-*%<>~^')
+_REGEX_PREV_WORDS = {'return', 'typeof', 'case', 'do', 'else', 'in', 'of', 'new', 'delete',
+                     'void', 'throw', 'instanceof', 'yield', 'await'}
+_WORD_RE = re.compile(r'[A-Za-z_$][\w$]*$')
+_NEWLINES = '\n\r\u2028\u2029'
+_WHITESPACE = ' \t\f\v\u00a0\ufeff' + _NEWLINES
+
+
+def _has_newline(text):
+    return any(ch in _NEWLINES for ch in text)
+
+
+def minify_js(source):
+    """Strip comments and redundant whitespace from JavaScript source."""
+    out = []
+    n = len(source)
+    i = 0
+    templates = []          # open ${ } depth per enclosing template literal
+    pending_space = ''      # '' / ' ' / '\n' to emit before the next token
+
+    def last_significant():
+        for chunk in reversed(out):
+            stripped = chunk.rstrip()
+            if stripped:
+                return stripped
+        return ''
+
+    def emit(text):
+        nonlocal pending_space
+        if pending_space == ' ' and out:
+            # Spaces are only kept where dropping them would join two tokens
+            prev, first = out[-1][-1:], text[:1]
+            word = first.isalnum() or first in '_$\\'
+            keep = (word and (prev.isalnum() or prev in '_$\\/')) or (prev.isdigit() and first == '.')
+            keep = keep or (prev in '+-' and first in '+-') or (prev == '/' and first in '/*')
+            if not keep:
+                pending_space = ''
+        if pending_space and out:
+            out.append(pending_space)
+        pending_space = ''
+        out.append(text)
+
+    def copy_template(start):
+        """Copy a template literal chunk from start (just after ` or }) up to ` or ${."""
+        j = start
+        while j < n:
+            c = source[j]
+            if c == '\\':
+                j += 2
+                continue
+            if c == '`':
+                return j + 1, False
+            if c == '$' and j + 1 < n and source[j + 1] == '{':
+                return j + 2, True
+            j += 1
+        return n, False
+
+    while i < n:
+        c = source[i]
+        nxt = source[i + 1] if i + 1 < n else ''
+
+        if c in _WHITESPACE:
+            j = i
+            while j < n and source[j] in _WHITESPACE:
+                j += 1
+            if _has_newline(source[i:j]):
+                pending_space = '\n'
+            elif pending_space != '\n':
+                pending_space = ' '
+            i = j
+            continue
+
+        if c == '/' and nxt == '/':
+            j = i + 2
+            while j < n and source[j] not in _NEWLINES:
+                j += 1
+            i = j
+            continue
+
+        if c == '/' and nxt == '*':
+            j = source.find('*/', i + 2)
+            end = n if j < 0 else j + 2
+            if _has_newline(source[i:end]):
+                pending_space = '\n'
+            elif pending_space != '\n':
+                pending_space = ' '
+            i = end
+            continue
+
+        if c in '"\'':
+            j = i + 1
+            while j < n and source[j] != c and source[j] not in _NEWLINES:
+                j += 2 if source[j] == '\\' else 1
+            emit(source[i:j + 1])
+            i = j + 1
+            continue
+
+        if c == '`':
+            end, opened = copy_template(i + 1)
+            emit(source[i:end])
+            if opened:
+                templates.append(0)
+            i = end
+            continue
+
+        if c == '}' and templates and templates[-1] == 0:
+            templates.pop()
+            end, opened = copy_template(i + 1)
+            emit(source[i:end])
+            if opened:
+                templates.append(0)
+            i = end
+            continue
+
+        if c == '/':
+            prev = last_significant()
+            word = _WORD_RE.search(prev)
+            if not prev or prev[-1] in _REGEX_PREV_CHARS or (word and word.group(0) in _REGEX_PREV_WORDS):
+                j = i + 1
+                in_class = False
+                while j < n and source[j] not in _NEWLINES:
+                    ch = source[j]
+                    if ch == '\\':
+                        j += 2
+                        continue
+                    if ch == '[':
+                        in_class = True
+                    elif ch == ']':
+                        in_class = False
+                    elif ch == '/' and not in_class:
+                        break
+                    j += 1
+                j += 1
+                while j < n and (source[j].isalnum() or source[j] == '_'):
+                    j += 1
+                emit(source[i:j])
+                i = j
+                continue
+
+        if templates:
+            if c == '{':
+                templates[-1] += 1
+            elif c == '}':
+                templates[-1] -= 1
+
+        emit(c)
+        i += 1
+
+    return ''.join(out).strip() + '\n'
+
+
+def module_of(page_rel):
+    """Bundle name for a page: the module directory name, 'portal' for public/ pages,
+    None for the layout templates in modules/_shared."""
+    parts = page_rel.replace(os.sep, '/').split('/')
+    if parts[0] == 'modules' and len(parts) > 2:
+        return None if parts[1].startswith('_') else parts[1].lower()
+    return 'portal'
+
+
+def scan_pages(root):
+    """Return {module: set(shared script rel paths)} for every page that uses them."""
+    usage = {}
+    for page in iter_files(root, *PAGE_PATHS, suffixes=('.html', '.htm'), skip_dirs=SKIP_DIRS):
+        with open(os.path.join(root, page), 'rb') as f:
+            content, _ = decode_bytes(f.read())
+        content = HTML_COMMENT_RE.sub('', content)
+        for _, url in SCRIPT_SRC_RE.findall(content):
+            rel = resolve_asset(root, url, page)
+            if rel is None:
+                # Referenced but missing from the tree: keep it so it is reported
+                path = url.split('?', 1)[0].lstrip('/')
+                rel = next((s for s in SHARED_SCRIPTS if s.endswith(path) and path), None)
+            module = module_of(page)
+            if module and rel in SHARED_SCRIPTS:
+                usage.setdefault(module, set()).add(rel)
+    return usage
+
+
+def sha256_file(filepath):
+    with open(filepath, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def build_bundle(root, inputs):
+    """Concatenate and minify inputs. Returns (bundle_bytes, warnings)."""
+    pieces = [';\n']   # ends the directive prologue: no file's 'use strict' leaks into the next
+    warnings = []
+    for rel in inputs:
+        with open(os.path.join(root, rel), 'rb') as f:
+            source, _ = decode_bytes(f.read())
+        minified = minify_js(source)
+        if DIRECTIVE_RE.match(minified):
+            warnings.append(f"{rel}: top-level 'use strict' is ignored inside a bundle")
+        pieces.append(f'/* {rel} */\n{minified};\n')
+    return ''.join(pieces).encode('utf-8'), warnings
+
+
+def load_manifest(path):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return data if data.get('minifier') == MINIFIER_VERSION else {}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Build precompressed per-module bundles of the shared scripts')
+    parser.add_argument('--root', default=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    parser.add_argument('--force', action='store_true', help='rebuild every bundle')
+    parser.add_argument('--dry-run', action='store_true', help='report what would be rebuilt')
+    args = parser.parse_args(argv)
+
+    root = os.path.abspath(args.root)
+    out_dir = os.path.join(root, OUTPUT_DIR)
+    manifest_path = os.path.join(out_dir, MANIFEST_NAME)
+    previous = {} if args.force else load_manifest(manifest_path).get('bundles', {})
+
+    usage = scan_pages(root)
+    missing = sorted({rel for used in usage.values() for rel in used
+                      if not os.path.isfile(os.path.join(root, rel))})
+
+    bundles = {}
+    built, current = [], []
+    for module in sorted(usage):
+        inputs = [rel for rel in SHARED_SCRIPTS if rel in usage[module] and rel not in missing]
+        if not inputs:
+            continue
+        hashes = {rel: sha256_file(os.path.join(root, rel)) for rel in inputs}
+        name = f'{module}.js'
+        target = os.path.join(out_dir, name)
+        entry = previous.get(module)
+        if (entry and entry.get('inputs') == hashes
+                and os.path.isfile(target) and os.path.isfile(target + '.gz')):
+            bundles[module] = entry
+            current.append(module)
+            continue
+
+        data, warnings = build_bundle(root, inputs)
+        compressed = gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0)
+        raw_size = sum(os.path.getsize(os.path.join(root, rel)) for rel in inputs)
+        bundles[module] = {
+            'file': f'{OUTPUT_DIR}/{name}',
+            'inputs': hashes,
+            'sha256': hashlib.sha256(data).hexdigest(),
+            'source_bytes': raw_size,
+            'bytes': len(data),
+            'gzip_bytes': len(compressed),
+        }
+        built.append((module, warnings))
+        if not args.dry_run:
+            os.makedirs(out_dir, exist_ok=True)
+            atomic_write(target, data)
+            atomic_write(target + '.gz', compressed)
+
+    if not args.dry_run:
+        payload = {'minifier': MINIFIER_VERSION, 'bundles': bundles}
+        atomic_write(manifest_path, (json.dumps(payload, indent=2, sort_keys=True) + '\n').encode('utf-8'))
+
+    action = 'WOULD BUILD' if args.dry_run else 'BUILT'
+    print(f"=== SHARED SCRIPT BUNDLES ===")
+    print(f"\n✅ {action} ({len(built)}):")
+    for module, warnings in built:
+        b = bundles[module]
+        print(f"   {b['file']}: {len(b['inputs'])} scripts, {b['source_bytes']:,} -> "
+              f"{b['bytes']:,} bytes minified, {b['gzip_bytes']:,} gzipped")
+        for warning in warnings:
+            print(f"      ⚠️ {warning}")
+    if current:
+        print(f"\n⏩ UP TO DATE ({len(current)}): {', '.join(current)}")
+    if missing:
+        print(f"\n⚠️ REFERENCED BUT MISSING (left out of the bundles):")
+        for rel in missing:
+            print(f"   {rel}")
+    print(f"\n📊 {len(bundles)} bundles, {len(built)} rebuilt, {len(current)} up to date")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
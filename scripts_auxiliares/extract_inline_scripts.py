@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Move inline <script> bodies out of the pages into content-hashed files.
+
+Pages like modules/Vendas/public/index.html (14k lines) and
+modules/PCP/index.html carry most of their JavaScript inline, so it is
+downloaded again on every navigation and can never be cached. For every
+inline JavaScript block of at least --min-bytes, the body is written to
+
+    public/js/inline/inline.<sha256[:10]>.js     served as /js/inline/...
+
+and the block is replaced by <script src="/js/inline/inline.<hash>.js">
+with the same attributes. The file name only changes when the code does, so
+nginx caches it as immutable; identical blocks on several pages share one
+file. public/js/inline/ is tracked: commit the new files together with the
+rewritten pages, or a fresh clone serves pages whose scripts are missing.
+
+Left inline: JSON/template script types, blocks inside HTML comments, blocks
+with server-side placeholders ({{ }}, <% %>) and blocks below --min-bytes
+(an extra request costs more than they do). defer/async are dropped from
+extracted classic scripts, because browsers ignore them on inline scripts
+and honouring them after extraction would change execution order.
+
+Runs on html_patch_engine with a process pool; pages already processed
+with the same --min-bytes and unchanged since are skipped on reruns (a
+lower threshold rescans them; extracted scripts are never put back inline).
+
+Usage:
+    python extract_inline_scripts.py [paths...] [--root DIR] [--min-bytes 1024] [--dry-run]
+"""
+
+import argparse
+import functools
+import hashlib
+import os
+import re
+import sys
+
+from html_patch_engine import PatchEngine, atomic_write
+
+PATCH_NAME = 'inline-script-extract-v1'
+DEFAULT_PATHS = ('modules', 'public')
+SKIP_DIRS = {'node_modules', '.git', '__pycache__', 'uploads', 'avatars', 'inline',
+             '_backup', 'backup', 'Backup', '_backups'}
+OUTPUT_DIR = 'public/js/inline'
+URL_PREFIX = '/js/inline/'
+MIN_BYTES = 1024
+HASH_LENGTH = 10
+
+SCRIPT_RE = re.compile(r'<script\b([^>]*)>(.*?)</script\s*>', re.IGNORECASE | re.DOTALL)
+COMMENT_RE = re.compile(r'<!--.*?-->', re.DOTALL)
+TYPE_RE = re.compile(r'\btype\s*=\s*(["\']?)([^"\'\s>]*)\1', re.IGNORECASE)
+SRC_RE = re.compile(r'\bsrc\s*=', re.IGNORECASE)
+DEFER_ASYNC_RE = re.compile(r'\s+(?:defer|async)(?:\s*=\s*(["\'])[^"\']*\1|\s*=\s*[^\s>]+)?(?=[\s/]|$)',
+                            re.IGNORECASE)
+JS_TYPES = {'', 'text/javascript', 'application/javascript', 'text/ecmascript', 'module'}
+PLACEHOLDERS = ('{{', '<%')
+
+
+def patch_name(min_bytes):
+    """Index key of the patch: pages done with another threshold are rescanned"""
+    return f'{PATCH_NAME}:min-bytes={min_bytes}'
+
+
+def _script_type(attrs):
+    match = TYPE_RE.search(attrs)
+    return match.group(2).lower() if match else ''
+
+
+def extract_scripts(content, rel_path, root, min_bytes=MIN_BYTES, dry_run=False):
+    """Patch function: replace large inline scripts with hashed external files.
+
+    detail is (scripts_moved, bytes_moved).
+    """
+    comments = [m.span() for m in COMMENT_RE.finditer(content)]
+    moved = 0
+    moved_bytes = 0
+    pieces = []
+    pos = 0
+    for match in SCRIPT_RE.finditer(content):
+        attrs, body = match.group(1), match.group(2)
+        start = match.start()
+        if SRC_RE.search(attrs) or any(s <= start < e for s, e in comments):
+            continue
+        script_type = _script_type(attrs)
+        if script_type not in JS_TYPES or any(p in body for p in PLACEHOLDERS):
+            continue
+        code = body.strip('\r\n')
+        data = (code + '\n').encode('utf-8', 'surrogatepass')
+        if len(data) < min_bytes:
+            continue
+
+        name = f"inline.{hashlib.sha256(data).hexdigest()[:HASH_LENGTH]}.js"
+        if not dry_run:
+            target = os.path.join(root, OUTPUT_DIR, name)
+            if not os.path.exists(target):
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+                atomic_write(target, data)
+
+        if script_type != 'module':
+            attrs = DEFER_ASYNC_RE.sub('', attrs)
+        pieces.append(content[pos:start])
+        pieces.append(f'<script{attrs.rstrip()} src="{URL_PREFIX}{name}"></script>')
+        pos = match.end()
+        moved += 1
+        moved_bytes += len(body.encode('utf-8', 'surrogatepass'))
+
+    if not moved:
+        return content, 'clean', (0, 0)
+    pieces.append(content[pos:])
+    return ''.join(pieces), 'extracted', (moved, moved_bytes)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Move inline <script> bodies into content-hashed files')
+    parser.add_argument('paths', nargs='*', default=list(DEFAULT_PATHS),
+                        help='files or directories relative to --root (default: %(default)s)')
+    parser.add_argument('--root', default=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    parser.add_argument('--min-bytes', type=int, default=MIN_BYTES, help='leave smaller scripts inline')
+    parser.add_argument('--dry-run', action='store_true', help='report only, write nothing')
+    parser.add_argument('--full', action='store_true', help='ignore the file index and rescan everything')
+    parser.add_argument('--workers', type=int, default=None)
+    args = parser.parse_args(argv)
+
+    root = os.path.abspath(args.root)
+    engine = PatchEngine(root, workers=args.workers, use_index=not args.full,
+                         dry_run=args.dry_run, processes=True)
+    name = patch_name(args.min_bytes)
+    engine.register(name, functools.partial(extract_scripts, root=root, min_bytes=args.min_bytes,
+                                                  dry_run=args.dry_run))
+    rel_paths = []
+    for path in args.paths:
+        if os.path.isfile(os.path.join(root, path)):
+            rel_paths.append(os.path.normpath(path))
+        else:
+            rel_paths.extend(engine.iter_files(path, suffixes=('.html', '.htm'), skip_dirs=SKIP_DIRS))
+    report = engine.run(rel_paths)
+
+    extracted = report.by_status(name).get('extracted', [])
+    scripts = sum(n for _, (n, _) in extracted)
+    total = sum(b for _, (_, b) in extracted)
+    action = 'WOULD MOVE' if args.dry_run else 'MOVED'
+    print(f"=== INLINE SCRIPT EXTRACTION ===")
+    print(f"\n✅ {action} ({len(extracted)} pages, {scripts} scripts, {total:,} bytes):")
+    for page, (n, nbytes) in sorted(extracted, key=lambda item: -item[1][1]):
+        print(f"   {nbytes:10,} bytes  {n:3d} scripts  {page}")
+    if report.errors:
+        print(f"\n❌ ERRORS ({len(report.errors)}):")
+        for f, err in report.errors:
+            print(f"   {f} — {err}")
+    print(f"\n📊 {len(rel_paths)} pages scanned, {len(report.unchanged)} unchanged since last run, "
+          f"{total:,} bytes moved to {OUTPUT_DIR}/")
+    return 1 if report.errors else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
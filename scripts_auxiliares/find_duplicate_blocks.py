@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""
+Duplicate block detector for HTML/JS pages (generalizes fix-index-duplicates.py).
+
+Every file is reduced to its significant lines (stripped, blank lines
+ignored) and each window of WINDOW consecutive lines is fingerprinted with a
+Rabin-Karp rolling hash, so the whole tree is hashed in one linear pass.
+Windows whose hash appears more than once are verified line by line and
+extended into maximal duplicated blocks, reported within and across files
+with their size in lines and bytes.
+
+With --remove, later copies of blocks duplicated inside the same file are
+deleted (the first copy stays). Always review the report first: two
+identical blocks in different <script> scopes may both be needed.
+
+Usage:
+    python find_duplicate_blocks.py [paths...] [--window 12] [--min-bytes 400] [--top 40]
+    python find_duplicate_blocks.py modules/Vendas/public/index.html --remove --min-remove-lines 30
+"""
+
+import argparse
+import hashlib
+import os
+import sys
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+
+from html_patch_engine import atomic_write, decode_bytes, iter_files
+
+DEFAULT_PATHS = ('public', 'modules', '_shared')
+SUFFIXES = ('.html', '.htm', '.js')
+SKIP_DIRS = {'node_modules', '.git', '__pycache__', 'vendor', 'libs', 'uploads'}
+
+WINDOW = 12
+MIN_BYTES = 400
+MAX_OCCURRENCES = 64      # windows repeated more often than this are boilerplate
+
+_MOD = (1 << 61) - 1
+_BASE = 1_000_003
+
+
+class FileLines:
+    """Significant lines of one file plus the data needed to map them back."""
+
+    def __init__(self, rel_path, lines, line_numbers, sizes, window_hashes):
+        self.rel_path = rel_path
+        self.lines = lines                  # stripped significant lines
+        self.line_numbers = line_numbers    # 1-based line number of each significant line
+        self.sizes = sizes                  # byte size of each original line
+        self.window_hashes = window_hashes  # rolling hash of window starting at i
+
+
+def rolling_hashes(line_hashes, window):
+    """Rabin-Karp hash of every window of `window` consecutive line hashes."""
+    if len(line_hashes) < window:
+        return []
+    high = pow(_BASE, window - 1, _MOD)
+    h = 0
+    for value in line_hashes[:window]:
+        h = (h * _BASE + value) % _MOD
+    hashes = [h]
+    for i in range(window, len(line_hashes)):
+        h = ((h - line_hashes[i - window] * high) * _BASE + line_hashes[i]) % _MOD
+        hashes.append(h)
+    return hashes
+
+
+def load_file(root, rel_path, window):
+    with open(os.path.join(root, rel_path), 'rb') as f:
+        raw = f.read()
+    text, _ = decode_bytes(raw)
+    lines, numbers, sizes, hashes = [], [], [], []
+    for number, line in enumerate(text.splitlines(keepends=True), 1):
+        stripped = line.strip()
+        if not stripped:
+            continue
+        encoded = stripped.encode('utf-8', 'surrogatepass')
+        lines.append(stripped)
+        numbers.append(number)
+        sizes.append(len(line.encode('utf-8', 'surrogatepass')))
+        hashes.append(zlib.crc32(encoded) + 1)
+    return FileLines(rel_path, lines, numbers, sizes, rolling_hashes(hashes, window))
+
+
+def find_blocks(files, window, min_bytes):
+    """Return duplicated blocks grouped by content.
+
+    Each group is a dict with lines, bytes, wasted (bytes * extra copies)
+    and occurrences [(file_idx, first_sig_line, n_sig_lines), ...].
+    """
+    by_hash = {}
+    for fi, f in enumerate(files):
+        for pos, h in enumerate(f.window_hashes):
+            by_hash.setdefault(h, []).append((fi, pos))
+
+    pairs = set()
+    for occurrences in by_hash.values():
+        if len(occurrences) < 2 or len(occurrences) > MAX_OCCURRENCES:
+            continue
+        for a in range(len(occurrences)):
+            fa, pa = occurrences[a]
+            la = files[fa].lines
+            for b in range(a + 1, len(occurrences)):
+                fb, pb = occurrences[b]
+                lb = files[fb].lines
+                # Only block starts: the previous lines must differ
+                if pa > 0 and pb > 0 and la[pa - 1] == lb[pb - 1]:
+                    continue
+                if la[pa:pa + window] != lb[pb:pb + window]:
+                    continue  # hash collision
+                length = window
+                limit = min(len(la) - pa, len(lb) - pb)
+                if fa == fb:
+                    limit = min(limit, pb - pa)  # copies must not overlap
+                while length < limit and la[pa + length] == lb[pb + length]:
+                    length += 1
+                if length >= window:
+                    pairs.add((fa, pa, fb, pb, length))
+
+    groups = {}
+    for fa, pa, fb, pb, length in pairs:
+        f = files[fa]
+        block = '\n'.join(f.lines[pa:pa + length])
+        nbytes = sum(f.sizes[pa:pa + length])
+        if nbytes < min_bytes:
+            continue
+        key = hashlib.sha1(block.encode('utf-8', 'surrogatepass')).hexdigest()
+        group = groups.setdefault(key, {'lines': length, 'bytes': nbytes, 'occurrences': set()})
+        group['occurrences'].add((fa, pa, length))
+        group['occurrences'].add((fb, pb, length))
+
+    result = []
+    for key, group in groups.items():
+        occurrences = sorted(group['occurrences'])
+        group['occurrences'] = occurrences
+        group['key'] = key
+        group['wasted'] = group['bytes'] * (len(occurrences) - 1)
+        group['cross_file'] = len({fi for fi, _, _ in occurrences}) > 1
+        result.append(group)
+    result.sort(key=lambda g: (-g['wasted'], g['key']))
+    return result
+
+
+def drop_nested(groups):
+    """Drop groups whose every occurrence lies inside an occurrence of a bigger group."""
+    kept = []
+    covered = {}
+    for group in sorted(groups, key=lambda g: -g['lines']):
+        inside = all(
+            any(s <= pos and pos + n <= s + length for s, length in covered.get(fi, ()))
+            for fi, pos, n in group['occurrences']
+        )
+        if inside:
+            continue
+        kept.append(group)
+        for fi, pos, n in group['occurrences']:
+            covered.setdefault(fi, []).append((pos, n))
+    kept.sort(key=lambda g: (-g['wasted'], g['key']))
+    return kept
+
+
+def removal_ranges(files, groups, min_lines):
+    """Original line ranges (per file) of intra-file copies to delete, keeping the first copy."""
+    eligible = []
+    keep = {}
+    for group in groups:
+        if group['lines'] < min_lines:
+            continue
+        per_file = {}
+        for fi, pos, n in group['occurrences']:
+            per_file.setdefault(fi, []).append((pos, n))
+        for fi, occ in per_file.items():
+            if len(occ) < 2:
+                continue
+            occ.sort()
+            keep.setdefault(fi, []).append(occ[0])
+            eligible.append((fi, occ[1:]))
+
+    def overlaps(start, end, spans):
+        return any(not (end < s or start > e) for s, e in spans)
+
+    ranges = {}
+    for fi, occ in eligible:
+        f = files[fi]
+        kept = [(f.line_numbers[p], f.line_numbers[p + n - 1]) for p, n in keep[fi]]
+        for pos, n in occ:
+            start = f.line_numbers[pos]
+            end = f.line_numbers[pos + n - 1]
+            taken = ranges.setdefault(fi, [])
+            # Never remove text that overlaps a kept copy or an earlier removal
+            if overlaps(start, end, kept) or overlaps(start, end, taken):
+                continue
+            taken.append((start, end))
+    return ranges
+
+
+def remove_lines(root, rel_path, line_ranges):
+    filepath = os.path.join(root, rel_path)
+    with open(filepath, 'rb') as f:
+        raw = f.read()
+    text, encoding = decode_bytes(raw)
+    lines = text.splitlines(keepends=True)
+    drop = set()
+    for start, end in line_ranges:
+        drop.update(range(start, end + 1))
+    kept = [line for number, line in enumerate(lines, 1) if number not in drop]
+    atomic_write(filepath, ''.join(kept).encode(encoding))
+    return len(lines) - len(kept)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Report duplicated line blocks in HTML/JS files')
+    parser.add_argument('paths', nargs='*', default=list(DEFAULT_PATHS),
+                        help='files or directories relative to --root (default: %(default)s)')
+    parser.add_argument('--root', default=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    parser.add_argument('--window', type=int, default=WINDOW, help='lines per fingerprint window')
+    parser.add_argument('--min-bytes', type=int, default=MIN_BYTES, help='ignore smaller blocks')
+    parser.add_argument('--top', type=int, default=40, help='number of blocks to list')
+    parser.add_argument('--remove', action='store_true', help='delete later intra-file copies')
+    parser.add_argument('--min-remove-lines', type=int, default=30)
+    parser.add_argument('--workers', type=int, default=None)
+    args = parser.parse_args(argv)
+
+    rel_paths = []
+    for path in args.paths:
+        if os.path.isfile(os.path.join(args.root, path)):
+            rel_paths.append(os.path.normpath(path))
+        else:
+            rel_paths.extend(p for p in iter_files(args.root, path, suffixes=SUFFIXES, skip_dirs=SKIP_DIRS)
+                             if not p.endswith('.min.js'))
+
+    n = len(rel_paths)
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        files = list(pool.map(load_file, [args.root] * n, rel_paths, [args.window] * n, chunksize=8))
+
+    groups = drop_nested(find_blocks(files, args.window, args.min_bytes))
+
+    print(f"=== DUPLICATE BLOCKS REPORT ===")
+    print(f"\n🔁 TOP {min(args.top, len(groups))} of {len(groups)} duplicated blocks (by wasted bytes):")
+    for group in groups[:args.top]:
+        scope = 'cross-file' if group['cross_file'] else 'intra-file'
+        print(f"\n   {group['lines']} lines, {group['bytes']:,} bytes x{len(group['occurrences'])} "
+              f"({scope}, {group['wasted']:,} bytes wasted)")
+        for fi, pos, length in group['occurrences']:
+            f = files[fi]
+            print(f"      {f.rel_path}:{f.line_numbers[pos]}-{f.line_numbers[pos + length - 1]}")
+
+    intra = sum(g['wasted'] for g in groups if not g['cross_file'])
+    cross = sum(g['wasted'] for g in groups if g['cross_file'])
+    print(f"\n📊 {n} files, {len(groups)} blocks, {intra:,} bytes duplicated within files, "
+          f"{cross:,} bytes duplicated across files")
+
+    if args.remove:
+        ranges = removal_ranges(files, groups, args.min_remove_lines)
+        print(f"\n✂️ REMOVING intra-file copies (>= {args.min_remove_lines} lines):")
+        for fi, line_ranges in sorted(ranges.items()):
+            removed = remove_lines(args.root, files[fi].rel_path, line_ranges)
+            spans = ', '.join(f'{s}-{e}' for s, e in sorted(line_ranges))
+            print(f"   {files[fi].rel_path}: {removed} lines removed ({spans})")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
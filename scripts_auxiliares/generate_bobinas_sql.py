@@ -4,6 +4,13 @@ Generate SQL to completely rebuild bobinas_estoque from Excel data.
 Adds tipo column (bobina/rolo), deletes all existing rows, inserts 126 from Excel.
 """
 
+import argparse
+
+from job_metrics import JobMetrics
+from phase_profiler import PhaseProfiler, phase
+
+OUTPUT_PATH = r"g:\Outros computadores\Meu laptop (2)\Sistema - ALUFORCE - V.2\scripts_auxiliares\rebuild_bobinas.sql"
+
 # Product code -> produto_id mapping (from DB query)
 PRODUCT_IDS = {
     'CET2.15': 786, 'CET2.25': 787, 'CET2.40': 788, 'CET3.25': 791,
@@ -163,7 +170,11 @@ def determine_tipo(dimensao):
         return 'rolo'
     return 'bobina'
 
-def main():
+def build_rebuild_sql(rows=EXCEL_DATA):
+    """Build the rebuild script for rows of (cod, qtde, dimensao, cor, local, obs).
+
+    Returns (sql_content, insert_count, bobina_counter).
+    """
     lines = []
     lines.append("-- =========================================")
     lines.append("-- REBUILD bobinas_estoque FROM EXCEL DATA")
@@ -191,7 +202,7 @@ def main():
     bobina_counter = {}
     
     values = []
-    for cod, qtde, dim, cor, local, obs in EXCEL_DATA:
+    for cod, qtde, dim, cor, local, obs in rows:
         pid = PRODUCT_IDS.get(cod)
         if pid is None:
             print(f"WARNING: No product ID for code {cod}")
@@ -229,13 +240,28 @@ def main():
     lines.append("SELECT tipo, COUNT(*) as qtd, SUM(quantidade) as total_metros FROM bobinas_estoque GROUP BY tipo;")
     
     sql_content = '\n'.join(lines)
-    
-    output_path = r"g:\Outros computadores\Meu laptop (2)\Sistema - ALUFORCE - V.2\scripts_auxiliares\rebuild_bobinas.sql"
-    with open(output_path, 'w', encoding='utf-8') as f:
-        f.write(sql_content)
+    return sql_content, len(values), bobina_counter
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Generate the bobinas_estoque rebuild SQL')
+    parser.add_argument('--output', default=OUTPUT_PATH)
+    parser.add_argument('--profile', metavar='FILE', help='write per-phase time/memory report (JSON)')
+    parser.add_argument('--profile-time-only', action='store_true', help='with --profile, skip tracemalloc')
+    args = parser.parse_args(argv)
+    profiler = PhaseProfiler('generate_bobinas_sql', source='EXCEL_DATA',
+                             memory=not args.profile_time_only) if args.profile else None
+
+    output_path = args.output
+    # Prometheus textfile metrics when ZYNTRA_METRICS_DIR is set
+    with JobMetrics('generate_bobinas_sql') as metrics:
+        with phase(profiler, 'emit'):
+            sql_content, insert_count, bobina_counter = build_rebuild_sql(EXCEL_DATA)
+        with phase(profiler, 'write'), open(output_path, 'w', encoding='utf-8') as f:
+            f.write(sql_content)
+        metrics.add(read=len(EXCEL_DATA), written=insert_count, rejected=len(EXCEL_DATA) - insert_count)
     
     print(f"SQL generated: {output_path}")
-    print(f"Total INSERT rows: {len(values)}")
+    print(f"Total INSERT rows: {insert_count}")
     print(f"Product codes: {len(bobina_counter)}")
     
     # Summary
@@ -247,5 +273,10 @@ def main():
         bobs = count - rolos
         print(f"  {cod:12s} | {count:3d} items | {total:8.0f}m | {bobs} bobinas, {rolos} rolos")
 
+    if profiler:
+        profiler.write(args.profile)
+        profiler.print_summary()
+        print(f"Profile saved to: {args.profile}")
+
 if __name__ == '__main__':
     main()
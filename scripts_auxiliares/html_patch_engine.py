@@ -0,0 +1,316 @@
+#!/usr/bin/env python3
+"""
+Single-pass HTML patch engine for the injection scripts.
+
+Every file is read exactly once (as bytes), its encoding is detected in
+memory and all registered patches run over the decoded text before a
+single atomic write. Files are processed across a thread pool, or a
+process pool for CPU-heavy patches (``processes=True``; the patch functions
+must then be importable module-level functions).
+
+A persistent file index (path, mtime, size, encoding, sha1 and the patches
+already checked) lets reruns skip files that did not change since the last
+run. When the logic of a patch changes, give it a new name (e.g. bump a
+version suffix) so every file is checked again.
+
+Usage from a script:
+
+    engine = PatchEngine(BASE)
+
+    @engine.register('sidebar-animation-v1')
+    def inject(content, rel_path):
+        if 'sidebar-click-animation.js' in content:
+            return content, 'already', None
+        ...
+        return new_content, 'applied', None
+
+    report = engine.run(engine.iter_files('modules'))
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+# utf-8 first; cp1252 before latin-1 because latin-1 never fails
+ENCODINGS = ('utf-8', 'cp1252', 'latin-1')
+
+INDEX_FILENAME = '.html-patch-index.json'
+INDEX_VERSION = 1
+
+DEFAULT_SKIP_DIRS = {'node_modules', '.git', '__pycache__'}
+
+# Status recorded when a patch raises (patches may return any other label)
+STATUS_ERROR = 'error'
+
+
+def decode_bytes(raw, preferred=None):
+    """Decode raw bytes, strict utf-8 first. Returns (text, encoding).
+
+    ``preferred`` (the encoding recorded in the index) only reorders the
+    legacy fallbacks: cp1252 decodes most UTF-8 bytes without error, so a
+    file re-saved as UTF-8 must never be read with its old encoding.
+    """
+    legacy = ENCODINGS[1:]
+    if preferred in legacy:
+        legacy = (preferred,) + tuple(e for e in legacy if e != preferred)
+    encodings = (ENCODINGS[0],) + legacy
+    for enc in encodings:
+        try:
+            return raw.decode(enc), enc
+        except UnicodeDecodeError:
+            continue
+    # latin-1 decodes any byte sequence, so this is unreachable in practice
+    raise UnicodeDecodeError('latin-1', raw, 0, len(raw), 'could not decode')
+
+
+def atomic_write(filepath, data):
+    """Write bytes to filepath through a temp file + rename, keeping permissions."""
+    directory = os.path.dirname(filepath) or '.'
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.tmp-', suffix=os.path.basename(filepath))
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        try:
+            shutil.copymode(filepath, tmp_path)
+        except OSError:
+            os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, filepath)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def iter_files(root, *subdirs, suffixes=('.html',), skip_dirs=None, skip_dir=None):
+    """Yield paths (relative to root) of matching files under the given subdirs.
+
+    ``skip_dirs`` is a set of directory names never descended into;
+    ``skip_dir(rel_dir_path, name)`` is an optional extra predicate.
+    """
+    root = os.path.abspath(root)
+    skip_dirs = DEFAULT_SKIP_DIRS if skip_dirs is None else set(skip_dirs)
+    stack = [os.path.join(root, d) for d in reversed(subdirs or ('',))]
+    while stack:
+        current = stack.pop()
+        try:
+            entries = sorted(os.scandir(current), key=lambda e: e.name)
+        except (FileNotFoundError, NotADirectoryError):
+            continue
+        subdirs_found = []
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                if entry.name in skip_dirs:
+                    continue
+                rel_dir = os.path.relpath(entry.path, root)
+                if skip_dir and skip_dir(rel_dir, entry.name):
+                    continue
+                subdirs_found.append(entry.path)
+            elif entry.name.endswith(tuple(suffixes)):
+                yield os.path.relpath(entry.path, root)
+        stack.extend(reversed(subdirs_found))
+
+
+class Patch:
+    """A named text transformation.
+
+    ``func(content, rel_path)`` must return ``(new_content, status, detail)``.
+    ``status`` is a short free-form label used in the report ('applied',
+    'already', 'no-sidebar', ...); ``detail`` is optional extra information.
+    """
+
+    def __init__(self, name, func):
+        self.name = name
+        self.func = func
+
+    def __repr__(self):
+        return f'Patch({self.name!r})'
+
+
+class FileResult:
+    """Outcome of processing one file."""
+
+    def __init__(self, rel_path):
+        self.rel_path = rel_path
+        self.statuses = {}      # patch name -> (status, detail)
+        self.written = False
+        self.skipped = False    # unchanged since last run, not even opened
+        self.error = None       # read/decode/write failure
+        self.entry = None       # new index entry
+
+    def __repr__(self):
+        return f'FileResult({self.rel_path!r}, written={self.written}, skipped={self.skipped})'
+
+
+class PatchReport:
+    """Aggregated results of one engine run."""
+
+    def __init__(self, results):
+        self.results = results
+
+    @property
+    def written(self):
+        return sorted(r.rel_path for r in self.results if r.written)
+
+    @property
+    def unchanged(self):
+        return sorted(r.rel_path for r in self.results if r.skipped)
+
+    @property
+    def errors(self):
+        found = []
+        for r in self.results:
+            if r.error:
+                found.append((r.rel_path, r.error))
+            for name, (status, detail) in r.statuses.items():
+                if status == STATUS_ERROR:
+                    found.append((r.rel_path, f'{name}: {detail}'))
+        return sorted(found)
+
+    def by_status(self, patch_name):
+        """Return {status: [(rel_path, detail), ...]} for one patch."""
+        grouped = {}
+        for r in self.results:
+            if patch_name in r.statuses:
+                status, detail = r.statuses[patch_name]
+                grouped.setdefault(status, []).append((r.rel_path, detail))
+        for items in grouped.values():
+            items.sort(key=lambda item: item[0])
+        return grouped
+
+
+def process_file(root, rel_path, patches, entry=None, dry_run=False):
+    """Run every patch over one file with a single read and at most one write.
+
+    Module-level (not a method) so it can run in a worker process as well.
+    """
+    result = FileResult(rel_path)
+    filepath = os.path.join(root, rel_path)
+    names = [p.name for p in patches]
+    try:
+        st = os.stat(filepath)
+        if (entry and entry.get('mtime_ns') == st.st_mtime_ns
+                and entry.get('size') == st.st_size
+                and set(names) <= set(entry.get('checked', ()))):
+            result.skipped = True
+            result.entry = entry
+            return result
+
+        with open(filepath, 'rb') as f:
+            raw = f.read()
+        sha1 = hashlib.sha1(raw).hexdigest()
+        content, encoding = decode_bytes(raw, entry.get('encoding') if entry else None)
+
+        original = content
+        checked = []
+        for patch in patches:
+            try:
+                content, status, detail = patch.func(content, rel_path)
+                checked.append(patch.name)
+            except Exception as e:
+                status, detail = STATUS_ERROR, str(e)
+            result.statuses[patch.name] = (status, detail)
+
+        if content != original:
+            data = content.encode(encoding)
+            if not dry_run:
+                atomic_write(filepath, data)
+                st = os.stat(filepath)
+                sha1 = hashlib.sha1(data).hexdigest()
+            result.written = True
+        elif entry and entry.get('sha1') == sha1:
+            # Same bytes as last run: earlier checks by other patch sets still hold
+            checked = sorted(set(entry.get('checked', ())) | set(checked))
+
+        result.entry = {
+            'mtime_ns': st.st_mtime_ns,
+            'size': st.st_size,
+            'encoding': encoding,
+            'sha1': sha1,
+            'checked': checked,
+        }
+    except Exception as e:
+        result.error = str(e)
+    return result
+
+
+class PatchEngine:
+    """Apply several registered patches in one read/write per file."""
+
+    def __init__(self, root, index_path=None, workers=None, use_index=True, dry_run=False,
+                 processes=False):
+        self.root = os.path.abspath(root)
+        self.index_path = index_path or os.path.join(self.root, INDEX_FILENAME)
+        self.processes = processes
+        if processes:
+            self.workers = workers or os.cpu_count() or 1
+        else:
+            self.workers = workers or min(32, (os.cpu_count() or 1) + 4)
+        self.use_index = use_index
+        self.dry_run = dry_run
+        self.patches = []
+        self.index = self._load_index() if use_index else {}
+
+    # ── Registration ─────────────────────────────
+
+    def register(self, name, func=None):
+        """Register a patch. Usable directly or as a decorator."""
+        if any(p.name == name for p in self.patches):
+            raise ValueError(f'Patch already registered: {name}')
+
+        def decorator(f):
+            self.patches.append(Patch(name, f))
+            return f
+
+        if func is not None:
+            return decorator(func)
+        return decorator
+
+    # ── File discovery ───────────────────────────
+
+    def iter_files(self, *subdirs, **kwargs):
+        """Yield paths relative to the engine root (see module-level iter_files)."""
+        return iter_files(self.root, *subdirs, **kwargs)
+
+    # ── Index persistence ────────────────────────
+
+    def _load_index(self):
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {}
+        if data.get('version') != INDEX_VERSION:
+            return {}
+        return data.get('files', {})
+
+    def save_index(self):
+        if not self.use_index or self.dry_run:
+            return
+        payload = json.dumps({'version': INDEX_VERSION, 'files': self.index},
+                             ensure_ascii=False, sort_keys=True, indent=0)
+        os.makedirs(os.path.dirname(self.index_path) or '.', exist_ok=True)
+        atomic_write(self.index_path, payload.encode('utf-8'))
+
+    # ── Processing ───────────────────────────────
+
+    def run(self, rel_paths):
+        """Process the given files and return a PatchReport. Saves the index."""
+        if not self.patches:
+            raise ValueError('No patches registered')
+        rel_paths = list(rel_paths)
+        n = len(rel_paths)
+        executor = ProcessPoolExecutor if self.processes else ThreadPoolExecutor
+        with executor(max_workers=self.workers) as pool:
+            results = list(pool.map(
+                process_file, [self.root] * n, rel_paths, [self.patches] * n,
+                [self.index.get(p) for p in rel_paths], [self.dry_run] * n,
+                chunksize=16 if self.processes else 1))
+
+        for r in results:
+            if r.entry is not None:
+                self.index[r.rel_path] = r.entry
+        self.save_index()
+        return PatchReport(results)
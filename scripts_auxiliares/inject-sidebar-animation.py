@@ -3,10 +3,14 @@
 Inject sidebar-click-animation.js into ALL module HTML files that have a sidebar.
 Excludes: RH module (as requested), _shared, config, backup directories.
 Adds the script tag right before </body> if not already present.
+
+Runs on html_patch_engine: one read/write per file across a thread pool,
+and files unchanged since the last run are skipped via the file index.
 """
 
 import os
-import glob
+
+from html_patch_engine import PatchEngine
 
 BASE = r"g:\Outros computadores\Meu laptop (2)\Sistema - ALUFORCE - V.2"
 MODULES_DIR = os.path.join(BASE, "modules")
@@ -20,80 +24,52 @@ SKIP_MODULES = {'RH', '_shared', 'config', 'desktop.ini'}
 # Directories to skip within modules
 SKIP_DIRS = {'_backup', 'backup', 'Backup', '_backups', 'node_modules', 'Zyntra-SGE'}
 
-injected_files = []
-skipped_files = []
-already_has = []
-no_sidebar = []
-errors = []
-
-for module_name in os.listdir(MODULES_DIR):
-    module_path = os.path.join(MODULES_DIR, module_name)
-    if not os.path.isdir(module_path):
-        continue
-    if module_name in SKIP_MODULES:
-        continue
-    
-    # Find all HTML files recursively
-    for root, dirs, files in os.walk(module_path):
-        # Skip backup directories
-        dirs[:] = [d for d in dirs if d not in SKIP_DIRS and not d.startswith('_backup')]
-        
-        for fname in files:
-            if not fname.endswith('.html'):
-                continue
-            
-            filepath = os.path.join(root, fname)
-            rel_path = os.path.relpath(filepath, BASE)
-            
-            try:
-                # Try multiple encodings
-                content = None
-                used_encoding = None
-                for enc in ['utf-8', 'latin-1', 'cp1252']:
-                    try:
-                        with open(filepath, 'r', encoding=enc) as f:
-                            content = f.read()
-                        used_encoding = enc
-                        break
-                    except UnicodeDecodeError:
-                        continue
-                
-                if content is None:
-                    errors.append((rel_path, 'Could not decode with any encoding'))
-                    continue
-                
-                # Skip if no sidebar
-                if '<aside class="sidebar"' not in content and 'class="sidebar"' not in content:
-                    no_sidebar.append(rel_path)
-                    continue
-                
-                # Skip if already has the script
-                if 'sidebar-click-animation.js' in content:
-                    already_has.append(rel_path)
-                    continue
-                
-                # Find insertion point: before </body>
-                body_close_idx = content.rfind('</body>')
-                if body_close_idx == -1:
-                    skipped_files.append((rel_path, 'no </body> tag'))
-                    continue
-                
-                # Insert the script tag before </body>
-                indent = '    '
-                new_content = (
-                    content[:body_close_idx] +
-                    f'\n{indent}<!-- Sidebar Click Animation -->\n'
-                    f'{indent}{SCRIPT_TAG}\n'
-                    + content[body_close_idx:]
-                )
-                
-                with open(filepath, 'w', encoding=used_encoding) as f:
-                    f.write(new_content)
-                
-                injected_files.append(rel_path)
-                
-            except Exception as e:
-                errors.append((rel_path, str(e)))
+
+def inject_sidebar_animation(content, rel_path):
+    """Insert the script tag before </body> on pages that have a sidebar."""
+    # Skip if no sidebar
+    if '<aside class="sidebar"' not in content and 'class="sidebar"' not in content:
+        return content, 'no-sidebar', None
+
+    # Skip if already has the script
+    if 'sidebar-click-animation.js' in content:
+        return content, 'already', None
+
+    # Find insertion point: before </body>
+    body_close_idx = content.rfind('</body>')
+    if body_close_idx == -1:
+        return content, 'skipped', 'no </body> tag'
+
+    # Insert the script tag before </body>
+    indent = '    '
+    new_content = (
+        content[:body_close_idx] +
+        f'\n{indent}<!-- Sidebar Click Animation -->\n'
+        f'{indent}{SCRIPT_TAG}\n'
+        + content[body_close_idx:]
+    )
+    return new_content, 'applied', None
+
+
+def skip_dir(rel_dir, name):
+    parts = rel_dir.split(os.sep)
+    # modules/<module_name>
+    if len(parts) == 2 and parts[1] in SKIP_MODULES:
+        return True
+    return name in SKIP_DIRS or name.startswith('_backup')
+
+
+engine = PatchEngine(BASE)
+engine.register('sidebar-click-animation', inject_sidebar_animation)
+report = engine.run(engine.iter_files('modules', skip_dirs=set(), skip_dir=skip_dir))
+
+statuses = report.by_status('sidebar-click-animation')
+injected_files = [f for f, _ in statuses.get('applied', [])]
+already_has = [f for f, _ in statuses.get('already', [])]
+no_sidebar = [f for f, _ in statuses.get('no-sidebar', [])]
+skipped_files = statuses.get('skipped', [])
+errors = report.errors
+unchanged = report.unchanged
 
 print(f"=== SIDEBAR ANIMATION INJECTION REPORT ===")
 print(f"\n✅ INJECTED ({len(injected_files)} files):")
@@ -120,4 +96,4 @@ if errors:
     for f, err in sorted(errors):
         print(f"   {f} — {err}")
 
-print(f"\n📊 TOTALS: {len(injected_files)} injected, {len(already_has)} already had, {len(no_sidebar)} no sidebar, {len(skipped_files)} skipped, {len(errors)} errors")
+print(f"\n📊 TOTALS: {len(injected_files)} injected, {len(already_has)} already had, {len(no_sidebar)} no sidebar, {len(skipped_files)} skipped, {len(errors)} errors, {len(unchanged)} unchanged since last run")
@@ -1,55 +1,37 @@
 #!/usr/bin/env python3
-"""Inject sidebar-click-animation.js into RH module HTML files."""
+"""Inject sidebar-click-animation.js into RH module HTML files (via html_patch_engine)."""
 import os
 
+from html_patch_engine import PatchEngine
+
 BASE = r"g:\Outros computadores\Meu laptop (2)\Sistema - ALUFORCE - V.2"
 RH_DIR = os.path.join(BASE, "modules", "RH")
 SCRIPT_TAG = '<script src="/js/sidebar-click-animation.js?v=20260224"></script>'
 
 SKIP_DIRS = {'node_modules', 'screenshots', 'logs', 'tmp', 'patches', 'migrations', '.github', '.vscode', 'cloud-init', 'scripts'}
 
-injected = []
-already = []
-no_sidebar = []
-errors = []
 
-for root, dirs, files in os.walk(RH_DIR):
-    dirs[:] = [d for d in dirs if d not in SKIP_DIRS]
-    for fname in files:
-        if not fname.endswith('.html'):
-            continue
-        filepath = os.path.join(root, fname)
-        rel = os.path.relpath(filepath, BASE)
-        try:
-            content = None
-            enc = None
-            for e in ['utf-8', 'latin-1', 'cp1252']:
-                try:
-                    with open(filepath, 'r', encoding=e) as f:
-                        content = f.read()
-                    enc = e
-                    break
-                except UnicodeDecodeError:
-                    continue
-            if content is None:
-                errors.append((rel, 'decode error'))
-                continue
-            if 'class="sidebar"' not in content:
-                no_sidebar.append(rel)
-                continue
-            if 'sidebar-click-animation.js' in content:
-                already.append(rel)
-                continue
-            idx = content.rfind('</body>')
-            if idx == -1:
-                no_sidebar.append(rel)
-                continue
-            new_content = content[:idx] + '\n    <!-- Sidebar Click Animation -->\n    ' + SCRIPT_TAG + '\n' + content[idx:]
-            with open(filepath, 'w', encoding=enc) as f:
-                f.write(new_content)
-            injected.append(rel)
-        except Exception as ex:
-            errors.append((rel, str(ex)))
+def inject(content, rel_path):
+    if 'class="sidebar"' not in content:
+        return content, 'no-sidebar', None
+    if 'sidebar-click-animation.js' in content:
+        return content, 'already', None
+    idx = content.rfind('</body>')
+    if idx == -1:
+        return content, 'no-sidebar', None
+    new_content = content[:idx] + '\n    <!-- Sidebar Click Animation -->\n    ' + SCRIPT_TAG + '\n' + content[idx:]
+    return new_content, 'applied', None
+
+
+engine = PatchEngine(BASE)
+engine.register('sidebar-click-animation-rh', inject)
+report = engine.run(engine.iter_files(os.path.relpath(RH_DIR, BASE), skip_dirs=SKIP_DIRS))
+
+statuses = report.by_status('sidebar-click-animation-rh')
+injected = [f for f, _ in statuses.get('applied', [])]
+already = [f for f, _ in statuses.get('already', [])]
+no_sidebar = [f for f, _ in statuses.get('no-sidebar', [])]
+errors = report.errors
 
 print(f"=== RH MODULE INJECTION ===")
 print(f"\n✅ INJECTED ({len(injected)}):")
@@ -63,4 +45,4 @@ if no_sidebar:
 if errors:
     print(f"\n❌ ERRORS ({len(errors)}):")
     for f,e in sorted(errors): print(f"   {f} — {e}")
-print(f"\n📊 {len(injected)} injected, {len(already)} already, {len(no_sidebar)} no sidebar, {len(errors)} errors")
+print(f"\n📊 {len(injected)} injected, {len(already)} already, {len(no_sidebar)} no sidebar, {len(errors)} errors, {len(report.unchanged)} unchanged since last run")
@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""
+Prometheus textfile metrics for the Python import and generation jobs.
+
+    metrics = JobMetrics('convert_csv_to_sql')
+    with metrics:
+        ...
+        with metrics.batch():
+            write_batch(rows)
+        metrics.add(read=n, written=ok, rejected=n - ok)
+
+On exit the job writes <dir>/<job>.prom in the Prometheus text exposition
+format, atomically (temp file + rename), so node-exporter's textfile
+collector never reads a half-written file. The directory comes from the
+``directory`` argument or the ZYNTRA_METRICS_DIR environment variable; with
+neither set the object only counts and nothing is written, so the scripts
+behave exactly as before.
+
+Counters (rows read/written/rejected, runs, batch latency histogram) are
+cumulative: each run adds to the values already in the job's .prom file, so
+rate() and histogram_quantile() work across runs. The zyntra_job_last_*
+gauges describe the most recent run only. One file per job name; two
+concurrent runs of the same job would lose one run's increments.
+
+Exported series (all labelled {job="..."}):
+
+    zyntra_job_rows_read_total           records considered
+    zyntra_job_rows_written_total        records emitted (INSERTs)
+    zyntra_job_rows_rejected_total       records refused by validation
+    zyntra_job_runs_total{status}        runs by outcome (success|failure)
+    zyntra_job_batch_duration_seconds    histogram of committed batches
+    zyntra_job_last_duration_seconds     wall time of the last run
+    zyntra_job_last_peak_rss_bytes       peak resident set size of the last run
+    zyntra_job_last_rows_per_second      rows written / duration, last run
+    zyntra_job_last_run_timestamp_seconds
+    zyntra_job_last_success_timestamp_seconds
+"""
+
+import os
+import re
+import sys
+import time
+from contextlib import contextmanager
+
+from html_patch_engine import atomic_write
+
+ENV_DIR = 'ZYNTRA_METRICS_DIR'
+PREFIX = 'zyntra_job_'
+BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+_SAMPLE = re.compile(r'^([a-zA-Z_:][a-zA-Z0-9_:]*)(\{[^}]*\})?\s+(\S+)$')
+
+_HELP = {
+    'rows_read_total': ('counter', 'Records considered by the job.'),
+    'rows_written_total': ('counter', 'Records emitted by the job.'),
+    'rows_rejected_total': ('counter', 'Records refused by validation.'),
+    'runs_total': ('counter', 'Job runs by outcome.'),
+    'batch_duration_seconds': ('histogram', 'Time to write and commit one batch.'),
+    'last_duration_seconds': ('gauge', 'Wall time of the last run.'),
+    'last_peak_rss_bytes': ('gauge', 'Peak resident set size of the last run.'),
+    'last_rows_per_second': ('gauge', 'Rows written per second in the last run.'),
+    'last_run_timestamp_seconds': ('gauge', 'Unix time the last run finished.'),
+    'last_success_timestamp_seconds': ('gauge', 'Unix time of the last successful run.'),
+}
+
+
+def peak_rss_bytes():
+    """Peak resident set size of this process, or None if unavailable."""
+    try:
+        import resource
+    except ImportError:
+        return _windows_peak_rss()
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def _windows_peak_rss():
+    try:
+        import ctypes
+        from ctypes import wintypes
+
+        class Counters(ctypes.Structure):
+            _fields_ = [('cb', wintypes.DWORD), ('PageFaultCount', wintypes.DWORD),
+                        ('PeakWorkingSetSize', ctypes.c_size_t), ('WorkingSetSize', ctypes.c_size_t),
+                        ('QuotaPeakPagedPoolUsage', ctypes.c_size_t), ('QuotaPagedPoolUsage', ctypes.c_size_t),
+                        ('QuotaPeakNonPagedPoolUsage', ctypes.c_size_t), ('QuotaNonPagedPoolUsage', ctypes.c_size_t),
+                        ('PagefileUsage', ctypes.c_size_t), ('PeakPagefileUsage', ctypes.c_size_t)]
+
+        counters = Counters()
+        counters.cb = ctypes.sizeof(counters)
+        process = ctypes.windll.kernel32.GetCurrentProcess()
+        if ctypes.windll.psapi.GetProcessMemoryInfo(process, ctypes.byref(counters), counters.cb):
+            return counters.PeakWorkingSetSize
+    except (AttributeError, OSError):
+        pass
+    return None
+
+
+def parse_textfile(text):
+    """{(name, labels): value} for the samples of a .prom file."""
+    samples = {}
+    for line in text.splitlines():
+        match = _SAMPLE.match(line.strip())
+        if match:
+            samples[(match.group(1), match.group(2) or '')] = float(match.group(3))
+    return samples
+
+
+def _fmt(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) and not value.is_integer() else str(int(value))
+
+
+class JobMetrics:
+    """Counts rows and batch latencies for one job and writes them as a .prom file."""
+
+    def __init__(self, job, directory=None):
+        self.job = job
+        self.directory = directory or os.environ.get(ENV_DIR) or None
+        self.rows = {'read': 0, 'written': 0, 'rejected': 0}
+        self.buckets = [0] * len(BUCKETS)
+        self.batch_count = 0
+        self.batch_sum = 0.0
+        self.failed = False
+        self.duration = None
+        self._start = None
+
+    @property
+    def enabled(self):
+        return self.directory is not None
+
+    @property
+    def path(self):
+        return os.path.join(self.directory, f'{self.job}.prom') if self.enabled else None
+
+    def add(self, read=0, written=0, rejected=0):
+        self.rows['read'] += read
+        self.rows['written'] += written
+        self.rows['rejected'] += rejected
+
+    def observe_batch(self, seconds):
+        self.batch_count += 1
+        self.batch_sum += seconds
+        for i, bound in enumerate(BUCKETS):
+            if seconds <= bound:
+                self.buckets[i] += 1
+
+    @contextmanager
+    def batch(self):
+        """Time the enclosed block as one batch."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe_batch(time.perf_counter() - start)
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            self.failed = True
+        self.duration = time.perf_counter() - self._start
+        self.write()
+        return False
+
+    def render(self, previous=None, now=None):
+        """Prometheus text for this run, added to the counters in ``previous``."""
+        previous = previous or {}
+        now = time.time() if now is None else now
+        job = self.job.replace('\\', '\\\\').replace('"', '\\"')
+        lines = []
+
+        def sample(metric, value, labels='', cumulative=True):
+            name = PREFIX + metric
+            label_text = '{job="%s"%s}' % (job, labels)
+            if cumulative:
+                value += previous.get((name, label_text), 0)
+            lines.append(f'{name}{label_text} {_fmt(value)}')
+
+        def header(metric):
+            kind, help_text = _HELP[metric]
+            lines.append(f'# HELP {PREFIX}{metric} {help_text}')
+            lines.append(f'# TYPE {PREFIX}{metric} {kind}')
+
+        for kind in ('read', 'written', 'rejected'):
+            header(f'rows_{kind}_total')
+            sample(f'rows_{kind}_total', self.rows[kind])
+
+        header('runs_total')
+        sample('runs_total', 0 if self.failed else 1, ',status="success"')
+        sample('runs_total', 1 if self.failed else 0, ',status="failure"')
+
+        header('batch_duration_seconds')
+        for bound, count in zip(BUCKETS, self.buckets):
+            sample('batch_duration_seconds_bucket', count, f',le="{_fmt(bound)}"')
+        sample('batch_duration_seconds_bucket', self.batch_count, ',le="+Inf"')
+        sample('batch_duration_seconds_sum', round(self.batch_sum, 6))
+        sample('batch_duration_seconds_count', self.batch_count)
+
+        duration = self.duration or 0.0
+        header('last_duration_seconds')
+        sample('last_duration_seconds', round(duration, 6), cumulative=False)
+        peak = peak_rss_bytes()
+        if peak is not None:
+            header('last_peak_rss_bytes')
+            sample('last_peak_rss_bytes', peak, cumulative=False)
+        header('last_rows_per_second')
+        sample('last_rows_per_second', round(self.rows['written'] / duration, 3) if duration else 0,
+               cumulative=False)
+        header('last_run_timestamp_seconds')
+        sample('last_run_timestamp_seconds', int(now), cumulative=False)
+
+        last_success = previous.get((PREFIX + 'last_success_timestamp_seconds', '{job="%s"}' % job))
+        if not self.failed:
+            last_success = int(now)
+        if last_success is not None:
+            header('last_success_timestamp_seconds')
+            sample('last_success_timestamp_seconds', last_success, cumulative=False)
+        return '\n'.join(lines) + '\n'
+
+    def write(self):
+        """Merge this run into <dir>/<job>.prom; returns the path, or None when disabled."""
+        if not self.enabled:
+            return None
+        path = os.path.abspath(self.path)
+        try:
+            with open(path, encoding='utf-8') as f:
+                previous = parse_textfile(f.read())
+        except OSError:
+            previous = {}
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        atomic_write(path, self.render(previous).encode('utf-8'))
+        return path
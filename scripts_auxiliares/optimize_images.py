@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+Batch image optimizer: resized, progressive JPEG and WebP renditions.
+
+Employee photos (fotos para importar/), images/ and the logos in
+public/images/ are served at full size. For every source image this writes,
+for each width in --widths not larger than the original:
+
+    public/images/optimized/<name>-<width>w.<hash>.<settings>.webp   WebP (alpha kept)
+    public/images/optimized/<name>-<width>w.<hash>.<settings>.jpg    progressive JPEG, or
+    public/images/optimized/<name>-<width>w.<hash>.<settings>.png    optimized PNG for images with transparency
+
+<hash> is the first 10 hex digits of the source's sha256 and <settings> the
+first 6 of the sha256 of the settings key (pipeline version, widths,
+qualities), so a URL always serves the same bytes and can be cached as
+immutable; new settings write new URLs. EXIF
+orientation is applied and metadata is stripped. Every rendition is
+re-encoded, including a full-size one that comes out larger than its
+source, so none of them carries the source's EXIF/GPS data.
+
+Images are processed in a process pool. manifest.json (next to the outputs)
+records each source's hash and the settings used: unchanged sources are
+skipped, and renditions of a replaced source are deleted (a source that
+fails to decode keeps its previous renditions). Pages can build
+responsive markup straight from it:
+
+    "srcset": {"webp": "/images/optimized/logo-320w.<hash>.<settings>.webp 320w, ...", "jpeg": "..."}
+
+Usage:
+    python optimize_images.py [paths...] [--widths 320,640,1024,1600] [--jpeg-quality 82] [--webp-quality 80]
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+import unicodedata
+from concurrent.futures import ProcessPoolExecutor
+
+from PIL import Image, ImageOps
+
+from html_patch_engine import atomic_write, iter_files
+
+DEFAULT_PATHS = ('fotos para importar', 'images', 'public/images')
+OUTPUT_DIR = 'public/images/optimized'
+URL_PREFIX = '/images/optimized/'
+MANIFEST_NAME = 'manifest.json'
+SUFFIXES = ('.jpg', '.jpeg', '.png', '.webp')
+SKIP_DIRS = {'optimized', 'node_modules', '.git', 'uploads', 'avatars'}
+WIDTHS = (320, 640, 1024, 1600)
+JPEG_QUALITY = 82
+WEBP_QUALITY = 80
+PIPELINE_VERSION = 1
+HASH_LENGTH = 10
+SETTINGS_HASH_LENGTH = 6
+
+
+def slugify(rel_path):
+    """'fotos para importar/João Vitor.jpeg' -> 'joao-vitor'"""
+    stem = os.path.splitext(os.path.basename(rel_path))[0]
+    ascii_stem = unicodedata.normalize('NFKD', stem).encode('ascii', 'ignore').decode('ascii')
+    return re.sub(r'[^a-z0-9]+', '-', ascii_stem.lower()).strip('-') or 'image'
+
+
+def settings_key(widths, jpeg_quality, webp_quality):
+    return f'v{PIPELINE_VERSION}:w={",".join(map(str, widths))}:jq={jpeg_quality}:wq={webp_quality}'
+
+
+def _has_alpha(img):
+    if img.mode in ('RGBA', 'LA'):
+        return img.getchannel('A').getextrema()[0] < 255
+    return img.mode == 'P' and 'transparency' in img.info
+
+
+def optimize_image(root, rel_path, digest, slug, widths, jpeg_quality, webp_quality):
+    """Write every rendition of one image. Runs in a worker process."""
+    source = os.path.join(root, rel_path)
+    with Image.open(source) as opened:
+        img = ImageOps.exif_transpose(opened)
+        alpha = _has_alpha(img)
+        img = img.convert('RGBA' if alpha else 'RGB')
+
+    settings = settings_key(widths, jpeg_quality, webp_quality)
+    version = f'{digest[:HASH_LENGTH]}.{hashlib.sha256(settings.encode()).hexdigest()[:SETTINGS_HASH_LENGTH]}'
+    out_dir = os.path.join(root, OUTPUT_DIR)
+    os.makedirs(out_dir, exist_ok=True)
+    targets = sorted({w for w in widths if w < img.width} | {min(img.width, max(widths))})
+    variants = []
+    for width in targets:
+        height = max(1, round(img.height * width / img.width))
+        resized = img if width == img.width else img.resize((width, height), Image.LANCZOS)
+        formats = [('webp', {'quality': webp_quality, 'method': 4})]
+        if alpha:
+            formats.append(('png', {'optimize': True}))
+        else:
+            formats.append(('jpeg', {'quality': jpeg_quality, 'progressive': True, 'optimize': True}))
+        for fmt, options in formats:
+            ext = 'jpg' if fmt == 'jpeg' else fmt
+            name = f'{slug}-{width}w.{version}.{ext}'
+            target = os.path.join(out_dir, name)
+            resized.save(target, fmt.upper(), **options)
+            variants.append({
+                'format': fmt, 'width': width, 'height': height,
+                'url': URL_PREFIX + name, 'bytes': os.path.getsize(target),
+            })
+    return {'width': img.width, 'height': img.height, 'alpha': alpha, 'variants': variants}
+
+
+def srcset(variants):
+    by_format = {}
+    for v in sorted(variants, key=lambda v: v['width']):
+        by_format.setdefault(v['format'], []).append(f"{v['url']} {v['width']}w")
+    return {fmt: ', '.join(entries) for fmt, entries in by_format.items()}
+
+
+def load_manifest(path):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f).get('images', {})
+    except (OSError, ValueError):
+        return {}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Generate resized JPEG/WebP renditions and a srcset manifest')
+    parser.add_argument('paths', nargs='*', default=list(DEFAULT_PATHS),
+                        help='directories relative to --root (default: %(default)s)')
+    parser.add_argument('--root', default=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    parser.add_argument('--widths', default=','.join(map(str, WIDTHS)), help='comma separated widths')
+    parser.add_argument('--jpeg-quality', type=int, default=JPEG_QUALITY)
+    parser.add_argument('--webp-quality', type=int, default=WEBP_QUALITY)
+    parser.add_argument('--force', action='store_true', help='rebuild every image')
+    parser.add_argument('--workers', type=int, default=None)
+    args = parser.parse_args(argv)
+
+    root = os.path.abspath(args.root)
+    widths = tuple(sorted({int(w) for w in args.widths.split(',') if w.strip()}))
+    settings = settings_key(widths, args.jpeg_quality, args.webp_quality)
+    out_dir = os.path.join(root, OUTPUT_DIR)
+    manifest_path = os.path.join(out_dir, MANIFEST_NAME)
+    previous = {} if args.force else load_manifest(manifest_path)
+
+    sources = []
+    for path in args.paths:
+        sources.extend(iter_files(root, path, suffixes=SUFFIXES + tuple(s.upper() for s in SUFFIXES),
+                                  skip_dirs=SKIP_DIRS))
+
+    images = {}
+    todo = []
+    slugs = {}
+    for rel in sources:
+        key = rel.replace(os.sep, '/')
+        with open(os.path.join(root, rel), 'rb') as f:
+            digest = hashlib.sha256(f.read()).hexdigest()
+        slug = slugify(rel)
+        # Same name in two source folders: keep both apart
+        if slugs.setdefault(slug, key) != key:
+            slug = f'{slug}-{hashlib.sha1(key.encode("utf-8")).hexdigest()[:6]}'
+        entry = previous.get(key)
+        if (entry and entry.get('sha256') == digest and entry.get('settings') == settings
+                and all(os.path.isfile(os.path.join(root, 'public', v['url'].lstrip('/')))
+                        for v in entry['variants'])):
+            images[key] = entry
+            continue
+        todo.append((rel, key, digest, slug))
+
+    failed = []
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        futures = {key: pool.submit(optimize_image, root, rel, digest, slug, widths,
+                                    args.jpeg_quality, args.webp_quality)
+                   for rel, key, digest, slug in todo}
+        for (rel, key, digest, _), future in zip(todo, futures.values()):
+            try:
+                result = future.result()
+            except Exception as e:
+                failed.append((key, str(e)))
+                if key in previous:
+                    # Keep serving the last good renditions until the source decodes
+                    images[key] = previous[key]
+                continue
+            result.update({'sha256': digest, 'settings': settings,
+                           'source_bytes': os.path.getsize(os.path.join(root, rel)),
+                           'srcset': srcset(result['variants'])})
+            images[key] = result
+
+    # Renditions no longer referenced (source replaced or removed)
+    keep = {v['url'] for entry in images.values() for v in entry['variants']}
+    stale = [v['url'] for entry in previous.values() for v in entry.get('variants', []) if v['url'] not in keep]
+    for url in stale:
+        try:
+            os.remove(os.path.join(root, 'public', url.lstrip('/')))
+        except FileNotFoundError:
+            pass
+
+    os.makedirs(out_dir, exist_ok=True)
+    payload = {'settings': settings, 'images': dict(sorted(images.items()))}
+    atomic_write(manifest_path, (json.dumps(payload, indent=2, ensure_ascii=False) + '\n').encode('utf-8'))
+
+    print(f"=== IMAGE OPTIMIZATION ===")
+    failed_keys = {key for key, _ in failed}
+    built = [key for _, key, _, _ in todo if key in images and key not in failed_keys]
+    print(f"\n✅ OPTIMIZED ({len(built)}):")
+    for key in built:
+        entry = images[key]
+        largest = max(v['width'] for v in entry['variants'])
+        sizes = ', '.join(f"{v['format']} {v['bytes'] / 1024:,.0f} KB"
+                          for v in entry['variants'] if v['width'] == largest)
+        print(f"   {entry['source_bytes'] / 1024:8,.0f} KB -> {sizes} at {largest}px "
+              f"({len(entry['variants'])} files)  {key}")
+    if failed:
+        print(f"\n❌ ERRORS ({len(failed)}):")
+        for key, err in failed:
+            print(f"   {key} — {err}")
+    print(f"\n📊 {len(sources)} images, {len(built)} optimized, {len(sources) - len(todo)} unchanged, "
+          f"{len(stale)} stale renditions removed, manifest: {OUTPUT_DIR}/{MANIFEST_NAME}")
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
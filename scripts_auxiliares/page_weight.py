@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+Page-weight budget analyzer for every HTML page of the app.
+
+Each page is parsed once for its <script src>, <link rel=stylesheet href>
+and <img src> references, which are resolved to files on disk the way
+server.js serves them (asset_paths). The transfer size of a page is its own
+HTML plus every distinct asset it references, both raw and gzipped:
+
+    gzip size  - the prebuilt .gz sibling if present (gzip_static), else the
+                 size at nginx's gzip_comp_level; formats nginx does not
+                 compress (jpg, png, woff2, ...) count at their raw size.
+
+Pages over --budget-kb (gzipped) are flagged, and shared assets are ranked
+by the bytes they add across all pages (gzip size x pages using them), which
+is where minifying, bundling or caching pays off most.
+
+Results are cached in .page-weight-cache.json: files are re-hashed only
+when their mtime/size change, and gzip sizes and parsed references are
+keyed by content hash, so reruns only do work for what changed.
+
+Usage:
+    python page_weight.py [paths...] [--budget-kb 500] [--top 25] [--json report.json]
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+import threading
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+
+from asset_paths import resolve_asset
+from html_patch_engine import atomic_write, decode_bytes, iter_files
+
+DEFAULT_PATHS = ('public', 'modules', 'ajuda')
+SKIP_DIRS = {'node_modules', '.git', '__pycache__', 'uploads', 'avatars',
+             '_backup', 'backup', 'Backup', '_backups'}
+CACHE_FILENAME = '.page-weight-cache.json'
+CACHE_VERSION = 1
+GZIP_LEVEL = 6          # deploy/nginx.conf gzip_comp_level
+BUDGET_KB = 500
+COMPRESSIBLE = ('.html', '.htm', '.js', '.css', '.json', '.svg', '.txt', '.xml', '.map')
+
+TAG_RE = re.compile(r'<(script|link|img)\b([^>]*)>', re.IGNORECASE)
+COMMENT_RE = re.compile(r'<!--.*?-->', re.DOTALL)
+ATTR_RE = re.compile(r'\b(src|href|rel)\s*=\s*(["\'])(.*?)\2', re.IGNORECASE | re.DOTALL)
+
+
+def parse_refs(content):
+    """Return [(kind, url)] for the scripts, stylesheets and images of a page."""
+    content = COMMENT_RE.sub('', content)
+    refs = []
+    for tag, attrs in TAG_RE.findall(content):
+        values = {name.lower(): value.strip() for name, _, value in ATTR_RE.findall(attrs)}
+        tag = tag.lower()
+        if tag == 'script' and values.get('src'):
+            refs.append(('script', values['src']))
+        elif tag == 'link' and 'stylesheet' in values.get('rel', '').lower() and values.get('href'):
+            refs.append(('style', values['href']))
+        elif tag == 'img' and values.get('src'):
+            refs.append(('image', values['src']))
+    return refs
+
+
+def gzip_size(data):
+    compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)
+    return len(compressor.compress(data) + compressor.flush())
+
+
+class SizeCache:
+    """Persistent cache: file stat -> content hash, content hash -> sizes and page refs."""
+
+    def __init__(self, root):
+        self.path = os.path.join(root, CACHE_FILENAME)
+        self.root = root
+        self.files = {}     # rel -> [mtime_ns, size, sha256]
+        self.sizes = {}     # sha256 -> gzip size
+        self.pages = {}     # sha256 -> [[kind, url], ...]
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == CACHE_VERSION:
+                self.files, self.sizes, self.pages = data['files'], data['sizes'], data['pages']
+        except (OSError, ValueError, KeyError):
+            pass
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    def save(self):
+        data = {'version': CACHE_VERSION, 'files': self.files, 'sizes': self.sizes, 'pages': self.pages}
+        atomic_write(self.path, json.dumps(data, separators=(',', ':')).encode('utf-8'))
+
+    def stat(self, rel):
+        """Return {'raw', 'gzip', 'sha256'} for a file, reading it only when it changed."""
+        filepath = os.path.join(self.root, rel)
+        st = os.stat(filepath)
+        known = self.files.get(rel)
+        data = None
+        if known and known[0] == st.st_mtime_ns and known[1] == st.st_size:
+            digest = known[2]
+        else:
+            with open(filepath, 'rb') as f:
+                data = f.read()
+            digest = hashlib.sha256(data).hexdigest()
+            with self.lock:
+                self.files[rel] = [st.st_mtime_ns, st.st_size, digest]
+
+        with self.lock:
+            compressed = self.sizes.get(digest)
+            if compressed is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        if compressed is None:
+            if not rel.lower().endswith(COMPRESSIBLE):
+                compressed = st.st_size
+            elif os.path.isfile(filepath + '.gz'):
+                compressed = os.path.getsize(filepath + '.gz')
+            else:
+                if data is None:
+                    with open(filepath, 'rb') as f:
+                        data = f.read()
+                compressed = gzip_size(data)
+            with self.lock:
+                self.sizes[digest] = compressed
+        return {'raw': st.st_size, 'gzip': compressed, 'sha256': digest}
+
+    def refs(self, rel, digest):
+        if digest not in self.pages:
+            with open(os.path.join(self.root, rel), 'rb') as f:
+                content, _ = decode_bytes(f.read())
+            self.pages[digest] = [list(ref) for ref in parse_refs(content)]
+        return self.pages[digest]
+
+
+def analyze(root, pages, workers=None):
+    """Return (page_reports, asset_stats, unresolved_refs, cache) for the given page paths."""
+    cache = SizeCache(root)
+
+    def page_info(rel):
+        info = cache.stat(rel)
+        resolved = []
+        missing = []
+        for kind, url in cache.refs(rel, info['sha256']):
+            asset = resolve_asset(root, url, rel)
+            if asset:
+                resolved.append((kind, asset))
+            elif not url.startswith(('http:', 'https:', '//', 'data:')) and '${' not in url:
+                missing.append(url)
+        return rel, info, resolved, missing
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        parsed = list(pool.map(page_info, pages))
+        assets = sorted({asset for _, _, resolved, _ in parsed for _, asset in resolved})
+        asset_info = dict(zip(assets, pool.map(cache.stat, assets)))
+    cache.save()
+
+    reports = []
+    usage = {}
+    missing_refs = {}
+    for rel, info, resolved, missing in parsed:
+        seen = {}
+        for kind, asset in resolved:
+            seen.setdefault(asset, kind)
+        by_kind = {}
+        raw, gz = info['raw'], info['gzip']
+        for asset, kind in seen.items():
+            a = asset_info[asset]
+            raw += a['raw']
+            gz += a['gzip']
+            totals = by_kind.setdefault(kind, [0, 0])
+            totals[0] += a['raw']
+            totals[1] += a['gzip']
+            usage.setdefault(asset, []).append(rel)
+        for url in missing:
+            missing_refs.setdefault(rel, []).append(url)
+        reports.append({
+            'page': rel,
+            'html': {'raw': info['raw'], 'gzip': info['gzip']},
+            'by_kind': {k: {'raw': v[0], 'gzip': v[1]} for k, v in sorted(by_kind.items())},
+            'assets': len(seen),
+            'raw': raw,
+            'gzip': gz,
+        })
+    reports.sort(key=lambda r: -r['gzip'])
+
+    stats = []
+    for asset, used_by in usage.items():
+        a = asset_info[asset]
+        stats.append({
+            'asset': asset, 'pages': len(used_by), 'raw': a['raw'], 'gzip': a['gzip'],
+            'total_gzip': a['gzip'] * len(used_by),
+        })
+    stats.sort(key=lambda s: (-s['total_gzip'], s['asset']))
+    return reports, stats, missing_refs, cache
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Per-page transfer size and budget report')
+    parser.add_argument('paths', nargs='*', default=list(DEFAULT_PATHS),
+                        help='directories relative to --root (default: %(default)s)')
+    parser.add_argument('--root', default=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    parser.add_argument('--budget-kb', type=float, default=BUDGET_KB, help='gzipped budget per page')
+    parser.add_argument('--top', type=int, default=25, help='rows per section')
+    parser.add_argument('--json', metavar='FILE', help='also write the full report as JSON')
+    parser.add_argument('--workers', type=int, default=None)
+    args = parser.parse_args(argv)
+
+    root = os.path.abspath(args.root)
+    pages = list(iter_files(root, *args.paths, suffixes=('.html', '.htm'), skip_dirs=SKIP_DIRS))
+    reports, stats, missing, cache = analyze(root, pages, args.workers)
+    budget = int(args.budget_kb * 1024)
+    over = [r for r in reports if r['gzip'] > budget]
+
+    kb = lambda n: f"{n / 1024:,.0f} KB"
+    print(f"=== PAGE WEIGHT REPORT (budget {kb(budget)} gzipped) ===")
+    print(f"\n⚖️ HEAVIEST {min(args.top, len(reports))} PAGES (raw / gzipped):")
+    for r in reports[:args.top]:
+        flag = '❌' if r['gzip'] > budget else '  '
+        print(f"   {flag} {kb(r['raw']):>10} / {kb(r['gzip']):>9}  {r['assets']:3d} assets  {r['page']}")
+
+    print(f"\n🔁 SHARED ASSETS BY TOTAL BYTES ACROSS PAGES (gzipped size x pages):")
+    for s in [s for s in stats if s['pages'] > 1][:args.top]:
+        print(f"   {kb(s['total_gzip']):>10}  {kb(s['gzip']):>8} x {s['pages']:3d} pages  {s['asset']}")
+
+    if missing:
+        count = sum(len(v) for v in missing.values())
+        print(f"\n⚠️ UNRESOLVED LOCAL REFERENCES ({count} on {len(missing)} pages), first {args.top}:")
+        for page, urls in sorted(missing.items())[:args.top]:
+            print(f"   {page}: {', '.join(sorted(set(urls))[:5])}")
+
+    if args.json:
+        payload = {'budget_bytes': budget, 'pages': reports, 'shared_assets': stats, 'unresolved': missing}
+        atomic_write(os.path.abspath(args.json),
+                     (json.dumps(payload, indent=2, ensure_ascii=False) + '\n').encode('utf-8'))
+
+    total_gz = sum(r['gzip'] for r in reports)
+    print(f"\n📊 {len(reports)} pages, {len(stats)} assets, {len(over)} over budget, "
+          f"{kb(total_gz)} gzipped in total; cache: {cache.hits} hits, {cache.misses} misses")
+    return 1 if over else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+"""
+Declarative multi-pattern patch runner (replaces fix1..fix6, fix-auth-token
+and scripts/fix-timeout.py).
+
+Patch sets live in JSON specs (see patches/*.json):
+
+    {
+      "description": "...",
+      "files": [
+        {
+          "path": "public/js/user-dropdown.js",
+          "encoding": "utf-8-sig",
+          "patches": [
+            {"id": "fix2-api-me-tab-token", "find": "...", "replace": "...",
+             "count": 1, "marker": "...", "optional": false}
+          ]
+        }
+      ]
+    }
+
+For each file one Aho-Corasick automaton is built from every "find" text
+and every idempotency marker, so a single scan of the file finds all of
+them. A patch is reported as:
+
+    applied    - n occurrences replaced (count: null replaces all)
+    already    - its marker is present (default marker: the replace text)
+                 count times, or with count: null, no unpatched occurrence
+                 is left
+    not-found  - neither find nor marker present (ignored when optional)
+
+Files are handled in parallel, read once and written once. With --dry-run
+nothing is written and a unified diff is printed instead.
+
+Usage:
+    python patch_runner.py patches/v7.3-tab-token.json --root /var/www/aluforce [--dry-run]
+"""
+
+import argparse
+import difflib
+import json
+import os
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from html_patch_engine import atomic_write
+
+DEFAULT_ROOT = '/var/www/aluforce'
+BOM = b'\xef\xbb\xbf'
+
+
+class AhoCorasick:
+    """Aho-Corasick automaton over str patterns.
+
+    ``search(text)`` yields ``(start, end, key)`` for every occurrence of
+    every pattern, overlapping ones included, in a single pass over text.
+    """
+
+    def __init__(self, patterns):
+        # patterns: iterable of (pattern, key)
+        self.goto = [{}]
+        self.fail = [0]
+        self.out = [[]]
+        for pattern, key in patterns:
+            if not pattern:
+                continue
+            state = 0
+            for ch in pattern:
+                nxt = self.goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(self.goto)
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.out.append([])
+                    self.goto[state][ch] = nxt
+                state = nxt
+            self.out[state].append((len(pattern), key))
+        self._build_failure_links()
+
+    def _build_failure_links(self):
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self.goto[state].items():
+                queue.append(nxt)
+                f = self.fail[state]
+                while f and ch not in self.goto[f]:
+                    f = self.fail[f]
+                self.fail[nxt] = self.goto[f].get(ch, 0)
+                self.out[nxt] = self.out[nxt] + self.out[self.fail[nxt]]
+
+    def search(self, text):
+        goto, fail, out = self.goto, self.fail, self.out
+        state = 0
+        for i, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if out[state]:
+                for length, key in out[state]:
+                    yield i - length + 1, i + 1, key
+
+
+def load_spec(spec_path):
+    with open(spec_path, 'r', encoding='utf-8') as f:
+        spec = json.load(f)
+    for file_spec in spec.get('files', []):
+        for patch in file_spec.get('patches', []):
+            if 'id' not in patch or 'find' not in patch or 'replace' not in patch:
+                raise ValueError(f'{spec_path}: patch needs id, find and replace ({patch})')
+            if not patch['find']:
+                raise ValueError(f"{spec_path}: patch {patch['id']} has an empty find text")
+    return spec
+
+
+def merge_specs(specs):
+    """Group patches of several specs by target file, keeping spec order."""
+    merged = {}
+    for spec in specs:
+        for file_spec in spec.get('files', []):
+            target = merged.setdefault(file_spec['path'], {
+                'path': file_spec['path'],
+                'encoding': file_spec.get('encoding', 'utf-8'),
+                'patches': [],
+            })
+            target['patches'].extend(file_spec.get('patches', []))
+    return list(merged.values())
+
+
+def _count_disjoint(spans):
+    """Number of non-overlapping spans, taken leftmost first"""
+    count, pos = 0, 0
+    for start, end in sorted(spans):
+        if start >= pos:
+            count, pos = count + 1, end
+    return count
+
+
+def plan_patches(content, patches, crlf=False):
+    """Scan content once and return (new_content, statuses).
+
+    statuses is a list of (patch_id, status, occurrences).
+    """
+    def adapt(text):
+        return text.replace('\r\n', '\n').replace('\n', '\r\n') if crlf else text
+
+    finds = [adapt(p['find']) for p in patches]
+    replaces = [adapt(p['replace']) for p in patches]
+    markers = []
+    for p, replace in zip(patches, replaces):
+        marker = p.get('marker', replace)
+        markers.append(adapt(marker) if marker else None)
+
+    keys = [(finds[i], ('find', i)) for i in range(len(patches))]
+    keys += [(markers[i], ('marker', i)) for i in range(len(patches)) if markers[i]]
+    automaton = AhoCorasick(keys)
+
+    find_hits = [[] for _ in patches]
+    marker_spans = [[] for _ in patches]
+    for start, end, (kind, i) in automaton.search(content):
+        if kind == 'marker':
+            marker_spans[i].append((start, end))
+        else:
+            find_hits[i].append((start, end))
+
+    # Occurrences inside a marker (find text contained in the replacement)
+    # are already patched; a counted patch only needs count - markers more
+    statuses = [None] * len(patches)
+    quota = [None] * len(patches)
+    candidates = []
+    for i, patch in enumerate(patches):
+        spans = marker_spans[i]
+        hits = [(start, end) for start, end in find_hits[i]
+                if not any(m_start <= start and end <= m_end for m_start, m_end in spans)]
+        limit = patch.get('count', 1)
+        if limit is None:
+            if spans and not hits:
+                statuses[i] = 'already'
+                continue
+        else:
+            quota[i] = limit - _count_disjoint(spans)
+            if quota[i] <= 0:
+                statuses[i] = 'already'
+                continue
+        candidates.extend((start, -(end - start), end, i) for start, end in hits)
+
+    # Choose non-overlapping edits: leftmost first, longer match wins a tie.
+    # Counts are applied to the hits that survive, so a hit lost to another
+    # patch's overlapping match does not use up a count: 1 patch.
+    candidates.sort()
+    pieces = []
+    applied = [0] * len(patches)
+    pos = 0
+    for start, _, end, i in candidates:
+        if start < pos or (quota[i] is not None and applied[i] >= quota[i]):
+            continue
+        pieces.append(content[pos:start])
+        pieces.append(replaces[i])
+        applied[i] += 1
+        pos = end
+    pieces.append(content[pos:])
+
+    result = []
+    for i, patch in enumerate(patches):
+        status = statuses[i]
+        if status is None:
+            status = 'applied' if applied[i] else 'not-found'
+        if status == 'not-found' and patch.get('optional'):
+            status = 'skipped'
+        result.append((patch['id'], status, applied[i]))
+    return ''.join(pieces), result
+
+
+def run_file(root, file_spec, dry_run=False):
+    """Apply every patch of one file. Runs in a worker process."""
+    rel_path = file_spec['path']
+    filepath = os.path.join(root, rel_path)
+    report = {'path': rel_path, 'statuses': [], 'written': False, 'diff': '', 'error': None}
+    try:
+        with open(filepath, 'rb') as f:
+            raw = f.read()
+        encoding = file_spec.get('encoding', 'utf-8')
+        has_bom = raw.startswith(BOM)
+        content = raw.decode(encoding)
+        if encoding == 'utf-8' and has_bom:
+            content = content[1:]
+        crlf = '\r\n' in content
+        new_content, statuses = plan_patches(content, file_spec['patches'], crlf=crlf)
+        report['statuses'] = statuses
+        if new_content != content:
+            if dry_run:
+                report['diff'] = ''.join(difflib.unified_diff(
+                    content.splitlines(keepends=True), new_content.splitlines(keepends=True),
+                    fromfile=f'a/{rel_path}', tofile=f'b/{rel_path}'))
+            else:
+                data = new_content.encode('utf-8' if encoding == 'utf-8-sig' else encoding)
+                atomic_write(filepath, (BOM if has_bom else b'') + data)
+            report['written'] = True
+    except Exception as e:
+        report['error'] = str(e)
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Apply declarative patch sets in one pass per file')
+    parser.add_argument('specs', nargs='+', help='JSON patch set specs')
+    parser.add_argument('--root', default=DEFAULT_ROOT, help=f'installation root (default: {DEFAULT_ROOT})')
+    parser.add_argument('--dry-run', action='store_true', help='write nothing, print a unified diff')
+    parser.add_argument('--workers', type=int, default=None)
+    args = parser.parse_args(argv)
+
+    files = merge_specs(load_spec(p) for p in args.specs)
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        reports = list(pool.map(run_file, [args.root] * len(files), files, [args.dry_run] * len(files)))
+
+    icons = {'applied': '✅', 'already': '⏩', 'skipped': '⬜', 'not-found': '❌'}
+    failures = 0
+    for report in reports:
+        print(f"\n📄 {report['path']}")
+        if report['error']:
+            failures += 1
+            print(f"   ❌ ERROR: {report['error']}")
+            continue
+        for patch_id, status, count in report['statuses']:
+            suffix = f' ({count}x)' if status == 'applied' else ''
+            print(f"   {icons.get(status, '•')} {patch_id}: {status}{suffix}")
+            if status == 'not-found':
+                failures += 1
+        if report['diff']:
+            print(report['diff'])
+
+    total = sum(len(r['statuses']) for r in reports)
+    applied = sum(1 for r in reports for _, s, _ in r['statuses'] if s == 'applied')
+    mode = ' (dry-run)' if args.dry_run else ''
+    print(f"\n📊 {len(reports)} files, {total} patches, {applied} applied, {failures} failures{mode}")
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
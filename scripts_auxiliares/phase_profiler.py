@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Per-phase time and memory profiler for the conversion scripts.
+
+    profiler = PhaseProfiler('convert_csv_to_sql', source='contas.csv')
+    with profiler.phase('read'):
+        rows = list(reader)
+    ...
+    profiler.write('profile.json')
+
+For every phase it records wall time, CPU time, the tracemalloc peak
+reached while the phase ran (relative to the memory held when it started),
+the memory it left allocated, and the source lines that allocated the most
+of it (snapshot diff grouped by file:line). Tracing starts when the
+profiler is created and stops at write(); without a profiler the converters
+pay nothing.
+
+tracemalloc slows allocation-heavy code a lot (clean_date's strptime runs
+~25x slower), so times recorded with memory tracing on are only good for
+comparing runs made the same way. PhaseProfiler(..., memory=False) records
+undistorted wall/CPU times and leaves the memory fields null.
+
+The JSON report has a fixed shape so runs can be compared over time:
+
+    {"job": ..., "source": ..., "started": ..., "python": ...,
+     "memory": true|false, "total": {"wall_s", "cpu_s", "peak_bytes"},
+     "phases": [{"phase", "wall_s", "cpu_s", "peak_bytes", "retained_bytes",
+                 "top_allocations": [{"site", "size_bytes", "count"}]}]}
+"""
+
+import json
+import os
+import platform
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from datetime import datetime
+
+from html_patch_engine import atomic_write
+
+TOP_SITES = 10
+_IGNORE = (tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, __file__))
+
+
+class PhaseProfiler:
+    """Collects wall/CPU time and tracemalloc figures for named phases."""
+
+    def __init__(self, job, source=None, top=TOP_SITES, memory=True):
+        self.job = job
+        self.source = source
+        self.top = top
+        self.memory = memory
+        self.phases = []
+        self.started = datetime.now().isoformat(timespec='seconds')
+        self._own_tracing = memory and not tracemalloc.is_tracing()
+        if self._own_tracing:
+            tracemalloc.start()
+
+    @contextmanager
+    def phase(self, name):
+        if not self.memory:
+            wall = time.perf_counter()
+            cpu = time.process_time()
+            try:
+                yield
+            finally:
+                self.phases.append({
+                    'phase': name,
+                    'wall_s': round(time.perf_counter() - wall, 6),
+                    'cpu_s': round(time.process_time() - cpu, 6),
+                    'peak_bytes': None,
+                    'retained_bytes': None,
+                    'top_allocations': [],
+                })
+            return
+
+        before = tracemalloc.take_snapshot().filter_traces(_IGNORE)
+        tracemalloc.reset_peak()
+        start_mem = tracemalloc.get_traced_memory()[0]
+        wall = time.perf_counter()
+        cpu = time.process_time()
+        try:
+            yield
+        finally:
+            wall = time.perf_counter() - wall
+            cpu = time.process_time() - cpu
+            current, peak = tracemalloc.get_traced_memory()
+            after = tracemalloc.take_snapshot().filter_traces(_IGNORE)
+            sites = [s for s in after.compare_to(before, 'lineno') if s.size_diff > 0][:self.top]
+            self.phases.append({
+                'phase': name,
+                'wall_s': round(wall, 6),
+                'cpu_s': round(cpu, 6),
+                'peak_bytes': peak - start_mem,
+                'retained_bytes': current - start_mem,
+                'top_allocations': [{
+                    'site': f"{s.traceback[0].filename}:{s.traceback[0].lineno}",
+                    'size_bytes': s.size_diff,
+                    'count': s.count_diff,
+                } for s in sites],
+            })
+
+    def report(self):
+        return {
+            'job': self.job,
+            'source': self.source,
+            'started': self.started,
+            'python': platform.python_version(),
+            'memory': self.memory,
+            'total': {
+                'wall_s': round(sum(p['wall_s'] for p in self.phases), 6),
+                'cpu_s': round(sum(p['cpu_s'] for p in self.phases), 6),
+                'peak_bytes': max((p['peak_bytes'] for p in self.phases), default=0) if self.memory else None,
+            },
+            'phases': self.phases,
+        }
+
+    def write(self, path):
+        """Stop tracing (if this profiler started it) and write the JSON report."""
+        if self._own_tracing and tracemalloc.is_tracing():
+            tracemalloc.stop()
+        report = self.report()
+        atomic_write(os.path.abspath(path),
+                     (json.dumps(report, indent=2, ensure_ascii=False) + '\n').encode('utf-8'))
+        return report
+
+    def print_summary(self):
+        print(f"\n⏱️ PROFILE {self.job}:")
+        for p in self.phases:
+            peak = f"{p['peak_bytes'] / 1024:10,.0f} KB peak" if self.memory else ''
+            print(f"   {p['phase']:<10} {p['wall_s'] * 1000:9.1f} ms wall {p['cpu_s'] * 1000:9.1f} ms cpu {peak}")
+
+
+
+def phase(profiler, name):
+    """profiler.phase(name), or a no-op context when profiler is None."""
+    return profiler.phase(name) if profiler else nullcontext()
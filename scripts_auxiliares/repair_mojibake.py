@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Tree-wide mojibake repair (generalizes corrigir_gestao.py).
+
+Double-encoded UTF-8 shows up as 'GestÃ£o de ProduÃ§Ã£o': the UTF-8 bytes of
+each accented letter were decoded as latin-1/cp1252. Instead of a hand-written
+phrase dictionary, one compiled regex finds every UTF-8 byte sequence
+rendered as latin-1/cp1252 characters (a lead char Â..ô followed by the right
+number of continuation chars), and each span is repaired by encoding it back
+to bytes and decoding as UTF-8. Spans that do not form valid UTF-8 are left
+untouched. Only text matching that signature is rewritten, and the repair is
+a heuristic: a legitimate sequence that happens to match (such as 'Ã©' or
+'Â®' written on purpose) is converted too, so review the report or use
+--dry-run first. Up to MAX_PASSES passes undo mojibake that was encoded
+more than once.
+
+Runs on html_patch_engine with a process pool (one read/write per file,
+unchanged files skipped on reruns) and reports repairs per file.
+
+Usage:
+    python repair_mojibake.py [paths...] [--root DIR] [--dry-run] [--full]
+"""
+
+import argparse
+import os
+import re
+import sys
+
+from html_patch_engine import PatchEngine
+
+PATCH_NAME = 'mojibake-repair-v1'
+MAX_PASSES = 3
+DEFAULT_PATHS = ('modules', 'public', '_shared', 'ajuda')
+SUFFIXES = ('.html', '.htm', '.js', '.css', '.json')
+SKIP_DIRS = {'node_modules', '.git', '__pycache__', 'uploads', 'avatars'}
+
+
+def _byte_chars(byte):
+    """Characters a single byte turns into when decoded as cp1252 or latin-1."""
+    chars = {bytes([byte]).decode('latin-1')}
+    try:
+        chars.add(bytes([byte]).decode('cp1252'))
+    except UnicodeDecodeError:
+        pass
+    return chars
+
+
+def _char_class(first, last):
+    chars = set()
+    for byte in range(first, last + 1):
+        chars |= _byte_chars(byte)
+    return '[' + ''.join(re.escape(c) for c in sorted(chars)) + ']'
+
+
+# Byte value of every character that may stand for a raw byte
+_CHAR_TO_BYTE = {}
+for _b in range(0x80, 0x100):
+    for _c in _byte_chars(_b):
+        _CHAR_TO_BYTE[_c] = _b
+
+_CONT = _char_class(0x80, 0xBF)
+MOJIBAKE_RE = re.compile(
+    '(?:' + _char_class(0xC2, 0xDF) + _CONT +
+    '|' + _char_class(0xE0, 0xEF) + _CONT + '{2}' +
+    '|' + _char_class(0xF0, 0xF4) + _CONT + '{3})'
+)
+
+
+def _repair_span(match):
+    span = match.group(0)
+    try:
+        return bytes(_CHAR_TO_BYTE[c] for c in span).decode('utf-8')
+    except (KeyError, UnicodeDecodeError):
+        return span
+
+
+def repair_text(text):
+    """Return (repaired_text, number_of_spans_repaired)."""
+    total = 0
+    for _ in range(MAX_PASSES):
+        repaired = 0
+
+        def repl(match):
+            nonlocal repaired
+            fixed = _repair_span(match)
+            if fixed != match.group(0):
+                repaired += 1
+            return fixed
+
+        text = MOJIBAKE_RE.sub(repl, text)
+        if not repaired:
+            break
+        total += repaired
+    return text, total
+
+
+def repair_patch(content, rel_path):
+    new_content, count = repair_text(content)
+    if count:
+        return new_content, 'repaired', count
+    return content, 'clean', 0
+
+
+def find_utf8_copies(root, rel_paths):
+    """List '<name>_utf8.<ext>' copies that sit next to their original."""
+    copies = []
+    for rel in rel_paths:
+        stem, ext = os.path.splitext(rel)
+        if stem.endswith('_utf8') and os.path.exists(os.path.join(root, stem[:-5] + ext)):
+            copies.append(rel)
+    return sorted(copies)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Repair double-encoded UTF-8 across the tree')
+    parser.add_argument('paths', nargs='*', default=list(DEFAULT_PATHS),
+                        help='directories relative to --root (default: %(default)s)')
+    parser.add_argument('--root', default=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    parser.add_argument('--dry-run', action='store_true', help='report only, write nothing')
+    parser.add_argument('--full', action='store_true', help='ignore the file index and rescan everything')
+    parser.add_argument('--workers', type=int, default=None)
+    args = parser.parse_args(argv)
+
+    engine = PatchEngine(args.root, workers=args.workers, use_index=not args.full,
+                         dry_run=args.dry_run, processes=True)
+    engine.register(PATCH_NAME, repair_patch)
+    rel_paths = list(engine.iter_files(*args.paths, suffixes=SUFFIXES, skip_dirs=SKIP_DIRS))
+    report = engine.run(rel_paths)
+
+    repaired = report.by_status(PATCH_NAME).get('repaired', [])
+    total = sum(count for _, count in repaired)
+    action = 'WOULD REPAIR' if args.dry_run else 'REPAIRED'
+    print(f"=== MOJIBAKE REPAIR REPORT ===")
+    print(f"\n✅ {action} ({len(repaired)} files, {total} spans):")
+    for f, count in sorted(repaired, key=lambda item: -item[1]):
+        print(f"   {count:6d}  {f}")
+
+    copies = find_utf8_copies(args.root, rel_paths)
+    if copies:
+        print(f"\n🗂️ _utf8 COPIES ({len(copies)}) — redundant once the originals are repaired:")
+        for f in copies:
+            print(f"   {f}")
+
+    if report.errors:
+        print(f"\n❌ ERRORS ({len(report.errors)}):")
+        for f, err in report.errors:
+            print(f"   {f} — {err}")
+
+    print(f"\n📊 {len(rel_paths)} files scanned, {len(report.unchanged)} unchanged since last run, "
+          f"{len(repaired)} with mojibake, {total} spans, {len(report.errors)} errors")
+    return 1 if report.errors else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,39 @@
+import extract_inline_scripts
+
+BIG = 'document.title = "Pedidos";\n' * 50
+
+
+def test_pages_rewritten_once(tmp_path):
+    page = tmp_path / 'modules' / 'Vendas' / 'index.html'
+    page.parent.mkdir(parents=True)
+    html = (f'<script defer>\n{BIG}</script>\n'
+            '<script>var pequeno = 1;</script>\n'
+            '<script type="application/json">{"a": 1}</script>\n'
+            f'<!-- <script>{BIG}</script> -->\n'
+            f'<script type="module">{BIG}</script>')
+    page.write_text(html, encoding='utf-8')
+
+    def run():
+        assert extract_inline_scripts.main(['modules', '--root', str(tmp_path), '--workers', '1']) == 0
+        return page.read_text(encoding='utf-8')
+
+    rewritten = run()
+    files = sorted((tmp_path / 'public' / 'js' / 'inline').iterdir())
+    assert len(files) == 1  # both big blocks have the same code
+    url = f'/js/inline/{files[0].name}'
+    assert files[0].read_text(encoding='utf-8') == BIG
+    assert rewritten == (f'<script src="{url}"></script>\n'
+                         '<script>var pequeno = 1;</script>\n'
+                         '<script type="application/json">{"a": 1}</script>\n'
+                         f'<!-- <script>{BIG}</script> -->\n'
+                         f'<script type="module" src="{url}"></script>')
+
+    # rerun (index skip) and a full rescan leave the page as it is
+    assert run() == rewritten
+    assert extract_inline_scripts.main(['modules', '--root', str(tmp_path), '--workers', '1', '--full']) == 0
+    assert page.read_text(encoding='utf-8') == rewritten
+
+    # a lower threshold is a different patch: the small script is moved now
+    assert extract_inline_scripts.main(['modules', '--root', str(tmp_path), '--workers', '1',
+                                        '--min-bytes', '10']) == 0
+    assert '<script>var pequeno' not in page.read_text(encoding='utf-8')
@@ -0,0 +1,63 @@
+from html_patch_engine import PatchEngine, decode_bytes
+
+
+def add_script(content, rel_path):
+    if 'app.js' in content:
+        return content, 'already', None
+    return content.replace('</body>', '<script src="/app.js"></script></body>'), 'applied', None
+
+
+def add_lang(content, rel_path):
+    if '<html lang=' in content:
+        return content, 'already', None
+    return content.replace('<html>', '<html lang="pt-BR">'), 'applied', None
+
+
+def make_engine(root, **kwargs):
+    engine = PatchEngine(str(root), workers=1, **kwargs)
+    engine.register('script-v1', add_script)
+    engine.register('lang-v1', add_lang)
+    return engine
+
+
+def test_all_patches_in_one_pass_then_skipped(tmp_path):
+    page = tmp_path / 'pages' / 'index.html'
+    page.parent.mkdir()
+    page.write_text('<html><body>Início</body></html>', encoding='utf-8')
+
+    engine = make_engine(tmp_path)
+    report = engine.run(engine.iter_files('pages'))
+    assert report.written == ['pages/index.html']
+    assert report.by_status('script-v1') == {'applied': [('pages/index.html', None)]}
+    assert report.by_status('lang-v1') == {'applied': [('pages/index.html', None)]}
+    assert page.read_text(encoding='utf-8') == \
+        '<html lang="pt-BR"><body>Início<script src="/app.js"></script></body></html>'
+
+    # Rerun: the index says the file has not changed since, so it is not opened
+    engine = make_engine(tmp_path)
+    report = engine.run(engine.iter_files('pages'))
+    assert report.unchanged == ['pages/index.html'] and report.written == []
+
+    # Without the index the patches see their own output and leave it alone
+    engine = make_engine(tmp_path, use_index=False)
+    report = engine.run(engine.iter_files('pages'))
+    assert report.written == []
+    assert report.by_status('lang-v1') == {'already': [('pages/index.html', None)]}
+
+
+def test_dry_run_writes_nothing(tmp_path):
+    page = tmp_path / 'index.html'
+    page.write_text('<html><body></body></html>', encoding='utf-8')
+
+    report = make_engine(tmp_path, dry_run=True).run(['index.html'])
+    assert report.written == ['index.html']
+    assert page.read_text(encoding='utf-8') == '<html><body></body></html>'
+    assert not (tmp_path / '.html-patch-index.json').exists()
+
+
+def test_utf8_wins_over_the_recorded_encoding():
+    raw = 'Início'.encode('utf-8')
+    assert decode_bytes(raw, preferred='cp1252') == ('Início', 'utf-8')
+    assert decode_bytes('Início'.encode('cp1252'), preferred='latin-1') == ('Início', 'latin-1')
+    assert decode_bytes(b'\x80', preferred='latin-1')[1] == 'latin-1'
+    assert decode_bytes(b'\x80') == ('€', 'cp1252')
@@ -0,0 +1,49 @@
+import pytest
+
+from job_metrics import JobMetrics, parse_textfile
+
+PREFIX = 'zyntra_job_'
+
+
+def sample(samples, name, labels=''):
+    return samples[(PREFIX + name, '{job="convert"%s}' % labels)]
+
+
+def test_runs_accumulate_counters_atomically(tmp_path):
+    for seconds in (0.02, 3.0):
+        with JobMetrics('convert', directory=str(tmp_path)) as metrics:
+            metrics.add(read=10, written=8, rejected=2)
+            metrics.observe_batch(seconds)
+
+    text = (tmp_path / 'convert.prom').read_text(encoding='utf-8')
+    samples = parse_textfile(text)
+    assert sample(samples, 'rows_read_total') == 20
+    assert sample(samples, 'rows_written_total') == 16
+    assert sample(samples, 'rows_rejected_total') == 4
+    assert sample(samples, 'runs_total', ',status="success"') == 2
+    assert sample(samples, 'batch_duration_seconds_bucket', ',le="0.05"') == 1
+    assert sample(samples, 'batch_duration_seconds_bucket', ',le="5"') == 2
+    assert sample(samples, 'batch_duration_seconds_bucket', ',le="+Inf"') == 2
+    assert sample(samples, 'batch_duration_seconds_sum') == pytest.approx(3.02)
+    assert sample(samples, 'last_peak_rss_bytes') > 0
+    assert '# TYPE zyntra_job_batch_duration_seconds histogram' in text
+    assert [p.name for p in tmp_path.iterdir()] == ['convert.prom']
+
+
+def test_failure_keeps_last_success(tmp_path):
+    with JobMetrics('convert', directory=str(tmp_path)):
+        pass
+    with pytest.raises(RuntimeError):
+        with JobMetrics('convert', directory=str(tmp_path)):
+            raise RuntimeError('boom')
+
+    samples = parse_textfile((tmp_path / 'convert.prom').read_text(encoding='utf-8'))
+    assert sample(samples, 'runs_total', ',status="failure"') == 1
+    assert sample(samples, 'last_success_timestamp_seconds') <= sample(samples, 'last_run_timestamp_seconds')
+
+
+def test_disabled_without_directory(monkeypatch):
+    monkeypatch.delenv('ZYNTRA_METRICS_DIR', raising=False)
+    with JobMetrics('convert') as metrics:
+        metrics.add(read=1)
+    assert not metrics.enabled and metrics.write() is None
@@ -0,0 +1,45 @@
+import json
+
+import pytest
+
+Image = pytest.importorskip('PIL.Image')
+
+import optimize_images
+
+
+def run(root, *args):
+    code = optimize_images.main(['fotos', '--root', str(root), '--workers', '1', '--widths', '32,64', *args])
+    manifest = json.loads((root / optimize_images.OUTPUT_DIR / 'manifest.json').read_text(encoding='utf-8'))
+    return code, manifest['images'].get('fotos/João.jpg')
+
+
+def test_renditions_per_settings_and_kept_on_decode_errors(tmp_path):
+    source = tmp_path / 'fotos' / 'João.jpg'
+    source.parent.mkdir()
+    exif = Image.Exif()
+    exif[0x010F] = 'Camera'
+    Image.new('RGB', (48, 24), (200, 30, 30)).save(source, 'JPEG', quality=10, exif=exif)
+    out_dir = tmp_path / optimize_images.OUTPUT_DIR
+
+    code, entry = run(tmp_path)
+    assert code == 0
+    urls = sorted(v['url'] for v in entry['variants'])
+    assert len(urls) == 4 and all(url.startswith('/images/optimized/joao-') for url in urls)
+    full = out_dir / next(u for u in urls if '48w' in u and u.endswith('.jpg')).rsplit('/', 1)[1]
+    with Image.open(full) as img:
+        assert dict(img.getexif()) == {} and img.info.get('progressive')
+
+    assert run(tmp_path)[1] == entry  # unchanged source: skipped
+
+    # New quality: new URLs, the old renditions are removed
+    code, requalified = run(tmp_path, '--jpeg-quality', '60')
+    new_urls = sorted(v['url'] for v in requalified['variants'])
+    assert not set(new_urls) & set(urls)
+    assert sorted(p.name for p in out_dir.iterdir() if p.name != 'manifest.json') == \
+        sorted(u.rsplit('/', 1)[1] for u in new_urls)
+
+    # A source that no longer decodes keeps serving its last renditions
+    source.write_bytes(b'not an image')
+    code, kept = run(tmp_path, '--jpeg-quality', '60')
+    assert code == 1 and kept == requalified
+    assert all((out_dir / u.rsplit('/', 1)[1]).exists() for u in new_urls)
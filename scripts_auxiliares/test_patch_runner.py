@@ -0,0 +1,66 @@
+import json
+
+import patch_runner
+from patch_runner import plan_patches, run_file
+
+
+def patch(patch_id, find, replace, **options):
+    return dict(id=patch_id, find=find, replace=replace, **options)
+
+
+def test_every_patch_in_one_scan():
+    patches = [
+        patch('token', "getItem('token')", "getItem('tabAuthToken')", count=None),
+        patch('timeout', 'async (req, res) => {', 'async (req, res) => { req.setTimeout(180000);'),
+        patch('gone', 'nothing like this', 'replaced'),
+        patch('maybe', 'nothing either', 'replaced', optional=True),
+    ]
+    content = "a = getItem('token'); router.get('/x', async (req, res) => {}); b = getItem('token');"
+    new_content, statuses = plan_patches(content, patches)
+    assert new_content == ("a = getItem('tabAuthToken'); router.get('/x', async (req, res) => "
+                           "{ req.setTimeout(180000);}); b = getItem('tabAuthToken');")
+    assert statuses == [('token', 'applied', 2), ('timeout', 'applied', 1),
+                        ('gone', 'not-found', 0), ('maybe', 'skipped', 0)]
+
+    assert plan_patches(new_content, patches)[0] == new_content
+    assert [s for _, s, _ in plan_patches(new_content, patches)[1]] == \
+        ['already', 'already', 'not-found', 'skipped']
+
+
+def test_already_only_when_every_occurrence_is_patched():
+    # count: null with one occurrence patched and one pending
+    wrap = patch('wrap', 'load()', 'safe(load())', count=None)
+    assert plan_patches('safe(load()) load()', [wrap]) == ('safe(load()) safe(load())', [('wrap', 'applied', 1)])
+    assert plan_patches('safe(load())', [wrap])[1] == [('wrap', 'already', 0)]
+
+    # count: 2 with one marker: one more replacement is due
+    two = patch('two', 'old', 'new', count=2)
+    assert plan_patches('new old old', [two]) == ('new new old', [('two', 'applied', 1)])
+    assert plan_patches('new new old', [two])[1] == [('two', 'already', 0)]
+
+
+def test_count_applies_to_hits_left_after_overlaps():
+    longer = patch('longer', 'var token = a;', 'let token = a;')
+    short = patch('short', 'token = a', 'token = b')
+    new_content, statuses = plan_patches('var token = a; x.token = a', [longer, short])
+    assert new_content == 'let token = a; x.token = b'
+    assert statuses == [('longer', 'applied', 1), ('short', 'applied', 1)]
+
+
+def test_run_file_dry_run_diff_then_write(tmp_path):
+    target = tmp_path / 'app.js'
+    target.write_bytes(b'\xef\xbb\xbfconst a = 1;\r\nconst b = 2;\r\n')
+    spec = tmp_path / 'spec.json'
+    spec.write_text(json.dumps({'files': [{'path': 'app.js', 'encoding': 'utf-8', 'patches': [
+        patch('b', 'const b = 2;', 'const b = 3;\n// b')]}]}), encoding='utf-8')
+    file_spec = patch_runner.merge_specs([patch_runner.load_spec(str(spec))])[0]
+
+    report = run_file(str(tmp_path), file_spec, dry_run=True)
+    assert report['written'] and report['error'] is None
+    assert '-const b = 2;\r\n+const b = 3;\r\n+// b\r\n' in report['diff']
+    assert target.read_bytes() == b'\xef\xbb\xbfconst a = 1;\r\nconst b = 2;\r\n'
+
+    assert run_file(str(tmp_path), file_spec)['statuses'] == [('b', 'applied', 1)]
+    assert target.read_bytes() == b'\xef\xbb\xbfconst a = 1;\r\nconst b = 3;\r\n// b\r\n'
+    rerun = run_file(str(tmp_path), file_spec)
+    assert rerun['statuses'] == [('b', 'already', 0)] and not rerun['written']
@@ -0,0 +1,32 @@
+import json
+
+from contextlib import nullcontext
+
+from phase_profiler import PhaseProfiler, phase
+
+
+def test_phases_report_time_and_memory(tmp_path):
+    profiler = PhaseProfiler('job', source='x.csv')
+    with phase(profiler, 'read'):
+        rows = [str(i) * 50 for i in range(20_000)]
+    with profiler.phase('emit'):
+        text = '\n'.join(rows)
+    report = profiler.write(str(tmp_path / 'profile.json'))
+
+    assert [p['phase'] for p in report['phases']] == ['read', 'emit']
+    read = report['phases'][0]
+    assert read['peak_bytes'] > 1_000_000
+    assert read['retained_bytes'] > 1_000_000
+    assert read['top_allocations'][0]['site'].endswith('test_phase_profiler.py:11')
+    assert report['total']['peak_bytes'] == max(p['peak_bytes'] for p in report['phases'])
+    assert json.loads((tmp_path / 'profile.json').read_text(encoding='utf-8')) == report
+    assert len(text) > 0
+
+
+def test_time_only_and_disabled():
+    profiler = PhaseProfiler('job', memory=False)
+    with profiler.phase('clean'):
+        sum(range(1000))
+    assert profiler.report()['phases'][0]['peak_bytes'] is None
+
+    assert isinstance(phase(None, 'read'), nullcontext)
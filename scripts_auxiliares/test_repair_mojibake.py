@@ -0,0 +1,16 @@
+from repair_mojibake import repair_patch, repair_text
+
+
+def test_repairs_single_and_double_encoding():
+    text = 'Gestão de Produção — 5 €'
+    once = text.encode('utf-8').decode('cp1252')
+    assert repair_text(once) == (text, 5)
+    twice = 'Gestão de Produção'.encode('utf-8').decode('cp1252').encode('utf-8').decode('cp1252')
+    assert repair_text(twice)[0] == 'Gestão de Produção'
+
+
+def test_text_without_the_signature_is_left_alone():
+    for text in ('Gestão de Produção, ação, São Paulo — “ok” 5 €', 'Â solto, Ã sozinho', 'ÃA', 'â€!'):
+        assert repair_text(text) == (text, 0)
+    assert repair_patch('Olá', 'a.html') == ('Olá', 'clean', 0)
+    assert repair_patch('OlÃ¡', 'a.html') == ('Olá', 'repaired', 1)
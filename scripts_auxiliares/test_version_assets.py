@@ -0,0 +1,48 @@
+import hashlib
+import json
+
+import version_assets
+from version_assets import unhashed, versioned_url
+
+
+def short_hash(data):
+    return hashlib.sha256(data).hexdigest()[:version_assets.HASH_LENGTH]
+
+
+def test_unhashed_round_trip():
+    assert versioned_url('/js/app.js?x=1&v=old', '3f2a9c81d0', 'query') == '/js/app.js?x=1&v=3f2a9c81d0'
+    hashed = versioned_url('/js/app.js', '3f2a9c81d0', 'filename')
+    assert hashed == '/js/app.3f2a9c81d0.js'
+    assert unhashed(hashed) == '/js/app.js'
+    assert unhashed('/js/app.js') == '/js/app.js'
+
+    digests = {'/js/app.js': 'aaaaaaaaaa', '/js/app.3f2a9c81d0.js': '3f2a9c81d0',
+               '/js/lib.abcdef1234.js': '0000000000'}
+    assert unhashed(hashed, digests.get) == '/js/app.js'
+    # looks hashed, but no lib.js next to it and the name is not its content hash
+    assert unhashed('/js/lib.abcdef1234.js', digests.get) == '/js/lib.abcdef1234.js'
+
+
+def test_pages_versioned_then_stable(tmp_path):
+    js = tmp_path / 'public' / 'js'
+    js.mkdir(parents=True)
+    (js / 'app.js').write_bytes(b'console.log(1);')
+    (js / 'lib.abcdef1234.js').write_bytes(b'vendor();')
+    page = tmp_path / 'public' / 'index.html'
+    page.write_text('<script src="/js/app.js?v=20260224"></script><script src="/js/lib.abcdef1234.js"></script>',
+                    encoding='utf-8')
+    app, lib = short_hash(b'console.log(1);'), short_hash(b'vendor();')
+
+    def run(*args):
+        assert version_assets.main(['--root', str(tmp_path), '--workers', '1', *args]) == 0
+        return page.read_text(encoding='utf-8')
+
+    expected = f'<script src="/js/app.{app}.js"></script><script src="/js/lib.abcdef1234.{lib}.js"></script>'
+    assert run('--mode', 'filename') == expected
+    assert (js / f'app.{app}.js').read_bytes() == b'console.log(1);'
+    assert run('--mode', 'filename') == expected
+
+    # back to query mode: the hashed copies resolve to their sources again
+    assert run() == f'<script src="/js/app.js?v={app}"></script><script src="/js/lib.abcdef1234.js?v={lib}"></script>'
+    manifest = json.loads((tmp_path / version_assets.MANIFEST_PATH).read_text(encoding='utf-8'))
+    assert sorted(manifest['assets']) == ['public/js/app.js', 'public/js/lib.abcdef1234.js']
@@ -0,0 +1,53 @@
+import os
+import subprocess
+import sys
+import time
+
+import zyntra_tools
+
+CLI = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'zyntra_tools.py')
+HEAVY = ('pandas', 'openpyxl', 'PIL', 'numpy')
+
+
+def test_every_command_points_to_a_script():
+    for name, (_, rel_path, _) in zyntra_tools.COMMANDS.items():
+        assert os.path.isfile(os.path.join(zyntra_tools.ROOT, rel_path)), name
+
+
+def test_listing_does_not_import_heavy_dependencies():
+    code = ("import sys, zyntra_tools; zyntra_tools.main([]); "
+            "print(','.join(m for m in %r if m in sys.modules))" % (HEAVY,))
+    result = subprocess.run([sys.executable, '-c', code], cwd=os.path.dirname(CLI),
+                            capture_output=True, text=True, check=True)
+    assert result.stdout.splitlines()[-1] == ''
+
+
+def test_command_help_does_not_import_heavy_dependencies():
+    code = ("import sys, zyntra_tools; zyntra_tools.main(['excel-to-sql', '--help']); "
+            "print(','.join(m for m in %r if m in sys.modules))" % (HEAVY,))
+    result = subprocess.run([sys.executable, '-c', code], cwd=os.path.dirname(CLI),
+                            capture_output=True, text=True, check=True)
+    assert 'contas a pagar .xlsx' in result.stdout
+    assert result.stdout.splitlines()[-1] == ''
+
+
+def test_cold_start_under_100ms():
+    timings = []
+    for _ in range(5):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, CLI], stdout=subprocess.DEVNULL, check=True)
+        timings.append(time.perf_counter() - start)
+    assert min(timings) < 0.1, f"cold start took {min(timings) * 1000:.0f} ms"
+
+
+def test_unknown_command_exits_2(capsys):
+    assert zyntra_tools.main(['nope']) == 2
+    assert 'Unknown command' in capsys.readouterr().err
+
+
+def test_script_command_receives_arguments(capsys):
+    assert zyntra_tools.main(['page-weight', '--help']) == 0
+    assert '--budget-kb' in capsys.readouterr().out
+    # anything besides a lone --help runs the script itself (argparse's help)
+    assert zyntra_tools.main(['page-weight', '--top', '5', '--help']) == 0
+    assert 'show this help message' in capsys.readouterr().out
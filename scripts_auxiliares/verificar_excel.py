@@ -1,6 +1,12 @@
 # Verificacao do arquivo Excel gerado
+import os
+import sys
+
 import openpyxl
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'modules', 'Financeiro'))
+from documentos_fiscais import validar_documentos
+
 wb = openpyxl.load_workbook('teste_ordem_gerada.xlsx')
 ws = wb['VENDAS_PCP']
 
@@ -55,8 +61,12 @@ if c14_vazio and g14_vazio:
 else:
     print('   [ERRO] Linha 14 tem dados indevidos!')
 
-if c15_preenchido:
-    print('   [OK] C15 tem CPF/CNPJ:', ws['C15'].value)
+c15 = validar_documentos([ws['C15'].value])
+
+if c15.valido[0]:
+    print('   [OK] C15 tem ' + c15.tipo[0] + ':', c15.formatado[0])
+elif c15_preenchido:
+    print('   [ERRO] C15 tem CPF/CNPJ invalido (digitos verificadores):', ws['C15'].value)
 else:
     print('   [ERRO] C15 esta vazio!')
 
@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+Content-hash asset versioning (replaces hand-written ?v=20260224 cache busting).
+
+In one parallel pass over every page (html_patch_engine), each
+<script src> and <link href> that resolves to a JS/CSS file under the asset
+roots (public/, _shared/) is rewritten to carry the content hash of that
+file:
+
+    query mode (default)   /js/sidebar-click-animation.js?v=3f2a9c81d0
+    filename mode          /js/sidebar-click-animation.3f2a9c81d0.js  (hashed copy written next to the file)
+
+A URL only changes when the file it points to changes, so deploy/nginx.conf
+serves anything carrying a 10-hex-digit hash with a one-year immutable
+cache. A JSON manifest (asset -> hash, size, referencing URLs) is written
+for deploys and audits.
+
+The file index is not used here: a page must be rewritten whenever any
+asset it references changes, even if the page itself did not.
+
+Usage:
+    python version_assets.py [--root DIR] [--mode query|filename] [--dry-run]
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import posixpath
+import re
+import shutil
+import sys
+import threading
+from urllib.parse import urlsplit, urlunsplit
+
+from asset_paths import resolve_asset
+from html_patch_engine import PatchEngine, atomic_write
+
+PAGE_PATHS = ('public', 'modules', 'ajuda', '_shared')
+ASSET_ROOTS = ('public/', '_shared/', 'modules/_shared/')
+ASSET_EXTENSIONS = ('.js', '.css')
+SKIP_DIRS = {'node_modules', '.git', '__pycache__', 'uploads', 'avatars'}
+HASH_LENGTH = 10
+MANIFEST_PATH = 'asset-manifest.json'
+
+TAG_RE = re.compile(r'<(script|link)\b[^>]*>', re.IGNORECASE)
+ATTR_RES = {
+    'script': re.compile(r'(\bsrc\s*=\s*)(["\'])([^"\']*)\2', re.IGNORECASE),
+    'link': re.compile(r'(\bhref\s*=\s*)(["\'])([^"\']*)\2', re.IGNORECASE),
+}
+HASHED_NAME_RE = re.compile(r'\.([0-9a-f]{%d})(\.(?:js|css))$' % HASH_LENGTH)
+
+
+class AssetHasher:
+    """Thread-safe cache of content hashes, also collecting the manifest."""
+
+    def __init__(self, root, mode):
+        self.root = root
+        self.mode = mode
+        self.lock = threading.Lock()
+        self.assets = {}   # rel path -> {'hash', 'size', 'urls': set()}
+        self.digests = {}  # rel path -> (hash, size), manifest entries or not
+
+    def digest(self, rel_path):
+        with self.lock:
+            found = self.digests.get(rel_path)
+        if found:
+            return found
+        with open(os.path.join(self.root, rel_path), 'rb') as f:
+            data = f.read()
+        found = (hashlib.sha256(data).hexdigest()[:HASH_LENGTH], len(data))
+        with self.lock:
+            return self.digests.setdefault(rel_path, found)
+
+    def info(self, rel_path):
+        with self.lock:
+            found = self.assets.get(rel_path)
+        if found:
+            return found
+        digest, size = self.digest(rel_path)
+        with self.lock:
+            return self.assets.setdefault(rel_path, {'hash': digest, 'size': size, 'urls': set()})
+
+    def add_url(self, rel_path, url):
+        with self.lock:
+            self.assets[rel_path]['urls'].add(url)
+
+    def manifest(self):
+        with self.lock:
+            return {
+                rel: {'hash': a['hash'], 'size': a['size'], 'urls': sorted(a['urls'])}
+                for rel, a in sorted(self.assets.items())
+            }
+
+
+def unhashed(url_path, hash_of=None):
+    """Strip a hash inserted by filename mode: app.3f2a9c81d0.js -> app.js.
+
+    ``hash_of(url_path)`` returns the content hash of the file a URL points
+    to (None if there is none). When given, the hash is only stripped from
+    a copy this tool wrote: the stripped file exists and the name carries
+    the copy's own content hash. A vendor file that merely looks hashed
+    (lib.abcdef1234.js) keeps its name.
+    """
+    match = HASHED_NAME_RE.search(url_path)
+    if not match:
+        return url_path
+    source = url_path[:match.start()] + match.group(2)
+    if hash_of and (hash_of(source) is None or hash_of(url_path) != match.group(1)):
+        return url_path
+    return source
+
+
+def _without_version(query):
+    return [item for item in query.split('&') if item and item != 'v' and not item.startswith('v=')]
+
+
+def versioned_url(url, digest, mode):
+    """URL of the source asset (already unhashed) carrying its content hash"""
+    parts = urlsplit(url)
+    query = _without_version(parts.query)
+    path = parts.path
+    if mode == 'filename':
+        stem, ext = posixpath.splitext(path)
+        path = f'{stem}.{digest}{ext}'
+    else:
+        query.append(f'v={digest}')
+    return urlunsplit(('', '', path, '&'.join(query), parts.fragment))
+
+
+def write_hashed_copy(root, rel_path, digest):
+    stem, ext = os.path.splitext(rel_path)
+    target = os.path.join(root, f'{stem}.{digest}{ext}')
+    if not os.path.exists(target):
+        shutil.copy2(os.path.join(root, rel_path), target)
+
+
+def make_patch(hasher, dry_run):
+    root, mode = hasher.root, hasher.mode
+
+    def version_refs(content, page_rel):
+        changed = 0
+
+        def hash_of(url_path):
+            rel = resolve_asset(root, url_path, page_rel)
+            return hasher.digest(rel)[0] if rel else None
+
+        def rewrite_attr(match, tag):
+            nonlocal changed
+            prefix, quote, url = match.groups()
+            parts = urlsplit(url)
+            source_url = urlunsplit(('', '', unhashed(parts.path, hash_of), parts.query, parts.fragment))
+            rel = resolve_asset(root, source_url, page_rel)
+            if not rel or not rel.endswith(ASSET_EXTENSIONS) or not rel.startswith(ASSET_ROOTS):
+                return match.group(0)
+            if tag == 'link' and not rel.endswith('.css'):
+                return match.group(0)
+            info = hasher.info(rel)
+            new_url = versioned_url(source_url, info['hash'], mode)
+            hasher.add_url(rel, urlsplit(new_url).path)
+            if mode == 'filename' and not dry_run:
+                write_hashed_copy(root, rel, info['hash'])
+            if new_url == url:
+                return match.group(0)
+            changed += 1
+            return f'{prefix}{quote}{new_url}{quote}'
+
+        def rewrite_tag(match):
+            tag_text = match.group(0)
+            tag = match.group(1).lower()
+            return ATTR_RES[tag].sub(lambda m: rewrite_attr(m, tag), tag_text, count=1)
+
+        new_content = TAG_RE.sub(rewrite_tag, content)
+        if changed:
+            return new_content, 'versioned', changed
+        return content, 'current', 0
+
+    return version_refs
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Rewrite JS/CSS references to content-hashed URLs')
+    parser.add_argument('--root', default=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    parser.add_argument('--mode', choices=('query', 'filename'), default='query')
+    parser.add_argument('--manifest', default=MANIFEST_PATH, help='relative to --root (default: %(default)s)')
+    parser.add_argument('--dry-run', action='store_true')
+    parser.add_argument('--workers', type=int, default=None)
+    args = parser.parse_args(argv)
+
+    root = os.path.abspath(args.root)
+    hasher = AssetHasher(root, args.mode)
+    engine = PatchEngine(root, workers=args.workers, use_index=False, dry_run=args.dry_run)
+    engine.register(f'asset-versions-{args.mode}', make_patch(hasher, args.dry_run))
+    pages = list(engine.iter_files(*PAGE_PATHS, suffixes=('.html', '.htm'), skip_dirs=SKIP_DIRS))
+    report = engine.run(pages)
+
+    manifest = hasher.manifest()
+    if not args.dry_run:
+        payload = {'mode': args.mode, 'hash_length': HASH_LENGTH, 'assets': manifest}
+        atomic_write(os.path.join(root, args.manifest),
+                     (json.dumps(payload, indent=2, ensure_ascii=False) + '\n').encode('utf-8'))
+
+    versioned = report.by_status(engine.patches[0].name).get('versioned', [])
+    refs = sum(n for _, n in versioned)
+    action = 'WOULD UPDATE' if args.dry_run else 'UPDATED'
+    print(f"=== ASSET VERSIONING ({args.mode}) ===")
+    print(f"\n✅ {action} ({len(versioned)} pages, {refs} references):")
+    for page, n in versioned:
+        print(f"   {n:4d}  {page}")
+    if report.errors:
+        print(f"\n❌ ERRORS ({len(report.errors)}):")
+        for f, err in report.errors:
+            print(f"   {f} — {err}")
+    print(f"\n📊 {len(pages)} pages, {len(manifest)} assets hashed, {refs} references rewritten"
+          + ('' if args.dry_run else f", manifest: {args.manifest}"))
+    return 1 if report.errors else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Single entry point for the Python helper scripts.
+
+    python zyntra_tools.py                      list the subcommands
+    python zyntra_tools.py <command> [args...]  run one of them
+
+Every helper used to be run on its own, and several of them import pandas,
+openpyxl or PIL at module top, so even --help took seconds. This file only
+imports the standard library it needs to dispatch; a tool's module (and
+therefore its heavy dependencies) is loaded when its subcommand runs.
+
+Each command runs its script as __main__ and passes the remaining
+arguments on unchanged (``zyntra_tools.py page-weight --budget-kb 400``).
+Paths are resolved from the current directory, as when running the scripts
+directly. ``zyntra_tools.py <command> --help`` prints the script's module
+docstring, read with ast, so it does not import the tool either.
+"""
+
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# name -> (group, script relative to ROOT, help); the script runs as __main__
+# with the remaining arguments.
+COMMANDS = {
+    'csv-to-sql': ('Financeiro', 'modules/Financeiro/convert_csv_to_sql.py',
+                   'contas a pagar CSV -> INSERTs [file.csv] [--profile out.json]'),
+    'csv-import-job': ('Financeiro', 'modules/Financeiro/import_jobs.py',
+                       'resumable batched CSV -> SQL import with checkpoints [--db banco.sqlite]'),
+    'overdue-sweep': ('Financeiro', 'modules/Financeiro/varredura_vencidas.py',
+                      'mark PENDENTE contas_pagar past due as VENCIDA since the last run <banco.sqlite>'),
+    'archive-settled': ('Financeiro', 'modules/Financeiro/arquivo_frio.py',
+                        'move old PAGA/CANCELADA contas_pagar to monthly compressed column files <banco> <dir>'),
+    'payables-summary': ('Financeiro', 'modules/Financeiro/resumo_financeiro.py',
+                         'all contas_pagar report figures in one table scan <banco.sqlite> [--json]'),
+    'cash-projection': ('Financeiro', 'modules/Financeiro/projecao_caixa.py',
+                        'aging buckets and daily/weekly/monthly projected balance <banco.sqlite> (numpy)'),
+    'bank-reconcile': ('Financeiro', 'modules/Financeiro/conciliacao_extrato.py',
+                       'match statement lines to open payables <banco.sqlite> <extrato.csv|.ofx> [--saida out.csv]'),
+    'name-index': ('Financeiro', 'modules/Financeiro/indice_nomes.py',
+                   'trigram supplier/customer name index: construir <out.ztri> [--banco] [--omie] | buscar <out.ztri> <texto>'),
+    'check-documents': ('Financeiro', 'modules/Financeiro/documentos_fiscais.py',
+                        'validate CNPJ/CPF check digits <doc> ... (or one per line on stdin) (numpy)'),
+    'excel-to-sql': ('Financeiro', 'modules/Financeiro/generate_sql_from_excel.py',
+                     'contas a pagar .xlsx -> SQL script [file.xlsx] [--profile out.json] (pandas)'),
+    'contas-pagar-sql': ('Financeiro', 'modules/Financeiro/generate_contas_pagar_sql.py',
+                         'contas_pagar schema and import template'),
+    'bobinas-rebuild': ('Bobinas', 'scripts_auxiliares/generate_bobinas_sql.py',
+                        'SQL that rebuilds bobinas_estoque from the embedded Excel data'),
+    'bobinas-import': ('Bobinas', 'scripts_auxiliares/parse_excel_bobinas.py',
+                       'bobinas import SQL/JSON from the stock spreadsheet (openpyxl)'),
+    'bobinas-fix-excel': ('Bobinas', 'scripts_auxiliares/analyze_and_fix_excel.py',
+                          'analyze and rewrite the bobinas stock spreadsheet (pandas, openpyxl)'),
+    'rebrand-templates': ('Templates', 'scripts/create_zyntra_templates.py',
+                          'recreate the Omie Excel templates with the Zyntra logo (openpyxl, PIL)'),
+    'patch': ('HTML', 'scripts_auxiliares/patch_runner.py',
+              'apply a declarative JSON patch set'),
+    'repair-mojibake': ('HTML', 'scripts_auxiliares/repair_mojibake.py',
+                        'repair double-encoded UTF-8 text'),
+    'find-duplicates': ('HTML', 'scripts_auxiliares/find_duplicate_blocks.py',
+                        'find (and remove) duplicated blocks in pages'),
+    'extract-inline': ('HTML', 'scripts_auxiliares/extract_inline_scripts.py',
+                       'move inline <script> bodies into content-hashed files'),
+    'version-assets': ('Assets', 'scripts_auxiliares/version_assets.py',
+                       'content-hash ?v= / filename versioning of assets'),
+    'build-bundles': ('Assets', 'scripts_auxiliares/build_shared_bundles.py',
+                      'precompressed per-module bundles of the shared scripts'),
+    'page-weight': ('Assets', 'scripts_auxiliares/page_weight.py',
+                    'per-page transfer size and budget report'),
+    'optimize-images': ('Assets', 'scripts_auxiliares/optimize_images.py',
+                        'resized JPEG/WebP renditions and srcset manifest (PIL)'),
+    'gen-data': ('Load testing', 'tests/benchmarks/gerar_dados.py',
+                 'seeded synthetic contas/bobinas/vendas files (CSV or XLSX)'),
+}
+
+
+def run_script(rel_path, args):
+    """Run a script as __main__ with sys.argv set to its arguments; return the exit code."""
+    import runpy
+
+    path = os.path.join(ROOT, rel_path)
+    directory = os.path.dirname(path)
+    if directory not in sys.path:
+        sys.path.insert(0, directory)
+    saved_argv = sys.argv
+    sys.argv = [path] + list(args)
+    try:
+        runpy.run_path(path, run_name='__main__')
+    except SystemExit as e:
+        if e.code is None or isinstance(e.code, int):
+            return e.code or 0
+        print(e.code, file=sys.stderr)
+        return 1
+    finally:
+        sys.argv = saved_argv
+    return 0
+
+
+def script_help(name):
+    """Help text of a command: its COMMANDS line and the script's module docstring."""
+    import ast
+
+    _, rel_path, help_text = COMMANDS[name]
+    with open(os.path.join(ROOT, rel_path), encoding='utf-8') as f:
+        docstring = ast.get_docstring(ast.parse(f.read()))
+    return f"usage: zyntra_tools.py {name} [args...]\n\n  {help_text}\n\n{docstring or ''}".rstrip()
+
+
+def usage(out=sys.stdout):
+    print("usage: zyntra_tools.py <command> [args...]\n", file=out)
+    group = None
+    for name, (command_group, _, help_text) in COMMANDS.items():
+        if command_group != group:
+            group = command_group
+            print(f"{group}:", file=out)
+        print(f"  {name:<20} {help_text}", file=out)
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else list(argv)
+    if not argv or argv[0] in ('-h', '--help', 'help'):
+        usage()
+        return 0
+    command, args = argv[0], argv[1:]
+    if command not in COMMANDS:
+        print(f"❌ Unknown command: {command}\n", file=sys.stderr)
+        usage(sys.stderr)
+        return 2
+    if args in (['-h'], ['--help']):
+        print(script_help(command))
+        return 0
+
+    return run_script(COMMANDS[command][1], args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,417 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmarks dos caminhos Python de preços e importação.
+
+Mede, com entradas sintéticas determinísticas (semente fixa) em vários
+tamanhos:
+
+    vendas.registrar_venda                  (modules/Vendas/vendas.py)
+    clean_currency / clean_date             (modules/Financeiro/convert_csv_to_sql.py)
+    convert_csv_to_sql                      (CSV -> arquivo SQL)
+    generate_sql_script                     (DataFrame -> script SQL, requer pandas)
+    build_rebuild_sql / build_import_sql    (geradores SQL de bobinas, scripts_auxiliares)
+    conciliacao_extrato                     (lançamentos do extrato x contas em aberto)
+    projecao_caixa                          (aging + projeção mensal de 2 anos, requer numpy)
+    indice_nomes.buscar                     (100 buscas por trecho no índice de trigramas, requer numpy)
+    validar_documentos                      (coluna de CNPJ/CPF com máscara, sem e inválidos, requer numpy)
+
+Para cada caso informa o melhor tempo de --repeat execuções, a vazão
+(itens/s) e o pico de memória (tracemalloc, numa execução separada para não
+distorcer o tempo). O resultado é comparado com baseline.json: um caso mais
+lento que o baseline além de --tolerance é medido de novo e só é marcado
+como regressão se a segunda medição confirmar (o ruído entre execuções
+numa máquina compartilhada passa fácil de 25%).
+
+--save-baseline grava só os casos medidos e mantém os demais do arquivo:
+quem muda um caminho medido regrava a entrada dele com --only.
+
+Uso:
+    python tests/benchmarks/bench_python.py                  # roda e compara com o baseline
+    python tests/benchmarks/bench_python.py --quick          # só os tamanhos menores
+    python tests/benchmarks/bench_python.py --only clean_    # filtra casos pelo nome
+    python tests/benchmarks/bench_python.py --save-baseline  # grava o baseline desta máquina
+    python tests/benchmarks/bench_python.py --only convert_csv --save-baseline   # regrava um caso
+    python tests/benchmarks/bench_python.py --fail-on-regression   # código de saída 1 se regredir
+"""
+
+import argparse
+import contextlib
+import gc
+import io
+import json
+import os
+import platform
+import random
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date, timedelta
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+for _sub in ('modules/Vendas', 'modules/Financeiro', 'scripts_auxiliares'):
+    sys.path.insert(0, os.path.join(BASE_DIR, _sub))
+
+import conciliacao_extrato  # noqa: E402
+import convert_csv_to_sql as conversor  # noqa: E402
+import generate_bobinas_sql  # noqa: E402
+import parse_excel_bobinas  # noqa: E402
+from vendas import registrar_venda  # noqa: E402
+
+try:
+    import pandas as pd
+    import generate_sql_from_excel
+except ImportError:  # pandas é opcional: o caso generate_sql_script é pulado
+    pd = None
+
+try:
+    import numpy as np
+    import documentos_fiscais
+    import indice_nomes
+    import projecao_caixa
+except ImportError:  # numpy é opcional: os casos projecao_caixa, indice_nomes e documentos são pulados
+    np = None
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+SEED = 20260301
+TOLERANCE = 0.5
+AMOSTRA_MIN_S = 0.2
+
+PRODUTOS = ['Cabo UN10', 'Cabo UN16', 'Cabo DUN25', 'Cabo TRN35', 'Bobina CET2.15', 'Conector', 'Terminal']
+FORNECEDORES = ['Cobre Sul LTDA', 'Alumínio Paulista S/A', "Transportes D'Ávila", 'Embalagens Brasil', 'Energia SP']
+CATEGORIAS = ['Matéria-prima', 'Frete', 'Energia', 'Embalagem', 'Geral']
+STATUS = ['PENDENTE', 'PAGA', 'VENCIDA', 'CANCELADA']
+CORES = ['PRETO', 'CINZA', 'AZUL', 'VERMELHA', 'PT/NU', 'PT/CZ/NU']
+DIMENSOES = ['BOBINA', 'BOBINA', 'ROLO', '0,65X0,45', '0,65x0,25', '0,80X0,45']
+
+
+# ---------------------------------------------------------------------------
+# Entradas sintéticas
+# ---------------------------------------------------------------------------
+
+def _valor_br(rng):
+    """Valor monetário no formato das planilhas: 'R$ 1.234,56'."""
+    centavos = rng.randint(100, 50_000_000)
+    inteiro, frac = divmod(centavos, 100)
+    return f"R$ {inteiro:,}".replace(',', '.') + f",{frac:02d}"
+
+
+def _data_br(rng):
+    dia = date(2024, 1, 1) + timedelta(days=rng.randint(0, 900))
+    fmt = rng.choice(['%d/%m/%Y', '%d/%m/%Y', '%d-%m-%Y', '%Y-%m-%d', '%d/%m/%y'])
+    return dia.strftime(fmt)
+
+
+def gerar_vendas(n):
+    rng = random.Random(SEED)
+    return [(rng.choice(PRODUTOS), rng.randint(1, 500), round(rng.uniform(0.5, 900), 2),
+             rng.choice([0, 0, 5, 10, 15]), rng.choice([0, 12, 18]))
+            for _ in range(n)]
+
+
+def gerar_valores(n):
+    rng = random.Random(SEED)
+    return [_valor_br(rng) for _ in range(n)]
+
+
+def gerar_datas(n):
+    rng = random.Random(SEED)
+    return [_data_br(rng) for _ in range(n)]
+
+
+def gerar_linhas_contas(n):
+    rng = random.Random(SEED)
+    linhas = []
+    for i in range(n):
+        linhas.append([rng.choice(FORNECEDORES), f'NF {i} - {rng.choice(CATEGORIAS)}', _valor_br(rng),
+                       _data_br(rng), f'{rng.randint(1000, 999999)}', rng.choice(CATEGORIAS), rng.choice(STATUS)])
+    return linhas
+
+
+def gerar_bobinas(n):
+    rng = random.Random(SEED)
+    codigos = sorted(generate_bobinas_sql.PRODUCT_IDS)
+    return [(rng.choice(codigos), rng.randint(10, 4000), rng.choice(DIMENSOES), rng.choice(CORES),
+             rng.choice(['CHÃO DE FABRICA', 'ESTOQUE']), rng.choice(['', '', 'DUPLA CAMADA']))
+            for _ in range(n)]
+
+
+# ---------------------------------------------------------------------------
+# Casos
+# ---------------------------------------------------------------------------
+
+class Caso:
+    """Um benchmark: prepara(tamanho) fora da medição, executa(dados) medido."""
+
+    def __init__(self, nome, tamanhos, prepara, executa, limpa=None):
+        self.nome = nome
+        self.tamanhos = tamanhos
+        self.prepara = prepara
+        self.executa = executa
+        self.limpa = limpa
+
+
+def _registrar(vendas):
+    for produto, qtd, preco, desconto, imposto in vendas:
+        registrar_venda(produto, qtd, preco, desconto, imposto)
+
+
+def _clean_currency(valores):
+    for v in valores:
+        conversor.clean_currency(v)
+
+
+def _clean_date(datas):
+    for d in datas:
+        conversor.clean_date(d)
+
+
+def _prepara_csv(n):
+    pasta = tempfile.mkdtemp(prefix='bench-csv-')
+    caminho = os.path.join(pasta, 'contas_pagar.csv')
+    with open(caminho, 'w', encoding='utf-8', newline='') as f:
+        f.write('fornecedor;descricao;valor;vencimento;documento;categoria;status\n')
+        for linha in gerar_linhas_contas(n):
+            f.write(';'.join(linha) + '\n')
+    return caminho
+
+
+def _convert_csv(caminho):
+    with contextlib.redirect_stdout(io.StringIO()):
+        if not conversor.convert_csv_to_sql(caminho):
+            raise RuntimeError('convert_csv_to_sql falhou')
+
+
+def _limpa_csv(caminho):
+    shutil.rmtree(os.path.dirname(caminho), ignore_errors=True)
+
+
+def _prepara_dataframe(n):
+    colunas = ['FORNECEDOR', 'DESCRIÇÃO', 'VALOR', 'VENCIMENTO', 'DOCUMENTO', 'CATEGORIA', 'STATUS']
+    return pd.DataFrame(gerar_linhas_contas(n), columns=colunas)
+
+
+def _prepara_import_bobinas(n):
+    linhas = [(cod, f'CABO {cod}', qtde, dim, 1, cor, local, obs)
+              for cod, qtde, dim, cor, local, obs in gerar_bobinas(n)]
+    return parse_excel_bobinas.parse_rows(linhas)
+
+
+def _import_bobinas(rows):
+    parse_excel_bobinas.build_import_sql(rows, parse_excel_bobinas.group_by_cod(rows))
+
+
+def _prepara_conciliacao(n):
+    """n contas em aberto e n lançamentos: 3/4 casam, parte com valores repetidos."""
+    rng = random.Random(SEED)
+    inicio = date(2026, 3, 1).toordinal()
+    contas = [{'id': i, 'fornecedor': f, 'ordinal': inicio + rng.randint(0, 30),
+               'centavos': rng.randint(100, n * 10), 'documento': str(i),
+               'palavras': frozenset(f.split())}
+              for i, f in enumerate(rng.choice(['COBRE SUL', 'ALUMINIO PAULISTA', 'ENERGIA SP'])
+                                    for _ in range(n))]
+    extrato = []
+    for i, conta in enumerate(contas):
+        casa = i % 4 != 0
+        dia = date.fromordinal(conta['ordinal'] + rng.randint(-2, 2))
+        extrato.append({'linha': i, 'id': str(i), 'data': dia.isoformat(),
+                        'centavos': -(conta['centavos'] if casa else rng.randint(100, n * 10)),
+                        'descricao': f"PAGTO {rng.choice(FORNECEDORES).upper()}",
+                        'documento': conta['documento'] if casa and i % 3 == 0 else ''})
+    return extrato, conciliacao_extrato.IndiceContas(contas)
+
+
+def _conciliacao(dados):
+    conciliacao_extrato.conciliar(*dados)
+
+
+def _prepara_carteiras(n):
+    rng = np.random.default_rng(SEED)
+    hoje = np.datetime64('2026-03-01')
+    carteiras = [projecao_caixa.Carteira(hoje + rng.integers(-400, 730, tamanho),
+                                         rng.integers(1_000, 5_000_000, tamanho))
+                 for tamanho in (n, n // 2)]
+    return carteiras + [hoje]
+
+
+def _prepara_indice_nomes(n):
+    """Índice com n razões sociais sintéticas e 100 consultas por trecho."""
+    rng = random.Random(SEED)
+    silabas = ['BRA', 'SIL', 'MET', 'AIS', 'COB', 'RE', 'ENER', 'GI', 'SA', 'TRANS', 'POR', 'TES', 'ALU',
+               'MI', 'NIO', 'FER', 'RA', 'GENS', 'PAU', 'LIS', 'TA', 'NOR', 'DES', 'TE', 'VA', 'LE', 'CON']
+    sufixos = ['LTDA', 'S/A', 'ME', 'EPP', 'EIRELI', 'COMERCIO', 'INDUSTRIA', 'SERVICOS', 'DISTRIBUIDORA']
+    nomes = []
+    for _ in range(n):
+        palavras = [''.join(rng.choice(silabas) for _ in range(rng.randint(2, 4))) for _ in range(rng.randint(1, 3))]
+        nomes.append((' '.join(palavras + [rng.choice(sufixos)]), indice_nomes.FORNECEDOR))
+    indice = indice_nomes.IndiceNomes.construir(nomes)
+    consultas = []
+    for _ in range(100):
+        palavra = rng.choice(nomes)[0].split()[0]
+        inicio = rng.randint(0, max(0, len(palavra) - 5))
+        consultas.append(palavra[inicio:inicio + rng.randint(5, 9)])
+    return indice, consultas
+
+
+def _buscar_nomes(dados):
+    indice, consultas = dados
+    for consulta in consultas:
+        indice.buscar(consulta)
+
+
+def _prepara_documentos(n):
+    """n CNPJ/CPF: metade com máscara, metade só dígitos, ~10% com o último dígito trocado."""
+    rng = np.random.default_rng(SEED)
+    cnpj = rng.integers(0, 10, (n, 14))
+    cnpj[:, 12] = documentos_fiscais._dv_cnpj(cnpj[:, :12] @ documentos_fiscais.PESOS_CNPJ_1)
+    cnpj[:, 13] = documentos_fiscais._dv_cnpj(cnpj[:, :13] @ documentos_fiscais.PESOS_CNPJ_2)
+    cnpj[rng.random(n) < 0.1, 13] += 1
+    digitos = [''.join(map(str, linha)) for linha in (cnpj % 10).tolist()]
+    return [d if i % 2 else f'{d[:2]}.{d[2:5]}.{d[5:8]}/{d[8:12]}-{d[12:]}' for i, d in enumerate(digitos)]
+
+
+def _projecao(dados):
+    pagar, receber, hoje = dados
+    projecao_caixa.aging(pagar, hoje)
+    projecao_caixa.aging(receber, hoje)
+    projecao_caixa.projetar(pagar, receber, hoje, dias=730, periodo='mes')
+
+
+CASOS = [
+    Caso('registrar_venda', (1_000, 10_000, 100_000), gerar_vendas, _registrar),
+    Caso('clean_currency', (10_000, 100_000), gerar_valores, _clean_currency),
+    Caso('clean_date', (10_000, 100_000), gerar_datas, _clean_date),
+    Caso('convert_csv_to_sql', (1_000, 10_000, 50_000), _prepara_csv, _convert_csv, _limpa_csv),
+    Caso('bobinas.build_rebuild_sql', (1_000, 10_000, 100_000), gerar_bobinas,
+         generate_bobinas_sql.build_rebuild_sql),
+    Caso('bobinas.build_import_sql', (1_000, 10_000, 100_000), _prepara_import_bobinas, _import_bobinas),
+    Caso('conciliacao_extrato', (10_000, 100_000), _prepara_conciliacao, _conciliacao),
+]
+if pd is not None:
+    CASOS.append(Caso('generate_sql_script', (1_000, 10_000), _prepara_dataframe,
+                      generate_sql_from_excel.generate_sql_script))
+if np is not None:
+    CASOS.append(Caso('projecao_caixa', (100_000, 1_000_000), _prepara_carteiras, _projecao))
+    CASOS.append(Caso('indice_nomes.buscar', (10_000, 100_000), _prepara_indice_nomes, _buscar_nomes))
+    CASOS.append(Caso('validar_documentos', (100_000, 1_000_000), _prepara_documentos,
+                      documentos_fiscais.validar_documentos))
+
+
+# ---------------------------------------------------------------------------
+# Medição
+# ---------------------------------------------------------------------------
+
+def medir(caso, tamanho, repeticoes):
+    """Retorna (melhor_tempo_s, pico_memoria_bytes) do caso nesse tamanho.
+
+    Casos rápidos são executados várias vezes por amostra (até somar
+    AMOSTRA_MIN_S), o que tira o ruído de medições de poucos milissegundos.
+    """
+    dados = caso.prepara(tamanho)
+    try:
+        inicio = time.perf_counter()
+        caso.executa(dados)  # aquecimento: imports tardios, caches de strptime/regex
+        voltas = max(1, int(AMOSTRA_MIN_S / max(time.perf_counter() - inicio, 1e-6)))
+        tempos = []
+        for _ in range(repeticoes):
+            gc.collect()
+            inicio = time.perf_counter()
+            for _ in range(voltas):
+                caso.executa(dados)
+            tempos.append((time.perf_counter() - inicio) / voltas)
+
+        gc.collect()
+        tracemalloc.start()
+        caso.executa(dados)
+        _, pico = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    finally:
+        if caso.limpa:
+            caso.limpa(dados)
+    return min(tempos), pico
+
+
+def carregar_baseline():
+    try:
+        with open(BASELINE_PATH, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmarks dos caminhos Python de preços e importação')
+    parser.add_argument('--repeat', type=int, default=5, help='execuções por caso (vale a melhor)')
+    parser.add_argument('--quick', action='store_true', help='só o menor tamanho de cada caso')
+    parser.add_argument('--only', default='', help='roda apenas casos cujo nome contém este texto')
+    parser.add_argument('--tolerance', type=float, default=TOLERANCE,
+                        help='folga relativa antes de acusar regressão (padrão: %(default)s)')
+    parser.add_argument('--save-baseline', action='store_true', help='grava os resultados como baseline')
+    parser.add_argument('--fail-on-regression', action='store_true')
+    args = parser.parse_args(argv)
+
+    baseline = carregar_baseline()
+    base_resultados = (baseline or {}).get('results', {})
+
+    print('=== BENCHMARKS PYTHON ===')
+    if pd is None:
+        print('⚠️ pandas não instalado: generate_sql_script pulado')
+    if np is None:
+        print('⚠️ numpy não instalado: projecao_caixa, indice_nomes.buscar e validar_documentos pulados')
+    print(f"\n{'caso':28s} {'tamanho':>8s} {'tempo':>10s} {'itens/s':>12s} {'pico mem':>10s}  vs baseline")
+
+    resultados = {}
+    regressoes = []
+    for caso in CASOS:
+        if args.only not in caso.nome:
+            continue
+        tamanhos = caso.tamanhos[:1] if args.quick else caso.tamanhos
+        for tamanho in tamanhos:
+            chave = f'{caso.nome}@{tamanho}'
+            tempo, pico = medir(caso, tamanho, args.repeat)
+            resultados[chave] = {'seconds': round(tempo, 6), 'peak_bytes': pico,
+                                 'items_per_second': round(tamanho / tempo, 1) if tempo else None}
+            comparacao = ''
+            anterior = None if args.save_baseline else base_resultados.get(chave)
+            if anterior and anterior['seconds'] and tempo / anterior['seconds'] > 1 + args.tolerance:
+                tempo = min(tempo, medir(caso, tamanho, args.repeat)[0])  # confirma antes de acusar
+                resultados[chave].update(seconds=round(tempo, 6), items_per_second=round(tamanho / tempo, 1))
+            if anterior:
+                razao = tempo / anterior['seconds'] if anterior['seconds'] else 1.0
+                comparacao = f'{razao:5.2f}x'
+                if razao > 1 + args.tolerance:
+                    comparacao += '  ❌ REGRESSÃO'
+                    regressoes.append((chave, razao))
+                elif razao < 1 - args.tolerance:
+                    comparacao += '  ✅ mais rápido'
+            print(f"{caso.nome:28s} {tamanho:8,d} {tempo * 1000:8.1f}ms {tamanho / tempo:12,.0f} "
+                  f"{pico / 1024:8,.0f}KB  {comparacao}")
+
+    if args.save_baseline:
+        payload = {
+            'python': platform.python_version(),
+            'machine': platform.machine(),
+            'seed': SEED,
+            'results': {**base_resultados, **resultados},
+        }
+        with open(BASELINE_PATH, 'w', encoding='utf-8') as f:
+            json.dump(payload, f, indent=2, sort_keys=True)
+            f.write('\n')
+        print(f'\n💾 Baseline gravado em {os.path.relpath(BASELINE_PATH, BASE_DIR)}')
+    elif baseline is None:
+        print('\nℹ️ Sem baseline: rode com --save-baseline para criar um.')
+    elif baseline.get('python') != platform.python_version():
+        print(f"\nℹ️ Baseline gerado com Python {baseline.get('python')}; compare com cautela.")
+
+    if regressoes:
+        print(f'\n❌ {len(regressoes)} regressão(ões) acima de {args.tolerance:.0%}:')
+        for chave, razao in regressoes:
+            print(f'   {chave}: {razao:.2f}x mais lento')
+    print(f'\n📊 {len(resultados)} medições, {len(regressoes)} regressões')
+    return 1 if regressoes and args.fail_on_regression else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
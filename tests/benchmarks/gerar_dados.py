@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Gerador determinístico de dados sintéticos para testes de carga.
+
+As únicas massas de dados reais são planilhas em caminhos do Windows
+(CONTAS A PAGAR.xlsx, Lista de Estoque - Aluforce Cabos.xlsx). Este script
+gera arquivos equivalentes, de qualquer tamanho, gravando direto em disco
+em lotes (a memória não cresce com o número de linhas):
+
+    contas    contas a pagar na ordem de colunas do importador
+              (fornecedor;descricao;valor;vencimento;documento;categoria;status),
+              valores "R$ 1.234,56" e datas nos formatos aceitos por clean_date
+    bobinas   planilha de estoque no layout lido por parse_excel_bobinas
+              (aba "Lista de estoque", cabeçalho na linha 3) com os códigos
+              reais de PRODUCT_IDS
+    vendas    linhas de pedido: produto, quantidade, preco_unitario,
+              desconto_percentual, imposto_percentual (entrada de registrar_venda)
+
+A mesma semente e os mesmos parâmetros produzem sempre o mesmo arquivo.
+As distribuições são configuráveis: valores log-normais (--valor-mediana,
+--valor-sigma), pesos de status/descontos/impostos ("PAGA=30,PENDENTE=60"),
+janela de datas, concentração de fornecedores (Zipf) e fração de linhas
+inválidas para exercitar os caminhos de erro. XLSX requer openpyxl e é
+limitado ao máximo de linhas do Excel.
+
+Uso:
+    python tests/benchmarks/gerar_dados.py contas -n 1000000 -o /tmp/contas_pagar.csv
+    python tests/benchmarks/gerar_dados.py contas -n 50000 -o /tmp/contas.xlsx --invalidas 0.02
+    python tests/benchmarks/gerar_dados.py bobinas -n 20000 -o /tmp/estoque.xlsx
+    python tests/benchmarks/gerar_dados.py vendas -n 2000000 -o /tmp/vendas.csv --desconto "0=70,10=30"
+"""
+
+import argparse
+import csv
+import math
+import os
+import random
+import sys
+import time
+from datetime import date, timedelta
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.join(BASE_DIR, 'scripts_auxiliares'))
+
+from generate_bobinas_sql import PRODUCT_IDS  # noqa: E402
+
+SEED = 20260301
+LOTE = 10_000
+MAX_LINHAS_XLSX = 1_048_576 - 3
+
+PREFIXOS = ['Cobre', 'Alumínio', 'Metalúrgica', 'Transportes', 'Embalagens', 'Energia', 'Plásticos',
+            'Comercial', 'Distribuidora', 'Química', 'Ferragens', "D'Ávila", 'São João', 'Atlântico']
+REGIOES = ['Sul', 'Paulista', 'Brasil', 'Minas', 'Nordeste', 'Vale', 'Central', 'Norte', 'Litoral']
+SUFIXOS = ['LTDA', 'S/A', 'EIRELI', 'ME', 'LTDA - EPP']
+CATEGORIAS = ['Matéria-prima', 'Frete', 'Energia', 'Embalagem', 'Manutenção', 'Impostos', 'Serviços', 'Geral']
+HISTORICOS = ['NF', 'Boleto', 'Parcela', 'Fatura', 'Duplicata']
+CORES = ['PRETO', 'CINZA', 'AZUL', 'VERMELHA', 'PT/NU', 'PT/CZ/NU', 'PT/CZ/MR/NU']
+LOCAIS = ['CHÃO DE FABRICA', 'CHÃO DE FABRICA', 'ESTOQUE', 'GALPÃO 2']
+OBSERVACOES = ['', '', '', '', 'DUPLA CAMADA', 'ESTA NA BOBINA DE FERRO VERDE', 'PONTA']
+DIMENSOES = ['BOBINA', 'BOBINA', 'BOBINA', 'ROLO', '0,65X0,45', '0,65x0,25', '0,80X0,45', '1,00X0,60']
+
+FORMATOS_DATA = '%d/%m/%Y=80,%d-%m-%Y=8,%Y-%m-%d=8,%d/%m/%y=4'
+STATUS = 'PENDENTE=55,PAGA=30,VENCIDA=12,CANCELADA=3'
+DESCONTOS = '0=60,5=20,10=15,15=5'
+IMPOSTOS = '0=40,12=35,18=25'
+
+CABECALHO_CONTAS = ['Fornecedor', 'Descricao', 'Valor', 'Vencimento', 'Documento', 'Categoria', 'Status']
+CABECALHO_BOBINAS = ['COD', 'NOME', 'QTDE', 'BOBINA', 'QTDE BOB', 'VEIA/COR', 'LOCAL', 'OBS']
+CABECALHO_VENDAS = ['produto', 'quantidade', 'preco_unitario', 'desconto_percentual', 'imposto_percentual']
+
+
+def pesos(texto):
+    """'PAGA=30,PENDENTE=70' -> (['PAGA', 'PENDENTE'], [30.0, 70.0])"""
+    valores, ps = [], []
+    for parte in texto.split(','):
+        valor, _, peso = parte.rpartition('=')
+        if not valor:
+            raise argparse.ArgumentTypeError(f"peso inválido: {parte!r} (use VALOR=PESO)")
+        valores.append(valor.strip())
+        ps.append(float(peso))
+    return valores, ps
+
+
+def _zipf(n, expoente=1.1):
+    return [1 / (i + 1) ** expoente for i in range(n)]
+
+
+def _fornecedores(rng, n):
+    nomes = [f"{p} {r} {s}" for p in PREFIXOS for r in REGIOES for s in SUFIXOS]
+    rng.shuffle(nomes)
+    return [nomes[i % len(nomes)] + (f" {i // len(nomes) + 1}" if i >= len(nomes) else '') for i in range(n)]
+
+
+def _valor_br(centavos):
+    inteiro, frac = divmod(centavos, 100)
+    return f"R$ {inteiro:,}".replace(',', '.') + f",{frac:02d}"
+
+
+def linhas_contas(rng, n, args):
+    """Gera as linhas de contas a pagar em lotes de LOTE."""
+    fornecedores = _fornecedores(rng, args.fornecedores)
+    peso_fornecedor = _zipf(len(fornecedores))
+    formatos, peso_formato = pesos(args.formatos_data)
+    status, peso_status = pesos(args.status)
+    inicio = date.fromisoformat(args.inicio)
+    tabela_datas = {fmt: [(inicio + timedelta(days=d)).strftime(fmt) for d in range(args.dias)] for fmt in formatos}
+    mu = math.log(args.valor_mediana * 100)
+
+    for base in range(0, n, LOTE):
+        k = min(LOTE, n - base)
+        forn = rng.choices(fornecedores, peso_fornecedor, k=k)
+        fmts = rng.choices(formatos, peso_formato, k=k)
+        stats = rng.choices(status, peso_status, k=k)
+        cats = rng.choices(CATEGORIAS, k=k)
+        hists = rng.choices(HISTORICOS, k=k)
+        lote = []
+        for i in range(k):
+            doc = base + i + 1
+            valor = _valor_br(max(1, int(rng.lognormvariate(mu, args.valor_sigma))))
+            vencimento = tabela_datas[fmts[i]][rng.randrange(args.dias)]
+            if args.invalidas and rng.random() < args.invalidas:
+                if rng.random() < 0.5:
+                    valor = 'R$ 0,00'
+                else:
+                    vencimento = '31/02/2025'
+            lote.append([forn[i], f"{hists[i]} {doc} - {cats[i]}", valor, vencimento,
+                         f"{doc:08d}", cats[i], stats[i]])
+        yield lote
+
+
+def linhas_bobinas(rng, n, args):
+    """Gera linhas de estoque de bobinas com os códigos reais de produto."""
+    codigos = sorted(PRODUCT_IDS)
+    peso_codigo = _zipf(len(codigos), 0.8)
+    for base in range(0, n, LOTE):
+        k = min(LOTE, n - base)
+        cods = rng.choices(codigos, peso_codigo, k=k)
+        dims = rng.choices(DIMENSOES, k=k)
+        cores = rng.choices(CORES, k=k)
+        locais = rng.choices(LOCAIS, k=k)
+        obs = rng.choices(OBSERVACOES, k=k)
+        lote = []
+        for i in range(k):
+            metros = max(5, int(rng.gammavariate(2.0, args.metros_media / 2)))
+            lote.append([cods[i], f"CABO {cods[i]}", metros, dims[i], 1 + (rng.random() < 0.1),
+                         cores[i], locais[i], obs[i]])
+        yield lote
+
+
+def linhas_vendas(rng, n, args):
+    """Gera linhas de pedido para registrar_venda."""
+    produtos = [f"CABO {c}" for c in sorted(PRODUCT_IDS)] + ['Conector', 'Terminal', 'Fita isolante']
+    peso_produto = _zipf(len(produtos), 0.9)
+    precos = {p: round(rng.uniform(0.5, 120), 2) for p in produtos}
+    descontos, peso_desconto = pesos(args.desconto)
+    impostos, peso_imposto = pesos(args.imposto)
+    for base in range(0, n, LOTE):
+        k = min(LOTE, n - base)
+        prods = rng.choices(produtos, peso_produto, k=k)
+        descs = rng.choices(descontos, peso_desconto, k=k)
+        imps = rng.choices(impostos, peso_imposto, k=k)
+        yield [[prods[i], 1 + int(rng.expovariate(1 / args.quantidade_media)), precos[prods[i]],
+                descs[i], imps[i]] for i in range(k)]
+
+
+TIPOS = {
+    'contas': (linhas_contas, CABECALHO_CONTAS, 'Contas a Pagar'),
+    'bobinas': (linhas_bobinas, CABECALHO_BOBINAS, 'Lista de estoque'),
+    'vendas': (linhas_vendas, CABECALHO_VENDAS, 'Vendas'),
+}
+
+
+def gravar_csv(caminho, cabecalho, lotes, delimitador):
+    with open(caminho, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f, delimiter=delimitador, lineterminator='\n')
+        writer.writerow(cabecalho)
+        for lote in lotes:
+            writer.writerows(lote)
+
+
+def gravar_xlsx(caminho, cabecalho, lotes, aba, tipo):
+    import openpyxl
+
+    wb = openpyxl.Workbook(write_only=True)
+    ws = wb.create_sheet(aba)
+    if tipo == 'bobinas':
+        # parse_excel_bobinas lê a partir da linha 4
+        ws.append(['LISTA DE ESTOQUE - DADOS SINTÉTICOS'])
+        ws.append([])
+    ws.append(cabecalho)
+    for lote in lotes:
+        for linha in lote:
+            ws.append(linha)
+    wb.save(caminho)
+
+
+def gerar(tipo, n, caminho, args):
+    """Grava n linhas do tipo em caminho (.csv ou .xlsx)."""
+    gerador, cabecalho, aba = TIPOS[tipo]
+    rng = random.Random(args.seed)
+    lotes = gerador(rng, n, args)
+    if caminho.lower().endswith('.xlsx'):
+        if n > MAX_LINHAS_XLSX:
+            raise ValueError(f"XLSX comporta no máximo {MAX_LINHAS_XLSX:,} linhas; use .csv")
+        gravar_xlsx(caminho, cabecalho, lotes, aba, tipo)
+    else:
+        gravar_csv(caminho, cabecalho, lotes, args.delimitador)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Gera dados sintéticos determinísticos para testes de carga')
+    parser.add_argument('tipo', choices=sorted(TIPOS))
+    parser.add_argument('-n', '--linhas', type=int, default=100_000)
+    parser.add_argument('-o', '--saida', required=True, help='arquivo .csv ou .xlsx')
+    parser.add_argument('--seed', type=int, default=SEED)
+    parser.add_argument('--delimitador', default=';')
+    grupo = parser.add_argument_group('contas')
+    grupo.add_argument('--fornecedores', type=int, default=300, help='fornecedores distintos (Zipf)')
+    grupo.add_argument('--valor-mediana', type=float, default=1500.0, help='mediana do valor (R$)')
+    grupo.add_argument('--valor-sigma', type=float, default=1.1, help='dispersão log-normal do valor')
+    grupo.add_argument('--status', default=STATUS, help='pesos dos status (default: %(default)s)')
+    grupo.add_argument('--formatos-data', default=FORMATOS_DATA, help='pesos dos formatos de data')
+    grupo.add_argument('--inicio', default='2024-01-01', help='primeiro vencimento (AAAA-MM-DD)')
+    grupo.add_argument('--dias', type=int, default=900, help='janela de vencimentos em dias')
+    grupo.add_argument('--invalidas', type=float, default=0.0, help='fração de linhas com valor/data inválidos')
+    grupo = parser.add_argument_group('bobinas')
+    grupo.add_argument('--metros-media', type=float, default=250.0, help='metragem média por bobina (gama)')
+    grupo = parser.add_argument_group('vendas')
+    grupo.add_argument('--quantidade-media', type=float, default=40.0, help='quantidade média (exponencial)')
+    grupo.add_argument('--desconto', default=DESCONTOS, help='pesos dos descontos (default: %(default)s)')
+    grupo.add_argument('--imposto', default=IMPOSTOS, help='pesos dos impostos (default: %(default)s)')
+    args = parser.parse_args(argv)
+
+    inicio = time.perf_counter()
+    try:
+        gerar(args.tipo, args.linhas, args.saida, args)
+    except (ValueError, argparse.ArgumentTypeError) as e:
+        print(f"❌ {e}")
+        return 1
+    duracao = time.perf_counter() - inicio
+    tamanho = os.path.getsize(args.saida)
+    print(f"✅ {args.linhas:,} linhas de {args.tipo} em {args.saida}")
+    print(f"📊 {tamanho / 1024 / 1024:,.1f} MB em {duracao:.1f}s ({args.linhas / duracao:,.0f} linhas/s), seed {args.seed}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())